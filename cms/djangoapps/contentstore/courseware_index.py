@@ -26,6 +26,10 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Document type recording the structure version each course or library was last
+# completely indexed at, from which the next index update is computed
+INDEXED_VERSION_DOCUMENT_TYPE = "indexed_structure_version"
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -110,12 +114,49 @@ class SearchIndexerBase(object):
             field_dictionary=cls._get_location_info(structure_key),
             exclude_dictionary={"id": list(exclude_items)}
         )
-        result_ids = [result["data"]["id"] for result in response["results"]]
-        for result_id in result_ids:
-            searcher.remove(cls.DOCUMENT_TYPE, result_id)
+        cls.remove_items(searcher, [result["data"]["id"] for result in response["results"]])
+
+    @classmethod
+    def remove_items(cls, searcher, item_ids):
+        """
+        remove the items with the given ids from the search index
+        """
+        for item_id in item_ids:
+            searcher.remove(cls.DOCUMENT_TYPE, item_id)
+
+    @classmethod
+    def _get_indexed_version(cls, searcher, structure_key):
+        """ Returns the structure version at which the structure was last indexed, if known """
+        response = searcher.search(
+            doc_type=INDEXED_VERSION_DOCUMENT_TYPE,
+            field_dictionary={"id": unicode(structure_key)}
+        )
+        results = response["results"]
+        return results[0]["data"]["version"] if results else None
+
+    @classmethod
+    def _set_indexed_version(cls, searcher, structure_key, version):
+        """ Records the structure version at which the structure has been indexed """
+        searcher.index(INDEXED_VERSION_DOCUMENT_TYPE, {"id": unicode(structure_key), "version": unicode(version)})
+
+    @classmethod
+    def _get_block_changes(cls, modulestore, searcher, structure_key, incremental):
+        """
+        Returns the modulestore's BlockChanges for the structure since it was last indexed,
+        or None if the modulestore doesn't version structures.
+
+        The changes list no changed blocks if not incremental, or if the last indexed version is unknown.
+        """
+        if not hasattr(modulestore, 'get_block_changes'):
+            return None
+        since_version = cls._get_indexed_version(searcher, structure_key) if incremental else None
+        try:
+            return modulestore.get_block_changes(structure_key, since_version)
+        except NotImplementedError:
+            return None
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, structure=None):
         """
         Process course for indexing
 
@@ -130,6 +171,11 @@ class SearchIndexerBase(object):
             updating their index but are still walked through in order to identify
             which items may need to be removed from the index
             If None, then a full reindex takes place
+            When the modulestore versions structures (split), only the items which changed
+            since the version last indexed are updated instead, whatever their age
+
+        structure (XModuleDescriptor) - the published course or library, already loaded
+            to full depth; fetched from the modulestore if None
 
         Returns:
         Number of items that have been added to the index
@@ -153,6 +199,11 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
+        # ids of the items to update when indexing incrementally, None otherwise
+        changed_items = {
+            "ids": None
+        }
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -170,14 +221,25 @@ class SearchIndexerBase(object):
                 older than the REINDEX_AGE window and would have been already indexed.
                 This should really only be passed from the recursive child calls when
                 this method has determined that it is safe to do so
+                Ignored when indexing incrementally, where only the changed items are indexed
 
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
+            item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
+            if changed_items["ids"] is not None:
+                skip_index = item_id not in changed_items["ids"]
+
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # computing the index dictionary loads the item's content, so only do it for items to be indexed
+            if skip_index:
+                item_index_dictionary = None
+                has_index_content = is_indexable
+            else:
+                item_index_dictionary = item.index_dictionary() if is_indexable else None
+                has_index_content = bool(item_index_dictionary)
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not has_index_content and not item.has_children:
                 return
 
             item_content_groups = None
@@ -202,12 +264,14 @@ class SearchIndexerBase(object):
                 item_location = get_item_location(item)
                 item_content_groups = groups_usage_info.get(unicode(item_location), None)
 
-            item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
             if item.has_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
-                skip_child_index = skip_index or \
-                    (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
+                # (when indexing incrementally, each child determines this from the changed items instead)
+                skip_child_index = skip_index or (
+                    changed_items["ids"] is None and triggered_at is not None and
+                    (triggered_at - item.subtree_edited_on) > reindex_age
+                )
                 children_groups_usage = []
                 for child_item in item.get_children():
                     if modulestore.has_published_version(child_item):
@@ -221,9 +285,12 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if not has_index_content:
                 return
 
+            if skip_index:
+                return item_content_groups
+
             item_index = {}
             # if it has something to add to the index, then add it
             try:
@@ -244,7 +311,13 @@ class SearchIndexerBase(object):
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
-                structure = cls._fetch_top_level(modulestore, structure_key)
+                # read the changes before loading the structure, so that the version recorded
+                # below is never newer than the content which was indexed
+                changes = cls._get_block_changes(modulestore, searcher, structure_key, triggered_at is not None)
+                if changes is not None and changes.changed is not None:
+                    changed_items["ids"] = set(unicode(cls._id_modifier(key)) for key in changes.changed)
+                if structure is None:
+                    structure = cls._fetch_top_level(modulestore, structure_key)
                 groups_usage_info = cls.fetch_group_usage(modulestore, structure)
 
                 # First perform any additional indexing from the structure object
@@ -253,7 +326,13 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     index_item(item, groups_usage_info=groups_usage_info)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if changed_items["ids"] is not None:
+                    removed_items = set(unicode(cls._id_modifier(key)) for key in changes.removed)
+                    cls.remove_items(searcher, removed_items - indexed_items)
+                else:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if changes is not None and not error_list:
+                    cls._set_indexed_version(searcher, structure_key, changes.version)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
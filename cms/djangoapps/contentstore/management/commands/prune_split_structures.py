@@ -0,0 +1,70 @@
+"""
+Management command to delete split modulestore structures which no course or library can reach.
+"""
+from optparse import make_option
+from textwrap import dedent
+
+from django.core.management import BaseCommand
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_mongo.mongo_connection import PRUNE_MIN_AGE
+
+
+class Command(BaseCommand):
+    """
+    Delete the split modulestore structures which are neither the current version of a
+    course or library branch, one of its --keep-versions preceding versions, nor its
+    original version. Structures younger than --min-age seconds are always kept.
+
+    Delta-encoded structures which are kept but whose base is deleted are rewritten as
+    full snapshots first. Without --commit, only reports what would be deleted.
+
+    Examples:
+
+        ./manage.py cms prune_split_structures - report what would be pruned
+        ./manage.py cms prune_split_structures --keep-versions=10 --commit
+    """
+    help = dedent(__doc__)
+
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--keep-versions',
+            action='store',
+            type='int',
+            dest='keep_versions',
+            default=0,
+            help='Number of versions preceding each current version to keep'
+        ),
+        make_option(
+            '--min-age',
+            action='store',
+            type='int',
+            dest='min_age',
+            default=PRUNE_MIN_AGE,
+            help='Never prune structures created less than this many seconds ago'
+        ),
+        make_option(
+            '--commit',
+            action='store_true',
+            dest='commit',
+            default=False,
+            help='Actually delete the structures'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        """
+        Prune the structures of the split modulestore.
+        """
+        # pylint: disable=protected-access
+        split_store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.split)
+        kept, pruned = split_store.db_connection.prune_structures(
+            keep_versions=options['keep_versions'],
+            min_age=options['min_age'],
+            dry_run=not options['commit'],
+        )
+        if options['commit']:
+            self.stdout.write(u"Pruned {} structures, kept {}.\n".format(len(pruned), len(kept)))
+        else:
+            self.stdout.write(u"Dry run: would prune {} structures and keep {}.\n".format(len(pruned), len(kept)))
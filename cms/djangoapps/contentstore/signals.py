@@ -4,8 +4,11 @@ from pytz import UTC
 
 from django.dispatch import receiver
 
-from xmodule.modulestore.django import SignalHandler
+from xmodule.modulestore.django import SignalHandler, modulestore
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
+from openedx.core.djangoapps.content.course_structures.publish import (
+    publish_pipeline_enabled, register_publish_builder
+)
 
 
 @receiver(SignalHandler.course_published)
@@ -15,10 +18,24 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     """
     # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
     from .tasks import update_search_index
-    if CoursewareSearchIndexer.indexing_is_enabled():
+    # The course is indexed by the publish pipeline when it is enabled.
+    if CoursewareSearchIndexer.indexing_is_enabled() and not publish_pipeline_enabled():
         update_search_index.delay(unicode(course_key), datetime.now(UTC).isoformat())
 
 
+@register_publish_builder
+def index_published_course(course_key, course, published_at):
+    """
+    Publish pipeline builder which updates the search index of the published course
+    """
+    # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
+    from .tasks import _parse_time
+    if CoursewareSearchIndexer.indexing_is_enabled():
+        CoursewareSearchIndexer.index(
+            modulestore(), course_key, triggered_at=_parse_time(published_at), structure=course
+        )
+
+
 @receiver(SignalHandler.library_updated)
 def listen_for_library_update(sender, library_key, **kwargs):  # pylint: disable=unused-argument
     """
@@ -443,13 +443,40 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         # index based on time, will include an index of the origin sequential
         # because it is in a common subtree but not of the original vertical
         # because the original sequential's subtree is too old
+        # split instead indexes just the changed items and the chapter they were added to
         new_indexed_count = self.index_recent_changes(store, before_time)
-        self.assertEqual(new_indexed_count, 5)
+        if store.get_modulestore_type(self.course.id) == ModuleStoreEnum.Type.split:
+            self.assertEqual(new_indexed_count, 4)
+        else:
+            self.assertEqual(new_indexed_count, 5)
 
         # full index again
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an index update only indexes the items which changed since the last index """
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 4)
+
+        # nothing was published since, however recent the course's edits are
+        self.assertEqual(self.index_recent_changes(store, datetime(2015, 1, 1, tzinfo=UTC)), 0)
+
+        # an edited item is indexed again along with its ancestors
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            html_unit = store.get_item(self.html_unit.location)
+        html_unit.display_name = "Edited Html Content"
+        self.update_item(store, html_unit)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store, datetime(2015, 1, 1, tzinfo=UTC)), 4)
+        self.assertEqual(self.search(query_string="Edited Html Content")["total"], 1)
+
+        # a deleted item is removed from the index
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store, datetime(2015, 1, 1, tzinfo=UTC)), 3)
+        self.assertEqual(self.search()["total"], 3)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -578,6 +605,9 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    def test_incremental_index(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_incremental_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
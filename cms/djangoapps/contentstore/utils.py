@@ -67,11 +67,17 @@ def delete_course_and_groups(course_key, user_id):
     This deletes the courseware associated with a course_key as well as cleaning update_item
     the various user table stuff (groups, permissions, etc.)
     """
+    # Imported here since the overview model pulls in the LMS courseware code.
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
     module_store = modulestore()
 
     with module_store.bulk_operations(course_key):
         module_store.delete_course(course_key, user_id)
 
+        # Drop the course from the course catalog, which lists course overviews.
+        CourseOverview.delete_for_course(course_key)
+
         print 'removing User permissions from course....'
         # in the django layer, we need to remove all the user permissions groups associated with this course
         try:
@@ -342,6 +342,11 @@ PARSE_KEYS = AUTH_TOKENS.get("PARSE_KEYS", {})
 # Example: {'CN': 'http://api.xuetangx.com/edx/video?s3_url='}
 VIDEO_CDN_URL = ENV_TOKENS.get('VIDEO_CDN_URL', {})
 
+COURSE_PUBLISH_PIPELINE_DELAY = ENV_TOKENS.get('COURSE_PUBLISH_PIPELINE_DELAY', COURSE_PUBLISH_PIPELINE_DELAY)
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT
+)
+
 if FEATURES['ENABLE_COURSEWARE_INDEX'] or FEATURES['ENABLE_LIBRARY_INDEX']:
     # Use ElasticSearch for the search engine
     SEARCH_ENGINE = "search.elastic.ElasticSearchEngine"
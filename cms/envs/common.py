@@ -181,6 +181,10 @@ FEATURES = {
 
     # Can the visibility of the discussion tab be configured on a per-course basis?
     'ALLOW_HIDING_DISCUSSION_TAB': False,
+
+    # Coalesce the publishes of a course and rebuild the data derived from it
+    # (course structure, search index, credit requirements) from one load of the course
+    'ENABLE_COURSE_PUBLISH_PIPELINE': False,
 }
 
 ENABLE_JASMINE = False
@@ -287,6 +291,8 @@ TEMPLATE_LOADERS = (
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    # Must come before the session middleware; a no-op unless ENABLE_SIGNED_ASSET_URLS is set
+    'contentserver.middleware.SignedStaticContentServer',
     'django.middleware.cache.UpdateCacheMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -312,6 +318,8 @@ MIDDLEWARE_CLASSES = (
     # 'django.middleware.locale.LocaleMiddleware',
     'django_locale.middleware.LocaleMiddleware',
 
+    # Must come before TransactionMiddleware, to run functions once the request is committed
+    'util.db.RunAfterCommitMiddleware',
     'django.middleware.transaction.TransactionMiddleware',
     # needs to run after locale middleware (or anything that modifies the request context)
     'edxmako.middleware.MakoMiddleware',
@@ -1016,6 +1024,19 @@ CREDIT_TASK_MAX_RETRIES = 5
 CREDIT_PROVIDER_TIMESTAMP_EXPIRATION = 15 * 60
 
 
+################################ Configuration models ################################
+# Number of seconds each process keeps the configuration models it reads in
+# memory, in front of the 'configuration' cache. Saving a configuration entry
+# makes every process read it again on its next request. 0 disables this tier.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 60
+
+
+################################ Course publish pipeline ################################
+# Number of seconds the publish pipeline waits for further publishes of a course
+# before rebuilding its derived data. See course_structures.publish.
+COURSE_PUBLISH_PIPELINE_DELAY = 30
+
+
 ################################ Deprecated Blocks Info ################################
 
 DEPRECATED_BLOCK_TYPES = ['peergrading', 'combinedopenended']
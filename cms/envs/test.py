@@ -195,6 +195,11 @@ simplefilter('ignore')
 CELERY_ALWAYS_EAGER = True
 CELERY_RESULT_BACKEND = 'djcelery.backends.cache:CacheBackend'
 
+########################### CONFIGURATION MODELS ###############################
+
+# Tests roll back the configuration entries kept in memory.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 0
+
 ########################### Server Ports ###################################
 
 # These ports are carefully chosen so that if the browser needs to
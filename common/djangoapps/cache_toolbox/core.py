@@ -11,6 +11,7 @@ Core methods
 from django.core.cache import cache
 from django.db import DEFAULT_DB_ALIAS
 from opaque_keys import InvalidKeyError
+from openedx.core.lib.cache_utils import NEGATIVE_RESULT
 
 from . import app_settings
 
@@ -114,6 +115,15 @@ def set_cached_content(content):
     cache.set(unicode(content.location).encode("utf-8"), content)
 
 
+def set_cached_content_missing(location, timeout):
+    """
+    Remember for `timeout` seconds that there is no content at `location`, so that
+    get_cached_content returns NEGATIVE_RESULT for it. del_cached_content, which the
+    contentstore calls when it saves content, forgets it.
+    """
+    cache.set(unicode(location).encode("utf-8"), NEGATIVE_RESULT, timeout)
+
+
 def get_cached_content(location):
     return cache.get(unicode(location).encode("utf-8"))
 
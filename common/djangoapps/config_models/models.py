@@ -1,16 +1,51 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import connection, models
+from django.db.models import get_models
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
 from django.utils.translation import ugettext_lazy as _
 
+from openedx.core.lib.cache_utils import ProcessCache
+from request_cache.middleware import RequestCache
+
 try:
     cache = get_cache('configuration')  # pylint: disable=invalid-name
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+# Entries of the configuration cache kept in the memory of this process, along
+# with the generation of their model when they were read; see ConfigurationModel.
+process_cache = ProcessCache()  # pylint: disable=invalid-name
+
+# How long the generation of a model is kept in the configuration cache.
+GENERATION_TIMEOUT = 60 * 60 * 24
+
+# Request cache key of the generations read while serving the current request.
+GENERATIONS_REQUEST_CACHE_KEY = 'config_models.generations'
+
+# Maps the name of each ConfigurationModel to the key of its generation in the
+# configuration cache; filled in on first use.
+_GENERATION_CACHE_KEYS = {}
+
+
+def _generation_cache_keys():
+    """
+    Returns a dict mapping the name of each ConfigurationModel to the key of its
+    generation in the configuration cache.
+    """
+    if not _GENERATION_CACHE_KEYS:
+        _GENERATION_CACHE_KEYS.update(
+            (model.__name__, model.generation_cache_key_name())
+            for model in get_models()
+            if issubclass(model, ConfigurationModel)
+        )
+    return _GENERATION_CACHE_KEYS
+
 
 class ConfigurationModelManager(models.Manager):
     """
@@ -65,6 +100,14 @@ class ConfigurationModel(models.Model):
     Properties:
         cache_timeout (int): The number of seconds that this configuration
             should be cached
+
+    When settings.CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT is set, the cached
+    configuration is also kept in the memory of each process for that many
+    seconds. Each model has a generation, stored in the configuration cache and
+    changed whenever one of its entries is saved; the entries kept in memory are
+    only used while the generation they were read with is current. The
+    generations of all the models are read from the configuration cache with a
+    single query, at most once per request.
     """
 
     class Meta(object):  # pylint: disable=missing-docstring
@@ -97,6 +140,109 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        self._set_generation(uuid4().hex)
+
+    @classmethod
+    def process_cache_timeout(cls):
+        """
+        Returns the number of seconds the configuration is kept in the memory of each process.
+        """
+        return getattr(settings, 'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', 0)
+
+    @classmethod
+    def generation_cache_key_name(cls):
+        """Return the name of the key to use to cache the generation of this model"""
+        return 'configuration/{}/generation'.format(cls.__name__)
+
+    @classmethod
+    def _request_generations(cls):
+        """
+        Returns the dict mapping model names to the generations read while
+        serving the current request, or None outside of a request. The
+        generations of all the models are read on the first call of a request.
+        """
+        request_cache = RequestCache.get_request_cache()
+        if getattr(request_cache, 'request', None) is None:
+            return None
+
+        generations = request_cache.data.get(GENERATIONS_REQUEST_CACHE_KEY)
+        if generations is None:
+            cache_keys = _generation_cache_keys()
+            cached = cache.get_many(cache_keys.values())
+            generations = {
+                name: cached[cache_key]
+                for name, cache_key in cache_keys.iteritems()
+                if cache_key in cached
+            }
+            request_cache.data[GENERATIONS_REQUEST_CACHE_KEY] = generations
+        return generations
+
+    @classmethod
+    def _set_generation(cls, generation):
+        """
+        Store `generation` as the generation of this model.
+        """
+        cache.set(cls.generation_cache_key_name(), generation, GENERATION_TIMEOUT)
+        generations = cls._request_generations()
+        if generations is not None:
+            generations[cls.__name__] = generation
+
+    @classmethod
+    def _generation(cls):
+        """
+        Returns the current generation of this model.
+        """
+        generations = cls._request_generations()
+        if generations is None:
+            generation = cache.get(cls.generation_cache_key_name())
+        else:
+            generation = generations.get(cls.__name__)
+            # Models loaded after the keys were collected are read along with the others from now on.
+            _generation_cache_keys().setdefault(cls.__name__, cls.generation_cache_key_name())
+        if generation is None:
+            # The generation was evicted, so entries kept in memory may be stale.
+            generation = uuid4().hex
+            if not cache.add(cls.generation_cache_key_name(), generation, GENERATION_TIMEOUT):
+                generation = cache.get(cls.generation_cache_key_name(), generation)
+        if generations is not None:
+            generations[cls.__name__] = generation
+        return generation
+
+    @classmethod
+    def _process_generation(cls):
+        """
+        Returns the current generation of this model if the configuration is
+        kept in the memory of this process, or else None.
+        """
+        if cls.process_cache_timeout() > 0:
+            return cls._generation()
+        return None
+
+    @classmethod
+    def _get_cached(cls, cache_key, generation):
+        """
+        Return the value cached for `cache_key`, from the memory of this process
+        if it holds it for `generation`, or else from the configuration cache.
+        """
+        if generation is not None:
+            entry = process_cache.get(cache_key)
+            if entry is not None and entry[0] == generation:
+                return entry[1]
+
+        cached = cache.get(cache_key)
+        if cached is not None and generation is not None:
+            process_cache.set(cache_key, (generation, cached), cls.process_cache_timeout())
+        return cached
+
+    @classmethod
+    def _set_cached(cls, cache_key, value, generation):
+        """
+        Cache `value` for `cache_key` in the configuration cache, and in the
+        memory of this process for `generation`, the generation read before `value`.
+        """
+        if generation is not None:
+            process_cache.set(cache_key, (generation, value), cls.process_cache_timeout())
+        cache.set(cache_key, value, cls.cache_timeout)
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -117,7 +263,8 @@ class ConfigurationModel(models.Model):
         from the database, or by creating a new empty entry (which is not
         persisted).
         """
-        cached = cache.get(cls.cache_key_name(*args))
+        generation = cls._process_generation()
+        cached = cls._get_cached(cls.cache_key_name(*args), generation)
         if cached is not None:
             return cached
 
@@ -127,7 +274,7 @@ class ConfigurationModel(models.Model):
         except IndexError:
             current = cls(**key_dict)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        cls._set_cached(cls.cache_key_name(*args), current, generation)
         return current
 
     @classmethod
@@ -168,9 +315,10 @@ class ConfigurationModel(models.Model):
         assert not kwargs, "'flat' is the only kwarg accepted"
         key_fields = key_fields or cls.KEY_FIELDS
         cache_key = cls.key_values_cache_key_name(*key_fields)
-        cached = cache.get(cache_key)
+        generation = cls._process_generation()
+        cached = cls._get_cached(cache_key, generation)
         if cached is not None:
             return cached
         values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
-        cache.set(cache_key, values, cls.cache_timeout)
+        cls._set_cached(cache_key, values, generation)
         return values
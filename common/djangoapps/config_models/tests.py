@@ -7,10 +7,12 @@ import ddt
 from django.contrib.auth.models import User
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 from freezegun import freeze_time
 
-from mock import patch
-from config_models.models import ConfigurationModel
+from mock import Mock, patch
+from config_models.models import ConfigurationModel, cache, process_cache
+from request_cache.middleware import RequestCache
 
 
 class ExampleConfig(ConfigurationModel):
@@ -23,6 +25,83 @@ class ExampleConfig(ConfigurationModel):
     int_field = models.IntegerField(default=10)
 
 
+@override_settings(CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT=60)
+class ConfigurationModelProcessCacheTests(TestCase):
+    """
+    Tests of the configuration kept in the memory of the process
+    """
+    def setUp(self):
+        super(ConfigurationModelProcessCacheTests, self).setUp()
+        self.user = User()
+        self.user.save()
+        cache.clear()
+        process_cache.clear()
+        self.addCleanup(process_cache.clear)
+        self.addCleanup(RequestCache.clear_request_cache)
+        self._start_request()
+
+    def _start_request(self):
+        """
+        Simulate the start of a new request.
+        """
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = Mock()
+
+    def test_current_from_memory(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        with patch('config_models.models.cache') as mock_cache:
+            self.assertEqual(ExampleConfig.current().string_field, 'first')
+            self.assertFalse(mock_cache.get.called)
+
+    def test_save_updates_memory(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        ExampleConfig(changed_by=self.user, string_field='second').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_save_by_other_process(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+
+        # Another process saves a new entry, which changes the generation of the model.
+        ExampleConfig.objects.update(string_field='second')
+        cache.delete(ExampleConfig.cache_key_name())
+        cache.set(ExampleConfig.generation_cache_key_name(), 'other', 60)
+
+        # The generation is only read once per request.
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        self._start_request()
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_generations_read_together(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        ExampleKeyedConfig(changed_by=self.user, left='left', right='right', string_field='keyed').save()
+        self._start_request()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        self.assertEqual(ExampleKeyedConfig.current('left', 'right').string_field, 'keyed')
+
+        # The generations of all the models are read with one query per request.
+        self._start_request()
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as mock_get_many:
+            with patch.object(cache, 'get', wraps=cache.get) as mock_get:
+                self.assertEqual(ExampleConfig.current().string_field, 'first')
+                self.assertEqual(ExampleKeyedConfig.current('left', 'right').string_field, 'keyed')
+        self.assertEqual(mock_get_many.call_count, 1)
+        self.assertNotIn(
+            ExampleKeyedConfig.generation_cache_key_name(),
+            [call_args[0][0] for call_args in mock_get.call_args_list]
+        )
+
+    def test_evicted_generation(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        ExampleConfig.objects.update(string_field='second')
+        cache.clear()
+        self._start_request()
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+
 @patch('config_models.models.cache')
 class ConfigurationModelTests(TestCase):
     """
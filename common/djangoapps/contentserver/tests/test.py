@@ -4,20 +4,25 @@ Tests for StaticContentServer
 import copy
 import ddt
 import logging
+import time
 import unittest
 from uuid import uuid4
 
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
+from mock import patch
 
+from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
+from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
 from contentserver.middleware import parse_range_header
+from contentserver.signing import sign_asset_url
 from student.models import CourseEnrollment
 
 log = logging.getLogger(__name__)
@@ -110,6 +115,45 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         resp = self.client.get(self.url_locked)
         self.assertEqual(resp.status_code, 200)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SIGNED_ASSET_URLS': True})
+    def test_locked_asset_signed_url(self):
+        """
+        Test that a signed URL grants access to a locked asset without a
+        logged in user, and that the response may be cached by shared caches.
+        """
+        self.client.logout()
+        resp = self.client.get(sign_asset_url(self.url_locked))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['Cache-Control'].startswith('public, max-age='))
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SIGNED_ASSET_URLS': True})
+    def test_locked_asset_tampered_signature(self):
+        """
+        Test that a signed URL for one asset does not grant access to another.
+        """
+        self.client.logout()
+        signed_url = sign_asset_url(self.url_unlocked)
+        resp = self.client.get(signed_url.replace(self.url_unlocked, self.url_locked))
+        self.assertEqual(resp.status_code, 403)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SIGNED_ASSET_URLS': True})
+    def test_locked_asset_expired_signature(self):
+        """
+        Test that an expired signed URL falls back to the regular access checks.
+        """
+        self.client.logout()
+        resp = self.client.get(sign_asset_url(self.url_locked, now=time.time() - 24 * 60 * 60))
+        self.assertEqual(resp.status_code, 403)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SIGNED_ASSET_URLS': False})
+    def test_locked_asset_signed_url_disabled(self):
+        """
+        Test that signatures are ignored when the feature is disabled.
+        """
+        self.client.logout()
+        resp = self.client.get(sign_asset_url(self.url_locked))
+        self.assertEqual(resp.status_code, 403)
+
     def test_range_request_full_file(self):
         """
         Test that a range request from byte 0 to last,
@@ -192,6 +236,22 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         )
         self.assertEqual(resp.status_code, 416)
 
+    @override_settings(STATIC_CONTENT_MISSING_CACHE_TIMEOUT=60)
+    def test_missing_asset_remembered(self):
+        """
+        Test that a missing asset is looked up once, and served once it is saved.
+        """
+        missing_asset = self.course_key.make_asset_key('asset', 'missing_static.txt')
+        with patch('contentserver.middleware.AssetManager.find', side_effect=NotFoundError) as mock_find:
+            for _ in range(2):
+                resp = self.client.get(unicode(missing_asset))
+                self.assertEqual(resp.status_code, 404)
+            self.assertEqual(mock_find.call_count, 1)
+
+        self.contentstore.save(StaticContent(missing_asset, 'missing_static.txt', 'text/plain', 'saved'))
+        resp = self.client.get(unicode(missing_asset))
+        self.assertEqual(resp.status_code, 200)
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
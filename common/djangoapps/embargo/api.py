@@ -8,13 +8,13 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 import logging
 import pygeoip
 
-from django.core.cache import cache
 from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 from ipware.ip import get_ip
 
 from embargo.models import CountryAccessRule, RestrictedCourse
+from openedx.core.lib.cache_utils import get_cached, prefetch_cached, set_cached
 
 
 log = logging.getLogger(__name__)
@@ -63,6 +63,12 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
     if not settings.FEATURES.get('EMBARGO'):
         return True
 
+    # Fetch everything the checks below may read from the cache in one round trip.
+    cache_keys = [RestrictedCourse.COURSE_LIST_CACHE_KEY, CountryAccessRule.CACHE_KEY.format(course_key=course_key)]
+    if user is not None:
+        cache_keys.append(_profile_country_cache_key(user))
+    prefetch_cached(cache_keys)
+
     # First, check whether there are any restrictions on the course.
     # If not, then we do not need to do any further checks
     course_is_restricted = RestrictedCourse.is_restricted_course(course_key)
@@ -140,19 +146,26 @@ def _get_user_country_from_profile(user):
         user country from profile.
 
     """
-    cache_key = u'user.{user_id}.profile.country'.format(user_id=user.id)
-    profile_country = cache.get(cache_key)
+    cache_key = _profile_country_cache_key(user)
+    profile_country = get_cached(cache_key)
     if profile_country is None:
         profile = getattr(user, 'profile', None)
         if profile is not None and profile.country.code is not None:
             profile_country = profile.country.code.upper()
         else:
             profile_country = ""
-        cache.set(cache_key, profile_country)
+        set_cached(cache_key, profile_country)
 
     return profile_country
 
 
+def _profile_country_cache_key(user):
+    """
+    Returns the cache key of the country in the profile of `user`.
+    """
+    return u'user.{user_id}.profile.country'.format(user_id=user.id)
+
+
 def _country_code_from_ip(ip_addr):
     """
     Return the country code associated with an IP address.
@@ -17,7 +17,6 @@ import logging
 
 from django.db import models
 from django.utils.translation import ugettext as _, ugettext_lazy
-from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db.models.signals import post_save, post_delete
 
@@ -25,6 +24,7 @@ from django_countries.fields import CountryField
 from django_countries import countries
 
 from config_models.models import ConfigurationModel
+from openedx.core.lib.cache_utils import get_cached, set_cached, delete_cached
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 
 from embargo.exceptions import InvalidAccessPoint
@@ -187,7 +187,7 @@ class RestrictedCourse(models.Model):
         """
         Cache all restricted courses and returns the dict of course_keys and disable_access_check that are restricted
         """
-        restricted_courses = cache.get(cls.COURSE_LIST_CACHE_KEY)
+        restricted_courses = get_cached(cls.COURSE_LIST_CACHE_KEY)
         if restricted_courses is None:
             restricted_courses = {
                 unicode(course.course_key): {
@@ -195,7 +195,7 @@ class RestrictedCourse(models.Model):
                 }
                 for course in RestrictedCourse.objects.all()
             }
-            cache.set(cls.COURSE_LIST_CACHE_KEY, restricted_courses)
+            set_cached(cls.COURSE_LIST_CACHE_KEY, restricted_courses)
         return restricted_courses
 
     def snapshot(self):
@@ -286,13 +286,13 @@ class RestrictedCourse(models.Model):
             access_point=access_point,
             course_key=course_key
         )
-        url = cache.get(cache_key)
+        url = get_cached(cache_key)
 
         # If there's a cache miss, we'll need to retrieve the message
         # configuration from the database
         if url is None:
             url = cls._get_message_url_path_from_db(course_key, access_point)
-            cache.set(cache_key, url)
+            set_cached(cache_key, url)
 
         return url
 
@@ -348,7 +348,7 @@ class RestrictedCourse(models.Model):
     @classmethod
     def invalidate_cache_for_course(cls, course_key):
         """Invalidate the caches for the restricted course. """
-        cache.delete(cls.COURSE_LIST_CACHE_KEY)
+        delete_cached(cls.COURSE_LIST_CACHE_KEY)
         log.info("Invalidated cached list of restricted courses.")
 
         for access_point in ['enrollment', 'courseware']:
@@ -356,7 +356,7 @@ class RestrictedCourse(models.Model):
                 access_point=access_point,
                 course_key=course_key
             )
-            cache.delete(msg_cache_key)
+            delete_cached(msg_cache_key)
         log.info("Invalidated cached messaging URLs ")
 
 
@@ -459,10 +459,10 @@ class CountryAccessRule(models.Model):
             return True
 
         cache_key = cls.CACHE_KEY.format(course_key=course_id)
-        allowed_countries = cache.get(cache_key)
+        allowed_countries = get_cached(cache_key)
         if allowed_countries is None:
             allowed_countries = cls._get_country_access_list(course_id)
-            cache.set(cache_key, allowed_countries)
+            set_cached(cache_key, allowed_countries)
 
         return country == '' or country in allowed_countries
 
@@ -519,7 +519,7 @@ class CountryAccessRule(models.Model):
     def invalidate_cache_for_course(cls, course_key):
         """Invalidate the cache. """
         cache_key = cls.CACHE_KEY.format(course_key=course_key)
-        cache.delete(cache_key)
+        delete_cached(cache_key)
         log.info("Invalidated country access list for course %s", course_key)
 
     class Meta:
@@ -87,6 +87,37 @@ def get_enrollments(user_id):
     return _data_api().get_course_enrollments(user_id)
 
 
+def get_course_enrollments_for_users(course_id, user_ids):
+    """Retrieves the enrollments of many users in a course.
+
+    Loads the course information once for all the users, rather than once per call to `get_enrollment`.
+
+    Args:
+        course_id (str): The course to get enrollment information for.
+        user_ids (list): The usernames of the users to get course enrollment information for.
+
+    Returns:
+        A list of the enrollments, active or not, of those of the users who are enrolled in the course.
+        Each has the format returned by `get_enrollment`.
+
+    Example:
+        >>> get_course_enrollments_for_users("edX/DemoX/2014T2", ["Bob", "Alice"])
+        [
+            {
+                "created": "2014-10-20T20:18:00Z",
+                "mode": "honor",
+                "is_active": True,
+                "user": "Bob",
+                "course": {
+                    "course_id": "edX/DemoX/2014T2",
+                    ...
+                }
+            }
+        ]
+    """
+    return _data_api().get_course_enrollments_for_users(course_id, user_ids)
+
+
 def get_enrollment(user_id, course_id):
     """Retrieves all enrollment information for the user in respect to a specific course.
 
@@ -7,6 +7,7 @@ import logging
 from django.contrib.auth.models import User
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
+from course_modes.models import CourseMode
 from enrollment.errors import (
     CourseNotFoundError, CourseEnrollmentClosedError, CourseEnrollmentFullError,
     CourseEnrollmentExistsError, UserNotFoundError,
@@ -34,8 +35,29 @@ def get_course_enrollments(user_id):
     """
     qset = CourseEnrollment.objects.filter(
         user__username=user_id, is_active=True
-    ).order_by('created')
-    return CourseEnrollmentSerializer(qset).data  # pylint: disable=no-member
+    ).select_related('user').order_by('created')
+    return _serialize_enrollments(list(qset))
+
+
+def get_course_enrollments_for_users(course_id, usernames):
+    """Retrieve a list representing the aggregated data of the enrollments of many users in a course.
+
+    The course and its modes are loaded once for all the users.
+
+    Args:
+        course_id (str): The course to retrieve course enrollment information for.
+        usernames (list): The names of the users to retrieve course enrollment information for.
+
+    Returns:
+        A serializable list of dictionaries of the enrollments, active or not, of those of the users
+        who are enrolled in the course.
+
+    """
+    course_key = CourseKey.from_string(course_id)
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key, user__username__in=usernames
+    ).select_related('user').order_by('created')
+    return _serialize_enrollments(list(enrollments))
 
 
 def get_course_enrollment(username, course_id):
@@ -53,7 +75,7 @@ def get_course_enrollment(username, course_id):
     """
     course_key = CourseKey.from_string(course_id)
     try:
-        enrollment = CourseEnrollment.objects.get(
+        enrollment = CourseEnrollment.objects.select_related('user').get(
             user__username=username, course_id=course_key
         )
         return CourseEnrollmentSerializer(enrollment).data  # pylint: disable=no-member
@@ -142,6 +164,29 @@ def _update_enrollment(enrollment, is_active=None, mode=None):
     return CourseEnrollmentSerializer(enrollment).data  # pylint: disable=no-member
 
 
+def _serialize_enrollments(enrollments):
+    """Serialize a list of enrollments, loading each of their courses and its modes once.
+
+    Args:
+        enrollments (list): The CourseEnrollments to serialize.
+
+    Returns:
+        A serializable list of dictionaries of the enrollments whose course exists.
+
+    """
+    course_keys = set(enrollment.course_id for enrollment in enrollments)
+    store = modulestore()
+    courses = {course_key: store.get_course(course_key) for course_key in course_keys}
+    __, unexpired_modes = CourseMode.all_and_unexpired_modes_for_courses(list(course_keys))
+    course_modes = {
+        course_key: unexpired_modes[course_key] or [CourseMode.DEFAULT_MODE]
+        for course_key in course_keys
+    }
+    return CourseEnrollmentSerializer(
+        enrollments, many=True, context={'courses': courses, 'course_modes': course_modes}
+    ).data  # pylint: disable=no-member
+
+
 def get_course_enrollment_info(course_id, include_expired=False):
     """Returns all course enrollment information for the given course.
 
@@ -40,9 +40,10 @@ class CourseField(serializers.RelatedField):
 
     def to_native(self, course, **kwargs):
         course_id = unicode(course.id)
-        course_modes = ModeSerializer(
-            CourseMode.modes_for_course(course.id, kwargs.get('include_expired', False), only_selectable=False)
-        ).data  # pylint: disable=no-member
+        modes = kwargs.get('course_modes')
+        if modes is None:
+            modes = CourseMode.modes_for_course(course.id, kwargs.get('include_expired', False), only_selectable=False)
+        course_modes = ModeSerializer(modes).data  # pylint: disable=no-member
 
         return {
             "course_id": course_id,
@@ -61,6 +62,10 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
     Aggregates all data from the Course Enrollment table, and pulls in the serialization for
     the Course Descriptor and course modes, to give a complete representation of course enrollment.
 
+    The serializer context may hold the descriptors ('courses') and unexpired modes ('course_modes')
+    of the enrolled courses, as dicts keyed by course key, so that they are loaded once per course
+    rather than once per enrollment.
+
     """
     course_details = serializers.SerializerMethodField('get_course_details')
     user = serializers.SerializerMethodField('get_username')
@@ -79,7 +84,9 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
         return [enrollment for enrollment in serialized_data if enrollment.get('course_details')]
 
     def get_course_details(self, model):
-        if model.course is None:
+        courses = self.context.get('courses', {})
+        course = courses[model.course_id] if model.course_id in courses else model.course
+        if course is None:
             msg = u"Course '{0}' does not exist (maybe deleted), in which User (user_id: '{1}') is enrolled.".format(
                 model.course_id,
                 model.user.id
@@ -88,7 +95,7 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
             return None
 
         field = CourseField()
-        return field.to_native(model.course)
+        return field.to_native(course, course_modes=self.context.get('course_modes', {}).get(model.course_id))
 
     def get_username(self, model):
         """Retrieves the username from the associated model."""
@@ -26,6 +26,15 @@ def get_course_enrollments(student_id):
     return _ENROLLMENTS
 
 
+def get_course_enrollments_for_users(course_id, student_ids):
+    """Stubbed out Enrollment data request."""
+    return [
+        enrollment for enrollment in _ENROLLMENTS
+        if enrollment['student'] in student_ids and
+        enrollment['course'] and enrollment['course']['course_id'] == course_id
+    ]
+
+
 def get_course_enrollment(student_id, course_id):
     """Stubbed out Enrollment data request."""
     return _get_fake_enrollment(student_id, course_id)
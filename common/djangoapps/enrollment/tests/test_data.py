@@ -140,6 +140,20 @@ class EnrollmentDataTest(ModuleStoreTestCase):
         updated_results = data.get_course_enrollments(self.user.username)
         self.assertEqual(results, updated_results)
 
+    def test_get_course_enrollments_for_users(self):
+        self._create_course_modes(['honor', 'verified'])
+        other_user = UserFactory.create()
+        unenrolled_user = UserFactory.create()
+        enrollments = [
+            data.create_course_enrollment(user.username, unicode(self.course.id), 'honor', True)
+            for user in (self.user, other_user)
+        ]
+
+        results = data.get_course_enrollments_for_users(
+            unicode(self.course.id), [self.user.username, other_user.username, unenrolled_user.username]
+        )
+        self.assertEqual(results, enrollments)
+
     @ddt.data(
         # Default (no course modes in the database)
         # Expect that users are automatically enrolled as "honor".
@@ -21,7 +21,7 @@ from django.test.utils import override_settings
 
 from course_modes.models import CourseMode
 from embargo.models import CountryAccessRule, Country, RestrictedCourse
-from enrollment.views import EnrollmentUserThrottle
+from enrollment.views import EnrollmentUserThrottle, MAX_USERS_PER_ENROLLMENT_LOOKUP
 from util.models import RateLimitConfiguration
 from util.testing import UrlResetMixin
 from enrollment import api
@@ -305,6 +305,37 @@ class EnrollmentTest(EnrollmentTestMixin, ModuleStoreTestCase, APITestCase):
         )
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
 
+    def test_get_course_enrollments_for_users(self):
+        CourseEnrollment.enroll(self.user, self.course.id)
+        CourseEnrollment.enroll(self.other_user, self.course.id)
+        unenrolled_user = UserFactory.create()
+        params = {
+            'course_id': unicode(self.course.id),
+            'usernames': ','.join([self.user.username, self.other_user.username, unenrolled_user.username]),
+        }
+
+        # Only the server can look up the enrollments of several users.
+        resp = self.client.get(reverse('courseenrollments'), params)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.logout()
+        resp = self.client.get(reverse('courseenrollments'), params, **{'HTTP_X_EDX_API_KEY': self.API_KEY})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = json.loads(resp.content)
+        self.assertItemsEqual(
+            [enrollment['user'] for enrollment in data],
+            [self.user.username, self.other_user.username]
+        )
+
+    def test_get_course_enrollments_for_too_many_users(self):
+        self.client.logout()
+        params = {
+            'course_id': unicode(self.course.id),
+            'usernames': ','.join(u'user{}'.format(number) for number in range(MAX_USERS_PER_ENROLLMENT_LOOKUP + 1)),
+        }
+        resp = self.client.get(reverse('courseenrollments'), params, **{'HTTP_X_EDX_API_KEY': self.API_KEY})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_user_does_not_match_param(self):
         """
         The view should return status 404 if the enrollment username does not match the username of the user
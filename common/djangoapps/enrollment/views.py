@@ -35,6 +35,9 @@ from student.models import User
 
 log = logging.getLogger(__name__)
 
+# The number of users whose enrollments can be looked up in a single request.
+MAX_USERS_PER_ENROLLMENT_LOOKUP = 100
+
 
 class EnrollmentCrossDomainSessionAuth(SessionAuthenticationAllowInactiveUser, SessionAuthenticationCrossDomainCsrf):
     """Session authentication that allows inactive users and cross-domain requests. """
@@ -258,7 +261,9 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
 
             1. Get a list of all course enrollments for the currently logged in user.
 
-            2. Enroll the currently logged in user in a course.
+            2. Get the enrollments of a list of users in a course. Only server-to-server calls can do this.
+
+            3. Enroll the currently logged in user in a course.
 
                Currently a user can use this command only to enroll the user in "honor" mode.
 
@@ -272,8 +277,16 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
 
             GET /api/enrollment/v1/enrollment
 
+            GET /api/enrollment/v1/enrollment?course_id=edX/DemoX/Demo_Course&usernames=bob,alice
+
             POST /api/enrollment/v1/enrollment{"mode": "honor", "course_details":{"course_id": "edX/DemoX/Demo_Course"}}
 
+        **Get Parameters**
+
+            * course_id: The course to get the enrollments of the users listed in usernames in. Optional.
+
+            * usernames: A comma-separated list of at most 100 usernames. Required with course_id.
+
         **Post Parameters**
 
             * user:  The username of the currently logged in user. Optional.
@@ -346,6 +359,9 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
     @method_decorator(ensure_csrf_cookie_cross_domain)
     def get(self, request):
         """Gets a list of all course enrollments for the currently logged in user."""
+        if 'course_id' in request.GET:
+            return self._get_course_enrollments_for_users(request)
+
         username = request.GET.get('user', request.user.username)
         if request.user.username != username and not self.has_api_key_permissions(request):
             # Return a 404 instead of a 403 (Unauthorized). If one user is looking up
@@ -363,6 +379,36 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
                 }
             )
 
+    def _get_course_enrollments_for_users(self, request):
+        """Gets the enrollments of the users in the usernames parameter in the course_id course."""
+        if not self.has_api_key_permissions(request):
+            # As for a single user, don't let users deduce the enrollments of others.
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        course_id = request.GET['course_id']
+        usernames = [username for username in request.GET.get('usernames', '').split(',') if username]
+        if not usernames or len(usernames) > MAX_USERS_PER_ENROLLMENT_LOOKUP:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": u"Between 1 and {max} usernames must be given.".format(
+                        max=MAX_USERS_PER_ENROLLMENT_LOOKUP
+                    )
+                }
+            )
+
+        try:
+            return Response(api.get_course_enrollments_for_users(course_id, usernames))
+        except (CourseEnrollmentError, InvalidKeyError):
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": (
+                        u"An error occurred while retrieving enrollments in course '{course_id}'"
+                    ).format(course_id=course_id)
+                }
+            )
+
     def post(self, request):
         """Enrolls the currently logged-in user in a course.
 
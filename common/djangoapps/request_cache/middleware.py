@@ -1,5 +1,7 @@
 import threading
 
+from celery.signals import task_postrun, task_prerun
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 _request_cache_threadlocal.request = None
@@ -34,3 +36,16 @@ class RequestCache(object):
     def process_response(self, request, response):
         self.clear_request_cache()
         return response
+
+
+@task_prerun.connect
+@task_postrun.connect
+def clear_request_cache_for_task(task=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Empty the request cache around each Celery task, as the middleware does
+    around each request, so that data cached by a task isn't reused by the
+    next one. Tasks run eagerly are part of the request which runs them.
+    """
+    if task is not None and getattr(task.request, 'is_eager', False):
+        return
+    RequestCache.clear_request_cache()
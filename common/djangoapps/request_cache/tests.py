@@ -0,0 +1,32 @@
+"""
+Tests for the request cache.
+"""
+from celery.signals import task_postrun, task_prerun
+from django.test import TestCase
+from mock import Mock
+
+from request_cache.middleware import RequestCache
+
+
+class TaskRequestCacheTest(TestCase):
+    """
+    Tests that the request cache is emptied around Celery tasks.
+    """
+    def setUp(self):
+        super(TaskRequestCacheTest, self).setUp()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_cleared_around_tasks(self):
+        task = Mock()
+        task.request.is_eager = False
+        for signal in (task_prerun, task_postrun):
+            RequestCache.get_request_cache().data['key'] = 'value'
+            signal.send(sender=task, task=task, task_id='task_id')
+            self.assertEqual(RequestCache.get_request_cache().data, {})
+
+    def test_kept_around_eager_tasks(self):
+        task = Mock()
+        task.request.is_eager = True
+        RequestCache.get_request_cache().data['key'] = 'value'
+        task_prerun.send(sender=task, task=task, task_id='task_id')
+        self.assertEqual(RequestCache.get_request_cache().data, {'key': 'value'})
@@ -10,9 +10,16 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
+from contentserver.signing import signed_asset_urls_enabled, sign_asset_url
 
 log = logging.getLogger(__name__)
 
+# Upper bound on the number of static url lookups memoized by _lookup_static_url
+STATIC_URL_LOOKUP_CACHE_SIZE = 20000
+_STATIC_URL_LOOKUP_CACHE = {}
+
+_COMPILED_URL_REPLACE_REGEXES = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -30,6 +37,19 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled form of _url_replace_regex(prefix).
+
+    The set of prefixes used in a process is small (it depends only on settings and
+    course data directories), so compiled patterns are kept for the life of the process.
+    """
+    regex = _COMPILED_URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = _COMPILED_URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -71,7 +91,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -91,7 +111,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,14 +130,10 @@ def process_static_urls(text, replacement_function, data_dir=None):
         rest = match.group('rest')
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -149,7 +165,56 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_urls(text, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Rewrite /static/, /course/ and, if `jump_to_id_base_url` is given, /jump_to_id/
+    urls in a single pass over `text`.
 
+    This is equivalent to applying replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls in turn, but scans the text only once.
+    """
+    data_dir = static_asset_path or data_directory
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path)
+    course_url_base = '/courses/' + course_id.to_deprecated_string() + '/'
+
+    def replace_url(match):
+        """
+        Dispatch a single matched url to the rewrite rule for its prefix.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('static') is not None:
+            return replace_static_url(match.group(0), match.group('static'), quote, rest)
+        elif match.group('course') is not None:
+            return "".join([quote, course_url_base, rest, quote])
+        else:
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    prefixes = [
+        u'(?P<static>(?:{static_url}|/static/)(?!{data_dir}))'.format(
+            static_url=settings.STATIC_URL,
+            data_dir=data_dir
+        ),
+        u'(?P<course>/course/)',
+    ]
+    if jump_to_id_base_url is not None:
+        prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+
+    return _compiled_url_replace_regex(u'|'.join(prefixes)).sub(replace_url, text)
+
+
+def _static_url_replacer(data_directory, course_id, static_asset_path):
+    """
+    Returns a replacement function for process_static_urls that rewrites a
+    single static url as described in replace_static_urls.
+    """
     def replace_static_url(original, prefix, quote, rest):
         """
         Replace a single matched url.
@@ -161,45 +226,97 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
             return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) \
-                and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
-        else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
+
+        url, is_course_asset = _lookup_static_url(rest, prefix, data_directory, course_id, static_asset_path)
+
+        # Signed URLs let the content server authorize locked assets without a session lookup
+        if is_course_asset and signed_asset_urls_enabled():
+            url = sign_asset_url(url)
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+def _lookup_static_url(rest, prefix, data_directory, course_id, static_asset_path):
+    """
+    Memoized wrapper around _find_static_url.
+
+    The result of a lookup only depends on its arguments, the modulestore type of the course
+    and the contents of staticfiles_storage, none of which change while a process runs, so
+    the results are kept for the life of the process. Nothing is memoized in debug mode,
+    where collected static files may change underneath us.
+    """
+    if settings.DEBUG:
+        return _find_static_url(rest, prefix, data_directory, course_id, static_asset_path)
+
+    modulestore_type = modulestore().get_modulestore_type(course_id) if course_id else None
+    key = (modulestore_type, course_id, data_directory, static_asset_path, prefix, rest)
+    try:
+        return _STATIC_URL_LOOKUP_CACHE[key]
+    except KeyError:
+        pass
+
+    result = _find_static_url(rest, prefix, data_directory, course_id, static_asset_path, modulestore_type)
+    if len(_STATIC_URL_LOOKUP_CACHE) >= STATIC_URL_LOOKUP_CACHE_SIZE:
+        _STATIC_URL_LOOKUP_CACHE.clear()
+    _STATIC_URL_LOOKUP_CACHE[key] = result
+    return result
+
+
+def clear_static_url_lookup_cache():
+    """
+    Forget all memoized static url lookups.
+    """
+    _STATIC_URL_LOOKUP_CACHE.clear()
+
+
+def _find_static_url(rest, prefix, data_directory, course_id, static_asset_path, modulestore_type=None):
+    """
+    Returns a (url, is_course_asset) pair for the static path `rest`, where
+    is_course_asset is True if the url points into the course's contentstore.
+    """
+    if course_id and modulestore_type is None:
+        modulestore_type = modulestore().get_modulestore_type(course_id)
+
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    if (not static_asset_path) \
+            and course_id \
+            and modulestore_type != ModuleStoreEnum.Type.xml:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            return staticfiles_storage.url(rest), False
+
+        # if not, then assume it's courseware specific content and then look in the
+        # Mongo-backed database
+        url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
+
+        if AssetLocator.CANONICAL_NAMESPACE in url:
+            url = url.replace('block@', 'block/', 1)
+
+        return url, True
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    course_path = "/".join((static_asset_path or data_directory, rest))
+
+    try:
+        if staticfiles_storage.exists(rest):
+            url = staticfiles_storage.url(rest)
+        else:
+            url = staticfiles_storage.url(course_path)
+    # And if that fails, assume that it's course content, and add manually data directory
+    except Exception as err:
+        log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+            rest, str(err)))
+        url = "".join([prefix, course_path])
+
+    return url, False
@@ -1,9 +1,12 @@
 import re
 
-from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
+from nose.tools import assert_equals, assert_true, assert_false, with_setup  # pylint: disable=no-name-in-module
 from static_replace import (
+    clear_static_url_lookup_cache,
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -63,6 +66,7 @@ def test_static_urls(mock_request):
     assert_equals(result, '\"http:///static/file.png\"')
 
 
+@with_setup(clear_static_url_lookup_cache)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_exists(mock_storage):
     mock_storage.exists.return_value = True
@@ -73,6 +77,7 @@ def test_storage_url_exists(mock_storage):
     mock_storage.url.called_once_with('data_dir/file.png')
 
 
+@with_setup(clear_static_url_lookup_cache)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_not_exists(mock_storage):
     mock_storage.exists.return_value = False
@@ -83,6 +88,7 @@ def test_storage_url_not_exists(mock_storage):
     mock_storage.url.called_once_with('file.png')
 
 
+@with_setup(clear_static_url_lookup_cache)
 @patch('static_replace.StaticContent')
 @patch('static_replace.modulestore')
 def test_mongo_filestore(mock_modulestore, mock_static_content):
@@ -102,6 +108,26 @@ def test_mongo_filestore(mock_modulestore, mock_static_content):
     mock_static_content.convert_legacy_static_url_with_course_id.assert_called_once_with('file.png', COURSE_KEY)
 
 
+@with_setup(clear_static_url_lookup_cache)
+@patch('static_replace.signed_asset_urls_enabled', Mock(return_value=True))
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_mongo_filestore_signed_urls(mock_modulestore, mock_storage):
+    """
+    Make sure course asset urls are signed when signed asset urls are enabled.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+
+    with patch('static_replace.sign_asset_url', side_effect=lambda url: url + '?signed') as mock_sign:
+        assert_equals(
+            '"/c4x/org/course/asset/file.png?signed"',
+            replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY)
+        )
+        mock_sign.assert_called_once_with('/c4x/org/course/asset/file.png')
+
+
+@with_setup(clear_static_url_lookup_cache)
 @patch('static_replace.settings')
 @patch('static_replace.modulestore')
 @patch('static_replace.staticfiles_storage')
@@ -127,6 +153,7 @@ def test_raw_static_check():
     assert_equals(path, replace_static_urls(path, text))
 
 
+@with_setup(clear_static_url_lookup_cache)
 @patch('static_replace.staticfiles_storage')
 @patch('static_replace.modulestore')
 def test_static_url_with_query(mock_modulestore, mock_storage):
@@ -143,6 +170,51 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@with_setup(clear_static_url_lookup_cache)
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_replace_urls_single_pass(mock_modulestore, mock_storage):
+    """
+    Make sure replace_urls gives the same result as applying each rewrite in turn.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+    text = (
+        '<a href="/course/info">info</a> <img src="/static/file.png"/> '
+        '<a href=\'/jump_to_id/block_id\'>jump</a> <a href="/static/file.png?raw">raw</a>'
+    )
+
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    assert_equals(expected, replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=jump_to_id_base_url))
+    assert_equals(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        replace_urls(text, COURSE_KEY, DATA_DIRECTORY)
+    )
+
+
+@with_setup(clear_static_url_lookup_cache)
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_static_url_lookup_memoized(mock_modulestore, mock_storage):
+    """
+    Make sure repeated static urls are only looked up once.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+
+    for __ in range(3):
+        assert_equals(
+            '"/c4x/org/course/asset/file.png"',
+            replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY)
+        )
+    mock_storage.exists.assert_called_once_with('file.png')
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
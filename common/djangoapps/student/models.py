@@ -28,12 +28,14 @@ from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db import models, IntegrityError
 from django.db.models import Count
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
 from django_countries.fields import CountryField
 from config_models.models import ConfigurationModel
+from openedx.core.lib.cache_utils import request_cached
+from request_cache.middleware import RequestCache
 from track import contexts
 from eventtracking import tracker
 from importlib import import_module
@@ -44,6 +46,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 import lms.lib.comment_client as cc
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
+from util.db import run_after_commit
 from util.query import use_read_replica_if_available
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -1202,11 +1205,38 @@ class CourseEnrollment(models.Model):
         if isinstance(course_key, CCXLocator):
             course_key = course_key.to_course_locator()
 
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        # Outside of a request the course ids aren't cached, so don't load
+        # them all to look up a single course.
+        if getattr(RequestCache.get_request_cache(), 'request', None) is None:
+            return cls.objects.filter(user_id=user.id, course_id=course_key, is_active=True).exists()
+
+        return unicode(course_key) in cls.enrolled_course_ids(user)
+
+    @classmethod
+    def enrolled_course_ids(cls, user):
+        """
+        Returns the frozenset of the ids, as unicode, of the courses `user` has
+        an active enrollment in.
+
+        The set is cached for the rest of the request, and across requests for
+        ENROLLED_COURSE_IDS_CACHE_TIMEOUT seconds. Saving or deleting an
+        enrollment of the user invalidates it.
+        """
+        if not user.is_authenticated():
+            return frozenset()
+        return cls._enrolled_course_ids(user.id)
+
+    @staticmethod
+    @request_cached(timeout=lambda: getattr(settings, 'ENROLLED_COURSE_IDS_CACHE_TIMEOUT', 0))
+    def _enrolled_course_ids(user_id):
+        """
+        Returns the frozenset of the ids of the courses the user with id `user_id`
+        has an active enrollment in.
+        """
+        course_ids = CourseEnrollment.objects.filter(
+            user_id=user_id, is_active=True
+        ).values_list('course_id', flat=True)
+        return frozenset(unicode(course_id) for course_id in course_ids)
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -1330,6 +1360,21 @@ class CourseEnrollment(models.Model):
         return CourseMode.is_verified_slug(self.mode)
 
 
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrolled_course_ids(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached course ids of the user whose enrollment changed.
+
+    They are dropped again once the request is committed, since another
+    request may have cached them from the database before the change was
+    committed.
+    """
+    invalidate = CourseEnrollment._enrolled_course_ids.invalidate  # pylint: disable=protected-access
+    invalidate(instance.user_id)
+    run_after_commit(invalidate, instance.user_id)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -15,6 +15,7 @@ from xmodule.error_module import ErrorDescriptor
 from django.test.client import Client
 from student.models import CourseEnrollment
 from student.views import get_course_enrollment_pairs
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from util.milestones_helpers import (
     get_pre_requisite_courses_not_completed,
     set_prerequisite_courses,
@@ -93,6 +94,8 @@ class TestCourseListing(ModuleStoreTestCase):
 
         with patch('xmodule.modulestore.mongo.base.MongoKeyValueStore', Mock(side_effect=Exception)):
             self.assertIsInstance(modulestore().get_course(course_key), ErrorDescriptor)
+            # the overview has to be loaded from the modulestore
+            CourseOverview.delete_for_course(course_key)
 
             # get courses through iterating all courses
             courses_list = list(get_course_enrollment_pairs(self.student, None, []))
@@ -111,6 +114,7 @@ class TestCourseListing(ModuleStoreTestCase):
         course_location = mongo_store.make_course_key('testOrg', 'doomedCourse', 'RunBabyRun')
         self._create_course_with_access_groups(course_location, default_store=ModuleStoreEnum.Type.mongo)
         mongo_store.delete_course(course_location, ModuleStoreEnum.UserID.test)
+        CourseOverview.delete_for_course(course_location)
 
         courses_list = list(get_course_enrollment_pairs(self.student, None, []))
         self.assertEqual(len(courses_list), 1, courses_list)
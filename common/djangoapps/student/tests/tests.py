@@ -26,6 +26,7 @@ from student.models import (
 from student.views import (process_survey_link, _cert_info,
                            change_enrollment, complete_course_mode_info)
 from student.tests.factories import UserFactory, CourseModeFactory
+from request_cache.middleware import RequestCache
 from util.testing import EventTestMixin
 from util.model_utils import USER_SETTINGS_CHANGED_EVENT_NAME
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -603,6 +604,55 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, TestCase):
         self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
         self.assertEquals(enrollment.mode, "audit")
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_enrollment_cached_within_request(self):
+        user = User.objects.create_user("joe", "joe@joe.com", "password")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        RequestCache.get_request_cache().request = Mock()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+        with self.assertNumQueries(0):
+            self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+
+        # Changing the enrollment drops the cached value
+        CourseEnrollment.enroll(user, course_id)
+        self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+        CourseEnrollment.unenroll(user, course_id)
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+
+        # So does saving it directly
+        enrollment = CourseEnrollment.objects.get(user=user, course_id=course_id)
+        enrollment.is_active = True
+        enrollment.save()
+        self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+        self.assertEqual(CourseEnrollment.enrolled_course_ids(user), frozenset([unicode(course_id)]))
+
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_enrollment_cache_invalidated_after_commit(self):
+        user = User.objects.create_user("joe", "joe@joe.com", "password")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+
+        # Other requests may cache the enrollments before this one is committed
+        with patch('student.models.run_after_commit') as mock_run_after_commit:
+            CourseEnrollment.enroll(user, course_id)
+        mock_run_after_commit.assert_called_with(
+            CourseEnrollment._enrolled_course_ids.invalidate,  # pylint: disable=protected-access
+            user.id
+        )
+
+    def test_is_enrolled_outside_request(self):
+        user = User.objects.create_user("joe", "joe@joe.com", "password")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        CourseEnrollment.enroll(user, course_id)
+        CourseEnrollment.enroll(user, SlashSeparatedCourseKey("edX", "Test102", "2013"))
+
+        # Only the enrollment in the course is read
+        with patch('student.models.CourseEnrollment._enrolled_course_ids') as mock_enrolled_course_ids:
+            with self.assertNumQueries(1):
+                self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+        self.assertFalse(mock_enrolled_course_ids.called)
+
     def test_enrollment_non_existent_user(self):
         # Testing enrollment of newly unsaved user (i.e. no database entry)
         user = User(username="rusty", email="rusty@fake.edx.org")
@@ -1,14 +1,21 @@
 """
 Utility functions related to databases.
 """
-from functools import wraps
+from functools import partial, wraps
+import logging
 import random
 
 from django.db import connection, transaction
 
+from request_cache.middleware import RequestCache
+
+log = logging.getLogger(__name__)
 
 MYSQL_MAX_INT = (2 ** 31) - 1
 
+# Key of the functions deferred by run_after_commit in the request cache.
+AFTER_COMMIT_CALLBACKS_KEY = 'util.db.after_commit_callbacks'
+
 
 def commit_on_success_with_read_committed(func):  # pylint: disable=invalid-name
     """
@@ -57,3 +64,48 @@ def generate_int_id(minimum=0, maximum=MYSQL_MAX_INT, used_ids=None):
         cid = random.randint(minimum, maximum)
 
     return cid
+
+
+def run_after_commit(func, *args, **kwargs):
+    """
+    Call `func` with `args` and `kwargs` once the TransactionMiddleware has
+    committed the transaction of the current request, so that whatever `func`
+    hands the data written by the request to (a Celery task, a shared cache)
+    doesn't see it before it is committed.
+
+    Outside of a request, or when the request isn't running in a managed
+    transaction, `func` is called right away. The functions are dropped if
+    the request raises an exception, since its transaction is rolled back.
+    """
+    request_cache = RequestCache.get_request_cache()
+    if request_cache.request is None or not transaction.is_managed():
+        func(*args, **kwargs)
+        return
+
+    request_cache.data.setdefault(AFTER_COMMIT_CALLBACKS_KEY, []).append(partial(func, *args, **kwargs))
+
+
+class RunAfterCommitMiddleware(object):
+    """
+    Calls the functions deferred by run_after_commit during a request.
+
+    Must come before the TransactionMiddleware, so that its process_response
+    runs once the transaction of the request is committed.
+    """
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        """
+        Call the deferred functions; a failing one doesn't fail the request,
+        whose changes are already committed.
+        """
+        for callback in RequestCache.get_request_cache().data.pop(AFTER_COMMIT_CALLBACKS_KEY, []):
+            try:
+                callback()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Error running %r after the commit of a request", callback.func)
+        return response
+
+    def process_exception(self, request, exception):  # pylint: disable=unused-argument
+        """
+        Drop the deferred functions of a request which is rolled back.
+        """
+        RequestCache.get_request_cache().data.pop(AFTER_COMMIT_CALLBACKS_KEY, None)
@@ -9,8 +9,12 @@ from django.contrib.auth.models import User
 from django.db import connection, IntegrityError
 from django.db.transaction import commit_on_success, TransactionManagementError
 from django.test import TestCase, TransactionTestCase
+from mock import Mock, patch
 
-from util.db import commit_on_success_with_read_committed, generate_int_id
+from request_cache.middleware import RequestCache
+from util.db import (
+    RunAfterCommitMiddleware, commit_on_success_with_read_committed, generate_int_id, run_after_commit
+)
 
 
 @ddt.ddt
@@ -127,3 +131,43 @@ class GenerateIntIdTestCase(TestCase):
         for i in range(times):
             int_id = generate_int_id(minimum, maximum, used_ids)
             self.assertIn(int_id, list(set(range(minimum, maximum + 1)) - used_ids))
+
+
+class RunAfterCommitTestCase(TestCase):
+    """Tests for `run_after_commit` and `RunAfterCommitMiddleware`"""
+    def setUp(self):
+        super(RunAfterCommitTestCase, self).setUp()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.middleware = RunAfterCommitMiddleware()
+        self.callback = Mock()
+
+    def test_outside_request(self):
+        run_after_commit(self.callback, 1, key='value')
+        self.callback.assert_called_once_with(1, key='value')
+
+    @patch.object(RequestCache.get_request_cache(), 'request', Mock())
+    def test_after_commit(self):
+        run_after_commit(self.callback, 1, key='value')
+        self.assertFalse(self.callback.called)
+
+        response = Mock()
+        self.assertIs(self.middleware.process_response(Mock(), response), response)
+        self.callback.assert_called_once_with(1, key='value')
+
+        # The functions only run once
+        self.middleware.process_response(Mock(), response)
+        self.assertEqual(self.callback.call_count, 1)
+
+    @patch.object(RequestCache.get_request_cache(), 'request', Mock())
+    def test_failing_callback(self):
+        run_after_commit(Mock(side_effect=Exception))
+        run_after_commit(self.callback)
+        self.middleware.process_response(Mock(), Mock())
+        self.callback.assert_called_once_with()
+
+    @patch.object(RequestCache.get_request_cache(), 'request', Mock())
+    def test_rolled_back(self):
+        run_after_commit(self.callback)
+        self.middleware.process_exception(Mock(), Exception())
+        self.middleware.process_response(Mock(), Mock())
+        self.assertFalse(self.callback.called)
@@ -2434,10 +2434,7 @@ class CodeResponse(LoncapaResponse):
 
         cmap = CorrectMap()
         if error:
-            _ = self.capa_system.i18n.ugettext
-            error_msg = _('Unable to deliver your submission to grader (Reason: {error_msg}).'
-                          ' Please try again later.').format(error_msg=msg)
-            cmap.set(self.answer_id, queuestate=None, msg=error_msg)
+            cmap.set(self.answer_id, queuestate=None, msg=self.get_undelivered_msg(msg, self.capa_system.i18n.ugettext))
         else:
             # Queueing mechanism flags:
             #   1) Backend: Non-null CorrectMap['queuestate'] indicates that
@@ -2450,6 +2447,34 @@ class CodeResponse(LoncapaResponse):
 
         return cmap
 
+    @staticmethod
+    def get_undelivered_msg(error_msg, ugettext):
+        """
+        Returns the message shown to the student when a submission couldn't be
+        delivered to the grader because of `error_msg`.
+        """
+        _ = ugettext
+        return _('Unable to deliver your submission to grader (Reason: {error_msg}).'
+                 ' Please try again later.').format(error_msg=error_msg)
+
+    @classmethod
+    def fail_queued_submission(cls, cmap, queuekey, error_msg, ugettext):
+        """
+        Marks the responses of `cmap` waiting for the submission with `queuekey`
+        as no longer queued, with the message of an undelivered submission.
+
+        This is used when a submission which was queued without waiting for the
+        grader turns out to be undeliverable, once the problem isn't loaded anymore.
+
+        Returns whether any response was waiting for the submission.
+        """
+        failed = False
+        for answer_id in cmap:
+            if cmap.is_right_queuekey(answer_id, queuekey):
+                cmap.set(answer_id, queuestate=None, msg=cls.get_undelivered_msg(error_msg, ugettext))
+                failed = True
+        return failed
+
     def update_score(self, score_msg, oldcmap, queuekey):
         """Updates the user's score based on the returned message from the grader."""
         (valid_score_msg, correct, points, msg) = self._parse_score_msg(score_msg)
@@ -13,7 +13,7 @@ dateformat = '%Y%m%d%H%M%S'
 
 XQUEUE_METRIC_NAME = 'edxapp.xqueue'
 
-# Wait time for response from Xqueue.
+# Wait time for the grader's response to a queued submission.
 XQUEUE_TIMEOUT = 35  # seconds
 
 
@@ -67,9 +67,13 @@ class XQueueInterface(object):
     Interface to the external grading system
     """
 
-    def __init__(self, url, django_auth, requests_auth=None):
+    def __init__(self, url, django_auth, requests_auth=None, timeout=None):
+        """
+        timeout: Seconds to wait for each HTTP request to xqueue, or None to wait indefinitely
+        """
         self.url = unicode(url)
         self.auth = django_auth
+        self.timeout = timeout
         self.session = requests.Session()
         self.session.auth = requests_auth
 
@@ -134,10 +138,14 @@ class XQueueInterface(object):
 
     def _http_post(self, url, data, files=None):
         try:
-            r = self.session.post(url, data=data, files=files)
+            r = self.session.post(url, data=data, files=files, timeout=self.timeout)
         except requests.exceptions.ConnectionError, err:
             log.error(err)
             return (1, 'cannot connect to server')
+        except requests.exceptions.Timeout, err:
+            # The xqueue may have received the submission before timing out.
+            log.error(err)
+            return (1, 'timed out waiting for a reply from the server')
 
         if r.status_code not in [200]:
             return (1, 'unexpected HTTP status code [%d]' % r.status_code)
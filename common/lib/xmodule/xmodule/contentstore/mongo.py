@@ -15,6 +15,14 @@ from bson.son import SON
 from opaque_keys.edx.keys import AssetKey
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 
+try:
+    # We may not always have the cache_toolbox module available
+    from cache_toolbox.core import del_cached_content
+
+    HAS_CACHE_TOOLBOX = True
+except ImportError:
+    HAS_CACHE_TOOLBOX = False
+
 
 class MongoContentStore(ContentStore):
 
@@ -82,8 +90,21 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        # The content server may have remembered that there was no content here
+        self._clear_cached_content(content.location)
+        if content.thumbnail_location:
+            self._clear_cached_content(content.thumbnail_location)
+
         return content
 
+    @staticmethod
+    def _clear_cached_content(location):
+        """
+        Forget any content, or missing-content marker, cached for `location`.
+        """
+        if HAS_CACHE_TOOLBOX:
+            del_cached_content(location)
+
     def delete(self, location_or_id):
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
@@ -316,15 +337,14 @@ class MongoContentStore(ContentStore):
                 __, asset_key = self.asset_db_key(asset_key)
             asset_key['org'] = dest_course_key.org
             asset_key['course'] = dest_course_key.course
+            dest_asset_key = dest_course_key.make_asset_key(asset_key['category'], asset_key['name'])
             if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
                 if 'run' in asset_key:
                     del asset_key['run']
                 asset_id = asset_key
             else:  # add the run, since it's the last field, we're golden
                 asset_key['run'] = dest_course_key.run
-                asset_id = unicode(
-                    dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
-                )
+                asset_id = unicode(dest_asset_key.for_branch(None))
 
             self.fs.put(
                 source_content.read(),
@@ -337,6 +357,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+            self._clear_cached_content(dest_asset_key)
 
     def delete_all_course_assets(self, course_key):
         """
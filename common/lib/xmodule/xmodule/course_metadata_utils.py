@@ -7,7 +7,9 @@ classes, which both need these type of functions.
 """
 from datetime import datetime
 from base64 import b32encode
+from math import exp
 
+import dateutil.parser
 from django.utils.timezone import UTC
 
 from .fields import Date
@@ -209,3 +211,44 @@ def may_certify_for_course(certificates_display_behavior, certificates_show_befo
         or certificates_show_before_end
     )
     return show_early or has_ended
+
+
+def sorting_start_date(start, advertised_start):
+    """
+    Returns the start date used to sort a course: its advertised start if
+    that parses as a date, else its start.
+
+    Arguments:
+        start (datetime): The start datetime of the course in question.
+        advertised_start (str): The advertised start date of the course
+            in question.
+    """
+    try:
+        sorting_start = dateutil.parser.parse(advertised_start)
+        if sorting_start.tzinfo is None:
+            sorting_start = sorting_start.replace(tzinfo=UTC())
+        return sorting_start
+    except (ValueError, AttributeError):
+        return start
+
+
+def sorting_score(start, advertised_start, announcement, now):
+    """
+    Returns a number which sorts courses according to how "new" they are, the
+    lower the newer. Announced courses score lower than unannounced ones, and
+    older courses score higher.
+
+    Arguments:
+        start (datetime): The start datetime of the course in question.
+        advertised_start (str): The advertised start date of the course
+            in question.
+        announcement (datetime): The announcement datetime of the course
+            in question, or None.
+        now (datetime): The current datetime.
+    """
+    scale = 300.0  # about a year
+    if announcement:
+        days = (now - announcement).days
+        return -exp(-days / scale)
+    days = (now - sorting_start_date(start, advertised_start)).days
+    return exp(days / scale)
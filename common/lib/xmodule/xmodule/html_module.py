@@ -16,7 +16,7 @@ from xmodule.editing_module import EditingDescriptor
 from xmodule.edxnotes_utils import edxnotes
 from xmodule.html_checker import check_html
 from xmodule.stringify import stringify_children
-from xmodule.x_module import XModule, DEPRECATION_VSCOMPAT_EVENT
+from xmodule.x_module import XModule, DEPRECATION_VSCOMPAT_EVENT, STUDENT_VIEW, module_attr
 from xmodule.xml_module import XmlDescriptor, name_to_pathname
 from xblock.core import XBlock
 from xblock.fields import Scope, String, Boolean, List
@@ -84,7 +84,13 @@ class HtmlModule(HtmlModuleMixin):
     """
     Module for putting raw html in a course
     """
-    pass
+    def has_learner_independent_view(self, view_name):
+        """
+        Returns whether `view_name` renders the same for every learner, so that its
+        output can be cached. The student view does unless the html includes the
+        learner's anonymous id.
+        """
+        return view_name == STUDENT_VIEW and "%%USER_ID%%" not in self.data
 
 
 class HtmlDescriptor(HtmlFields, XmlDescriptor, EditingDescriptor):  # pylint: disable=abstract-method
@@ -93,6 +99,7 @@ class HtmlDescriptor(HtmlFields, XmlDescriptor, EditingDescriptor):  # pylint: d
     """
     mako_template = "widgets/html-edit.html"
     module_class = HtmlModule
+    has_learner_independent_view = module_attr('has_learner_independent_view')
     filename_extension = "xml"
     template_dir_name = "html"
     has_responsive_ui = True
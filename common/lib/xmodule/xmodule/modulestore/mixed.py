@@ -539,6 +539,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    def get_block_changes(self, course_key, since_version=None):
+        """
+        Returns the blocks of the course which changed since the structure version since_version.
+
+        Raises NotImplementedError if the course's store doesn't version its structures.
+        """
+        store = self._verify_modulestore_support(course_key, 'get_block_changes')
+        return store.get_block_changes(course_key, since_version)
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
@@ -2,7 +2,8 @@
 General utilities
 """
 
-from collections import namedtuple
+import threading
+from collections import namedtuple, OrderedDict
 from contracts import contract, check
 from opaque_keys.edx.locator import BlockUsageLocator
 
@@ -21,3 +22,43 @@ class BlockKey(namedtuple('BlockKey', 'type id')):
 
 
 CourseEnvelope = namedtuple('CourseEnvelope', 'course_key structure')
+
+# The blocks which changed between two versions of a course structure. See SplitMongoModuleStore.get_block_changes.
+BlockChanges = namedtuple('BlockChanges', 'version changed removed')
+
+
+class LRUCache(object):
+    """
+    A thread-safe, process-local mapping which holds at most max_size entries,
+    dropping the least recently used one when full.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value cached for key (marking it as recently used), or default."""
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        """Cache value for key, evicting the least recently used entries if needed."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -3,16 +3,18 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 import datetime
 import cPickle as pickle
+import logging
 import math
 import zlib
 import pymongo
 import pytz
+from bson.objectid import ObjectId
 import re
+from collections import defaultdict
 from contextlib import contextmanager
 from time import time
 
-# Import this just to export it
-from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
+from pymongo.errors import DuplicateKeyError
 from django.core.cache import get_cache, InvalidCacheBackendError
 import dogstats_wrapper as dog_stats_api
 
@@ -20,11 +22,13 @@ from contracts import check, new_contract
 from mongodb_proxy import autoretry_read, MongoProxy
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
-from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import BlockKey, LRUCache
 
 
 new_contract('BlockData', BlockData)
 
+log = logging.getLogger(__name__)
+
 
 def round_power_2(value):
     """
@@ -144,6 +148,21 @@ class QueryTimer(object):
 
 TIMER = QueryTimer(__name__, 0.01)
 
+# The number of structure versions whose secondary indexes are kept in each process.
+STRUCTURE_INDEX_CACHE_SIZE = 32
+
+# Fields of a delta-encoded structure document (see MongoConnection.insert_structure):
+# the id of the structure the delta applies to, the number of deltas between this
+# document and the nearest full snapshot, and the keys of the blocks the delta removes.
+DELTA_BASE = 'delta_base'
+DELTA_DEPTH = 'delta_depth'
+DELETED_BLOCKS = 'deleted_blocks'
+
+# The number of structures removed per query by MongoConnection.prune_structures,
+# and the default age in seconds below which it leaves a structure alone.
+PRUNE_BATCH_SIZE = 1000
+PRUNE_MIN_AGE = 60 * 60
+
 
 def structure_from_mongo(structure, course_context=None):
     """
@@ -260,16 +279,81 @@ class CourseStructureCache(object):
             self.cache.set(key, compressed_pickled_data, None)
 
 
+class StructureIndex(object):
+    """
+    Secondary indexes over the blocks of a single structure version.
+
+    Attributes:
+        parents (dict): BlockKey -> list of the BlockKeys which list it as a child
+        blocks_by_type (dict): block type -> list of the BlockKeys of that type
+        blocks_by_id (dict): block id -> list of the BlockKeys with that id
+    """
+    def __init__(self, structure):
+        self.parents = defaultdict(list)
+        self.blocks_by_type = defaultdict(list)
+        self.blocks_by_id = defaultdict(list)
+        for block_key, block in structure['blocks'].iteritems():
+            self.blocks_by_type[block_key.type].append(block_key)
+            self.blocks_by_id[block_key.id].append(block_key)
+            for child in block.fields.get('children', []):
+                parents = self.parents[BlockKey(*child)]
+                # a block which lists the same child twice is still only one parent
+                if not parents or parents[-1] != block_key:
+                    parents.append(block_key)
+
+    def get_parents(self, block_key):
+        """Return the list of BlockKeys of block_key's parents."""
+        return list(self.parents.get(block_key, []))
+
+    def get_blocks_by_type(self, block_type):
+        """Return the list of BlockKeys of the blocks of type block_type."""
+        return list(self.blocks_by_type.get(block_type, []))
+
+    def get_blocks_by_id(self, block_id):
+        """Return the list of BlockKeys of the blocks whose id is block_id."""
+        return list(self.blocks_by_id.get(block_id, []))
+
+
+class StructureIndexCache(object):
+    """
+    Process-local, least-recently-used cache of :class:`StructureIndex` objects
+    keyed by structure id.
+
+    Persisted structures are immutable, so an index never has to be invalidated;
+    callers must not use this cache for structures that are still being edited.
+    """
+    def __init__(self, max_size=STRUCTURE_INDEX_CACHE_SIZE):
+        self._indexes = LRUCache(max_size)
+
+    def get(self, structure, course_context=None):
+        """Return the StructureIndex for structure, building it if it isn't cached."""
+        index = self._indexes.get(structure['_id'])
+        if index is None:
+            with TIMER.timer("StructureIndexCache.build", course_context) as tagger:
+                tagger.measure('blocks', len(structure['blocks']))
+                index = StructureIndex(structure)
+            self._indexes.set(structure['_id'], index)
+        return index
+
+    def clear(self):
+        """Drop all cached indexes."""
+        self._indexes.clear()
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_snapshot_interval=0, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If structure_snapshot_interval is set, new structures are stored as a delta against their
+        previous version, with a full snapshot written at least every structure_snapshot_interval
+        versions. Otherwise every structure is stored in full.
         """
         if kwargs.get('replicaSet') is None:
             kwargs.pop('replicaSet', None)
@@ -302,6 +386,9 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+        self.structure_indexes = StructureIndexCache()
+        self.structure_snapshot_interval = structure_snapshot_interval
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -332,10 +419,19 @@ class MongoConnection(object):
                     structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
 
+                if DELTA_BASE in structure:
+                    structure = self._apply_delta(structure, course_context)
+
                 cache.set(key, structure, course_context)
 
             return structure
 
+    def get_structure_index(self, structure, course_context=None):
+        """
+        Get the :class:`StructureIndex` for a persisted (and hence immutable) structure.
+        """
+        return self.structure_indexes.get(structure, course_context)
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
@@ -347,7 +443,7 @@ class MongoConnection(object):
         with TIMER.timer("find_structures_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_doc(structure, course_context)
                 for structure in self.structures.find({'_id': {'$in': ids}})
             ]
             tagger.measure("structures", len(docs))
@@ -364,7 +460,7 @@ class MongoConnection(object):
         with TIMER.timer("find_structures_derived_from", course_context) as tagger:
             tagger.measure("base_ids", len(ids))
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_doc(structure, course_context)
                 for structure in self.structures.find({'previous_version': {'$in': ids}})
             ]
             tagger.measure("structures", len(docs))
@@ -375,13 +471,16 @@ class MongoConnection(object):
         """
         Find all structures that originated from ``original_version`` that contain ``block_key``.
 
+        A delta-encoded structure only matches if it changed ``block_key``, which are the only
+        structures that :meth:`SplitMongoModuleStore.get_block_generations` looks at.
+
         Arguments:
             original_version (str or ObjectID): The id of a structure
             block_key (BlockKey): The id of the block in question
         """
         with TIMER.timer("find_ancestor_structures", course_context) as tagger:
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_doc(structure, course_context)
                 for structure in self.structures.find({
                     'original_version': original_version,
                     'blocks': {
@@ -398,13 +497,138 @@ class MongoConnection(object):
             tagger.measure("structures", len(docs))
             return docs
 
+    def _structure_from_doc(self, doc, course_context=None):
+        """
+        Convert a structure document read from mongo into a complete structure.
+        """
+        structure = structure_from_mongo(doc, course_context)
+        if DELTA_BASE in structure:
+            structure = self._apply_delta(structure, course_context)
+        return structure
+
+    def _apply_delta(self, delta, course_context=None):
+        """
+        Rebuild a complete structure from a delta-encoded one (as returned by structure_from_mongo)
+        by applying it to the structure it is based on.
+        """
+        with TIMER.timer("apply_delta", course_context) as tagger:
+            tagger.measure("depth", delta.pop(DELTA_DEPTH, 0))
+            base = self.get_structure(delta.pop(DELTA_BASE), course_context)
+            blocks = base['blocks']
+            for block_key in delta.pop(DELETED_BLOCKS, []):
+                blocks.pop(BlockKey(*block_key), None)
+            blocks.update(delta['blocks'])
+            delta['blocks'] = blocks
+            return delta
+
+    def _encode_structure(self, structure, course_context=None):
+        """
+        Return the document to store for ``structure``: either the whole structure, or only
+        the blocks which differ from its previous version when delta encoding is enabled.
+        """
+        previous_version = structure.get('previous_version')
+        if not self.structure_snapshot_interval or previous_version is None:
+            return structure_to_mongo(structure, course_context)
+
+        previous_doc = self.structures.find_one({'_id': previous_version}, {DELTA_DEPTH: True})
+        if previous_doc is None:
+            return structure_to_mongo(structure, course_context)
+        depth = previous_doc.get(DELTA_DEPTH, 0) + 1
+        if depth >= self.structure_snapshot_interval:
+            return structure_to_mongo(structure, course_context)
+
+        base_blocks = self.get_structure(previous_version, course_context)['blocks']
+        changed_blocks = {
+            block_key: block
+            for block_key, block in structure['blocks'].iteritems()
+            # BlockData only defines __eq__
+            if not base_blocks.get(block_key) == block
+        }
+        doc = structure_to_mongo(dict(structure, blocks=changed_blocks), course_context)
+        doc[DELTA_BASE] = previous_version
+        doc[DELTA_DEPTH] = depth
+        doc[DELETED_BLOCKS] = [
+            [block_key.type, block_key.id]
+            for block_key in base_blocks.viewkeys() - structure['blocks'].viewkeys()
+        ]
+        return doc
+
     def insert_structure(self, structure, course_context=None):
         """
         Insert a new structure into the database.
         """
         with TIMER.timer("insert_structure", course_context) as tagger:
             tagger.measure("blocks", len(structure["blocks"]))
-            self.structures.insert(structure_to_mongo(structure, course_context))
+            doc = self._encode_structure(structure, course_context)
+            tagger.measure("stored_blocks", len(doc["blocks"]))
+            self.structures.insert(doc)
+
+    def insert_structures(self, structures, course_context=None):
+        """
+        Insert several new structures into the database with a single insert, skipping any
+        which are already there.
+        """
+        with TIMER.timer("insert_structures", course_context) as tagger:
+            tagger.measure("structures", len(structures))
+            tagger.measure("blocks", sum(len(structure["blocks"]) for structure in structures))
+            docs = [self._encode_structure(structure, course_context) for structure in structures]
+            self._insert_all(self.structures, docs)
+
+    def prune_structures(self, keep_versions=0, min_age=PRUNE_MIN_AGE, dry_run=False):
+        """
+        Delete the structures which no course or library index can reach.
+
+        A structure is kept if it is the current version of some branch, one of the
+        ``keep_versions`` versions preceding a current version, the original version of a
+        kept structure, or less than ``min_age`` seconds old. A kept delta-encoded structure
+        whose base is deleted is first rewritten as a full snapshot.
+
+        Returns:
+            (kept, pruned): the ids of the structures kept and of those pruned (or which would be,
+            if ``dry_run``).
+        """
+        # Read the structures before the indexes, so that a structure which becomes a head
+        # in between is seen as one; and leave recent structures alone, since a bulk operation
+        # inserts its structures before it updates the index which points at them.
+        graph = {
+            doc['_id']: doc
+            for doc in self.structures.find({}, {'previous_version': True, 'original_version': True, DELTA_BASE: True})
+        }
+        heads = set()
+        for index in self.course_index.find({}, {'versions': True}):
+            heads.update(index.get('versions', {}).itervalues())
+        recent = datetime.datetime.now(pytz.utc) - datetime.timedelta(seconds=min_age)
+
+        kept = set()
+        for head in heads:
+            version = head
+            for __ in xrange(keep_versions + 1):
+                if version not in graph:
+                    break
+                kept.add(version)
+                version = graph[version].get('previous_version')
+            original_version = graph.get(head, {}).get('original_version')
+            if original_version in graph:
+                kept.add(original_version)
+
+        pruned = set(
+            structure_id
+            for structure_id in graph.viewkeys() - kept
+            if not isinstance(structure_id, ObjectId) or structure_id.generation_time < recent
+        )
+        kept = set(graph) - pruned
+        if dry_run:
+            return kept, pruned
+
+        for structure_id in kept:
+            if graph[structure_id].get(DELTA_BASE) in pruned:
+                structure = self.get_structure(structure_id)
+                self.structures.update({'_id': structure_id}, structure_to_mongo(structure))
+
+        pruned_list = list(pruned)
+        for start in xrange(0, len(pruned_list), PRUNE_BATCH_SIZE):
+            self.structures.remove({'_id': {'$in': pruned_list[start:start + PRUNE_BATCH_SIZE]}})
+        return kept, pruned
 
     def get_course_index(self, key, ignore_case=False):
         """
@@ -518,6 +742,35 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Insert several new definitions into the database with a single insert, skipping any
+        which are already there.
+        """
+        with TIMER.timer("insert_definitions", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            self._insert_all(self.definitions, definitions)
+
+    def _insert_all(self, collection, docs):
+        """
+        Insert docs into collection, carrying on past (and ignoring) documents whose _id
+        is already present, since the split collections are append only.
+
+        Any other error is raised, as is a duplicate key error if some of the docs were
+        not written.
+        """
+        try:
+            collection.insert(docs, continue_on_error=True)
+        except DuplicateKeyError as err:
+            details = err.details or {}
+            if any(error.get('code') != 11000 for error in details.get('writeErrors', [details])):
+                raise err
+            # pymongo only reports the last error of the insert, so check that every doc is there.
+            ids = [doc['_id'] for doc in docs]
+            if collection.find({'_id': {'$in': ids}}).count() != len(set(ids)):
+                raise err
+            log.debug("Skipped already existing documents while inserting into %s", collection.name)
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -63,6 +63,7 @@ from mongodb_proxy import autoretry_read
 from path import path
 from pytz import UTC
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
 
 from xblock.core import XBlock
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -79,8 +80,8 @@ from xmodule.modulestore import (
 
 from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
-from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, StructureIndex
+from xmodule.modulestore.split_mongo import BlockChanges, BlockKey, CourseEnvelope, LRUCache
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
 from types import NoneType
@@ -127,6 +128,8 @@ class SplitBulkWriteRecord(BulkOpsRecord):
         self.modules = defaultdict(dict)
         self.definitions = {}
         self.definitions_in_db = set()
+        # dict(version_guid, StructureIndex) of the structures edited in this bulk operation
+        self.structure_indexes = {}
         self.course_key = None
 
     # TODO: This needs to track which branches have actually been modified/versioned,
@@ -161,6 +164,7 @@ class SplitBulkWriteRecord(BulkOpsRecord):
         if self.index is not None:
             self.index.setdefault('versions', {})[branch] = structure['_id']
         self.structures[structure['_id']] = structure
+        self.structure_indexes.pop(structure['_id'], None)
 
     def __repr__(self):
         return u"SplitBulkWriteRecord<{!r}, {!r}, {!r}, {!r}, {!r}>".format(
@@ -238,28 +242,26 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         dirty = False
 
-        # If the content is dirty, then update the database
-        for _id in bulk_write_record.structures.viewkeys() - bulk_write_record.structures_in_db:
+        # If the content is dirty, then update the database, writing all the new structures
+        # and all the new definitions with one insert each.
+        # We may not have looked up some of them inside this bulk operation, and thus
+        # not realize that they are already in the database. That's OK, the store is
+        # append only, so the insert skips anything which has already been written.
+        new_structures = [
+            bulk_write_record.structures[_id]
+            for _id in bulk_write_record.structures.viewkeys() - bulk_write_record.structures_in_db
+        ]
+        if new_structures:
             dirty = True
+            self.db_connection.insert_structures(new_structures, bulk_write_record.course_key)
 
-            try:
-                self.db_connection.insert_structure(bulk_write_record.structures[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this structure inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate structure %s", _id)
-
-        for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db:
+        new_definitions = [
+            bulk_write_record.definitions[_id]
+            for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db
+        ]
+        if new_definitions:
             dirty = True
-
-            try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this definition inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+            self.db_connection.insert_definitions(new_definitions, bulk_write_record.course_key)
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
@@ -341,6 +343,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
+            bulk_write_record.structure_indexes.pop(structure['_id'], None)
         else:
             self.db_connection.insert_structure(structure, course_key)
 
@@ -456,7 +459,10 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         # If we have an active bulk write, and it's already been edited, then just use that structure
         if bulk_write_record.active and course_key.branch in bulk_write_record.dirty_branches:
-            return bulk_write_record.structure_for_branch(course_key.branch)
+            structure = bulk_write_record.structure_for_branch(course_key.branch)
+            # the caller is about to edit it
+            bulk_write_record.structure_indexes.pop(structure['_id'], None)
+            return structure
 
         # Otherwise, make a new structure
         new_structure = copy.deepcopy(structure)
@@ -640,16 +646,29 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, structure_snapshot_interval=0,
+                 published_descriptor_cache_size=0, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_snapshot_interval: if set, store each new structure as a delta against its
+            previous version, writing a full snapshot at least this often (see MongoConnection)
+        :param published_descriptor_cache_size: if set, keep the fully loaded block data (settings and
+            content fields) of this many published structure versions in the process, so that requests
+            reading a published course build its descriptors without fetching any definitions
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(
+            structure_snapshot_interval=structure_snapshot_interval, **doc_store_config
+        )
         self.db = self.db_connection.database
 
+        if published_descriptor_cache_size:
+            self.published_module_data = LRUCache(published_descriptor_cache_size)
+        else:
+            self.published_module_data = None
+
         if default_class is not None:
             module_path, __, class_name = default_class.rpartition('.')
             class_ = getattr(import_module(module_path), class_name)
@@ -756,12 +775,59 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         runtime = self._get_cache(course_entry.structure['_id'])
         if runtime is None:
             lazy = kwargs.pop('lazy', True)
-            runtime = self.create_runtime(course_entry, lazy)
-            self._add_cache(course_entry.structure['_id'], runtime)
-            self.cache_items(runtime, block_keys, course_entry.course_key, depth, lazy)
+            published_module_data = self._get_published_module_data(course_entry)
+            if published_module_data is not None:
+                # Every block is already loaded. Each request gets its own runtime (and hence its own
+                # descriptors) over a copy of the shared map, so nothing bound to a user is shared.
+                runtime = self.create_runtime(course_entry, False, module_data=dict(published_module_data))
+                self._add_cache(course_entry.structure['_id'], runtime)
+            else:
+                runtime = self.create_runtime(course_entry, lazy)
+                self._add_cache(course_entry.structure['_id'], runtime)
+                self.cache_items(runtime, block_keys, course_entry.course_key, depth, lazy)
 
         return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
 
+    def _get_published_module_data(self, course_entry):
+        """
+        Return the map of BlockKey to fully loaded BlockData for the published structure of course_entry
+        from the cross-request published block cache, loading all of its definitions on a miss.
+
+        Returns None if that cache is disabled or doesn't apply to course_entry.
+        """
+        if self.published_module_data is None:
+            return None
+        if course_entry.course_key.branch != ModuleStoreEnum.BranchName.published:
+            return None
+
+        structure = course_entry.structure
+        bulk_write_record = self._get_bulk_ops_record(course_entry.course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            # still being edited in this bulk operation
+            return None
+
+        module_data = self.published_module_data.get(structure['_id'])
+        if module_data is None:
+            definitions = {
+                definition['_id']: definition
+                for definition in self.get_definitions(
+                    course_entry.course_key,
+                    [block.definition for block in structure['blocks'].itervalues() if block.definition is not None]
+                )
+            }
+            module_data = {}
+            for block_key, block in structure['blocks'].iteritems():
+                # copy the block so the structure's own BlockData stays unloaded
+                block_data = BlockData(**block.to_storable())
+                block_data.fields = dict(block.fields)
+                definition = definitions.get(block.definition)
+                if definition is not None:
+                    block_data.fields.update(definition.get('fields'))
+                    block_data.definition_loaded = True
+                module_data[block_key] = block_data
+            self.published_module_data.set(structure['_id'], module_data)
+        return module_data
+
     def _get_cache(self, course_version_guid):
         """
         Find the descriptor cache for this course if it exists
@@ -1095,12 +1161,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if settings is None:
             settings = {}
+        blocks = course.structure['blocks']
+        structure_index = self._get_structure_index(course)
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
             block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                if block_name == block_id.id and _block_matches_all(block):
+            for block_id in structure_index.get_blocks_by_id(block_name):
+                if _block_matches_all(blocks[block_id]):
                     block_ids.append(block_id)
 
             return self._load_items(course, block_ids, **kwargs)
@@ -1111,8 +1179,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # don't expect caller to know that children are in fields
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+
+        # narrow the candidates using the block type index when the type is given literally
+        block_type = qualifiers.get('block_type')
+        if isinstance(block_type, basestring):
+            candidates = structure_index.get_blocks_by_type(block_type)
+        elif (  # pylint: disable=bad-continuation
+            isinstance(block_type, dict) and block_type.keys() == ['$in'] and
+            all(isinstance(value, basestring) for value in block_type['$in'])
+        ):
+            candidates = [
+                block_id
+                for value in set(block_type['$in'])
+                for block_id in structure_index.get_blocks_by_type(value)
+            ]
+        else:
+            candidates = blocks.iterkeys()
+
+        for block_id in candidates:
+            if _block_matches_all(blocks[block_id]):
                 items.append(block_id)
 
         if len(items) > 0:
@@ -1133,7 +1218,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        parent_ids = self._get_structure_index(course).get_parents(BlockKey.from_usage_key(locator))
         if len(parent_ids) == 0:
             return None
         # find alphabetically least
@@ -1342,6 +1427,84 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return usage_key, block.edit_info.original_usage_version
         return None, None
 
+    def get_block_changes(self, course_key, since_version=None):
+        """
+        Compare the current structure of course_key's branch with the structure since_version.
+
+        Returns a BlockChanges whose version is the current structure id, and whose changed
+        and removed are the sets of version agnostic, branchless usage keys of:
+            changed: the blocks which are new, were moved or edited, inherit from such a block,
+                or are an ancestor of any block which changed
+            removed: the blocks which are no longer in the structure
+        changed and removed are None if since_version is None or can't be found, in which case
+        every block should be considered changed.
+        """
+        course_entry = self._lookup_course(course_key)
+        structure = course_entry.structure
+        if since_version is None:
+            return BlockChanges(structure['_id'], None, None)
+        try:
+            since_version = ObjectId(since_version)
+        except (InvalidId, TypeError):
+            return BlockChanges(structure['_id'], None, None)
+        if since_version == structure['_id']:
+            return BlockChanges(structure['_id'], set(), set())
+        previous = self.db_connection.find_structures_by_id([since_version], course_key)
+        if not previous:
+            return BlockChanges(structure['_id'], None, None)
+
+        previous = previous[0]
+        old_blocks = previous['blocks']
+        new_blocks = structure['blocks']
+        old_index = self.db_connection.get_structure_index(previous, course_key)
+        new_index = self._get_structure_index(course_entry)
+
+        def settings(block):
+            """The block's fields other than its children."""
+            return dict((name, value) for name, value in block.fields.iteritems() if name != 'children')
+
+        changed = set()
+        # blocks whose descendants inherit their changes
+        changed_subtrees = []
+        for block_key, block in new_blocks.iteritems():
+            old_block = old_blocks.get(block_key)
+            if old_block is None or old_index.get_parents(block_key) != new_index.get_parents(block_key):
+                changed_subtrees.append(block_key)
+            elif (
+                    old_block.definition != block.definition or
+                    not old_block.defaults == block.defaults or
+                    not settings(old_block) == settings(block)
+            ):
+                changed_subtrees.append(block_key)
+            elif old_block.fields.get('children', []) != block.fields.get('children', []):
+                changed.add(block_key)
+
+        while changed_subtrees:
+            block_key = changed_subtrees.pop()
+            if block_key not in changed:
+                changed.add(block_key)
+                changed_subtrees.extend(
+                    BlockKey(*child) for child in new_blocks[block_key].fields.get('children', [])
+                    if BlockKey(*child) in new_blocks
+                )
+
+        ancestors = [parent for changed_key in changed for parent in new_index.get_parents(changed_key)]
+        while ancestors:
+            block_key = ancestors.pop()
+            if block_key not in changed:
+                changed.add(block_key)
+                ancestors.extend(new_index.get_parents(block_key))
+
+        agnostic_key = course_key.replace(branch=None, version_guid=None)
+        return BlockChanges(
+            structure['_id'],
+            set(agnostic_key.make_usage_key(block_key.type, block_key.id) for block_key in changed),
+            set(
+                agnostic_key.make_usage_key(block_key.type, block_key.id)
+                for block_key in old_blocks if block_key not in new_blocks
+            ),
+        )
+
     def create_definition_from_data(self, course_key, new_def_data, category, user_id):
         """
         Pull the definition fields out of descriptor and save to the db as a new definition
@@ -2893,6 +3056,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             'schema_version': self.SCHEMA_VERSION,
         }
 
+    def _get_structure_index(self, course_entry):
+        """
+        Return the :class:`StructureIndex` (parent map and block type index) of the structure in
+        course_entry.
+
+        Indexes of persisted structures are cached per structure version. Indexes of structures
+        which are still being edited are cached on the active bulk operation, until the structure
+        is updated.
+        """
+        structure = course_entry.structure
+        bulk_write_record = self._get_bulk_ops_record(course_entry.course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            structure_index = bulk_write_record.structure_indexes.get(structure['_id'])
+            if structure_index is None:
+                structure_index = StructureIndex(structure)
+                bulk_write_record.structure_indexes[structure['_id']] = structure_index
+            return structure_index
+        return self.db_connection.get_structure_index(structure, course_entry.course_key)
+
     @contract(block_key=BlockKey)
     def _get_parents_from_structure(self, block_key, structure):
         """
@@ -3087,14 +3269,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         return {ModuleStoreEnum.Type.split: self.db_connection.heartbeat()}
 
-    def create_runtime(self, course_entry, lazy):
+    def create_runtime(self, course_entry, lazy, module_data=None):
         """
         Create the proper runtime for this course
         """
         return CachingDescriptorSystem(
             modulestore=self,
             course_entry=course_entry,
-            module_data={},
+            module_data=module_data if module_data is not None else {},
             lazy=lazy,
             default_class=self.default_class,
             error_tracker=self.error_tracker,
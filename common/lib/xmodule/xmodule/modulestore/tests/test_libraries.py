@@ -29,7 +29,7 @@ class TestLibraries(MixedSplitTestCase):
         find_one({'org': '...', 'run': 'library', 'course': '...'})
         insert(definition: {'block_type': 'library', 'fields': {}})
 
-        insert_structure(bulk)
+        insert_structures(bulk)
         insert_course_index(bulk)
         get_course_index(bulk)
         """
@@ -822,8 +822,8 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
     #   Sends: delete item, update parent
     # Split
     #   Find: active_versions, 2 structures (published & draft), definition (unnecessary)
-    #   Sends: updated draft and published structures and active_versions
-    @ddt.data(('draft', 7, 2), ('split', 4, 3))
+    #   Sends: updated draft and published structures (in one insert) and active_versions
+    @ddt.data(('draft', 7, 2), ('split', 4, 2))
     @ddt.unpack
     def test_delete_item(self, default_ms, max_find, max_send):
         """
@@ -3,6 +3,7 @@
 """
 from mock import patch
 import datetime
+import ddt
 from importlib import import_module
 from path import path
 import random
@@ -10,8 +11,10 @@ import re
 import unittest
 import uuid
 
+from bson.objectid import ObjectId
 from contracts import contract
 from nose.plugins.attrib import attr
+from pymongo.errors import DuplicateKeyError
 from django.core.cache import get_cache, InvalidCacheBackendError
 
 from openedx.core.lib import tempdir
@@ -29,8 +32,8 @@ from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
-from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.tests.factories import check_mongo_calls
+from xmodule.modulestore.split_mongo import BlockKey, LRUCache
+from xmodule.modulestore.tests.factories import check_mongo_calls, check_mongo_calls_range
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
@@ -846,6 +849,196 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestStructureIndex(SplitModuleTest):
+    """Tests for the per-structure-version parent map and block type index"""
+
+    def test_index_cached_per_version(self):
+        store = modulestore()
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        index = store._get_structure_index(store._lookup_course(course_key))  # pylint: disable=protected-access
+
+        self.assertEqual(index.get_parents(BlockKey('chapter', 'chapter1')), [BlockKey('course', 'head12345')])
+        self.assertEqual(index.get_parents(BlockKey('course', 'head12345')), [])
+        self.assertEqual(len(index.get_blocks_by_type('chapter')), 3)
+        self.assertEqual(index.get_blocks_by_id('chapter1'), [BlockKey('chapter', 'chapter1')])
+        # the index is reused for as long as the version is current
+        self.assertIs(
+            store._get_structure_index(store._lookup_course(course_key)),  # pylint: disable=protected-access
+            index
+        )
+
+    def test_index_follows_edits(self):
+        store = modulestore()
+        user = random.getrandbits(32)
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter = course_key.make_usage_key('chapter', 'chapter1')
+        # warm the index of the current version
+        self.assertEqual(len(store.get_items(course_key, qualifiers={'category': 'problem'})), 3)
+
+        with store.bulk_operations(course_key):
+            first = store.create_child(user, chapter, 'problem', fields={'display_name': 'first'})
+            # the index of the structure being edited is kept until it is edited again
+            self.assertEqual(store.get_parent_location(first.location).block_id, 'chapter1')
+            course_entry = store._lookup_course(course_key)  # pylint: disable=protected-access
+            index = store._get_structure_index(course_entry)  # pylint: disable=protected-access
+            self.assertIs(store._get_structure_index(course_entry), index)  # pylint: disable=protected-access
+            second = store.create_child(user, chapter, 'problem', fields={'display_name': 'second'})
+            self.assertEqual(store.get_parent_location(second.location).block_id, 'chapter1')
+            self.assertEqual(len(store.get_items(course_key, qualifiers={'category': 'problem'})), 5)
+
+        self.assertEqual(store.get_parent_location(second.location.version_agnostic()).block_id, 'chapter1')
+        self.assertEqual(
+            len(store.get_items(course_key, qualifiers={'category': {'$in': ['problem', 'chapter']}})),
+            8
+        )
+
+
+class TestStructureDeltas(SplitModuleTest):
+    """Tests for delta-encoded structure storage and structure pruning"""
+
+    def setUp(self):
+        super(TestStructureDeltas, self).setUp()
+        self.db_connection = modulestore().db_connection
+        self.db_connection.structure_snapshot_interval = 3
+        self.course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        self.chapter = self.course_key.make_usage_key('chapter', 'chapter1')
+
+    def _stored(self, structure_id):
+        """
+        Returns the raw document stored for structure_id.
+        """
+        return self.db_connection.structures.find_one({'_id': structure_id})
+
+    def _add_problems(self, count):
+        """
+        Adds count problems to chapter1, one version each, and returns the new problems.
+        """
+        return [
+            modulestore().create_child(self.user_id, self.chapter, 'problem', fields={'display_name': str(index)})
+            for index in range(count)
+        ]
+
+    def test_deltas_are_transparent(self):
+        original_blocks = modulestore().db_connection.get_structure(
+            modulestore().get_course_index(self.course_key)['versions'][BRANCH_NAME_DRAFT]
+        )['blocks']
+        problems = self._add_problems(4)
+        versions = [problem.location.version_guid for problem in problems]
+
+        self.assertEqual([self._stored(version).get('delta_depth', 0) for version in versions], [1, 2, 0, 1])
+        self.assertLess(len(self._stored(versions[0])['blocks']), len(original_blocks))
+
+        structure = self.db_connection.get_structure(versions[1])
+        self.assertEqual(
+            set(structure['blocks']),
+            set(original_blocks) | set(BlockKey.from_usage_key(problem.location) for problem in problems[:2])
+        )
+        self.assertNotIn('delta_base', structure)
+        self.assertEqual(len(modulestore().get_items(self.course_key, qualifiers={'category': 'problem'})), 7)
+
+        modulestore().delete_item(problems[3].location.version_agnostic(), self.user_id)
+        head = modulestore().get_course_index(self.course_key)['versions'][BRANCH_NAME_DRAFT]
+        self.assertIn(
+            [problems[3].location.block_type, problems[3].location.block_id],
+            self._stored(head)['deleted_blocks']
+        )
+        self.assertNotIn(
+            BlockKey.from_usage_key(problems[3].location),
+            self.db_connection.get_structure(head)['blocks']
+        )
+
+    def test_prune_structures(self):
+        problems = self._add_problems(3)
+        versions = [problem.location.version_guid for problem in problems]
+
+        kept, pruned = self.db_connection.prune_structures(keep_versions=1, min_age=0, dry_run=True)
+        self.assertIn(versions[0], pruned)
+        self.assertIsNotNone(self._stored(versions[0]))
+
+        kept, pruned = self.db_connection.prune_structures(keep_versions=1, min_age=0)
+        self.assertEqual(set(versions[1:]) & pruned, set())
+        self.assertTrue(set(versions[1:]) <= kept)
+        self.assertIsNone(self._stored(versions[0]))
+        # the oldest kept version lost its base, so it was rewritten as a snapshot
+        self.assertNotIn('delta_base', self._stored(versions[1]))
+        self.assertEqual(len(modulestore().get_items(self.course_key, qualifiers={'category': 'problem'})), 6)
+
+
+@ddt.ddt
+class TestBatchedInserts(SplitModuleTest):
+    """Tests for the multi-document inserts made at the end of a bulk operation"""
+
+    def test_insert_definitions_skips_existing(self):
+        db_connection = modulestore().db_connection
+        existing = {'_id': ObjectId(), 'block_type': 'html', 'fields': {'data': 'existing'}, 'edit_info': {}}
+        new = {'_id': ObjectId(), 'block_type': 'html', 'fields': {'data': 'new'}, 'edit_info': {}}
+        db_connection.insert_definition(existing)
+
+        db_connection.insert_definitions([existing, new])
+        self.assertEqual(db_connection.get_definition(new['_id'])['fields'], {'data': 'new'})
+
+    @ddt.data(
+        {'code': 11000},
+        {'code': 11000, 'writeErrors': [{'code': 11000}, {'code': 121}]},
+    )
+    def test_insert_definitions_raises_other_errors(self, details):
+        db_connection = modulestore().db_connection
+        existing = {'_id': ObjectId(), 'block_type': 'html', 'fields': {'data': 'existing'}, 'edit_info': {}}
+        new = {'_id': ObjectId(), 'block_type': 'html', 'fields': {'data': 'new'}, 'edit_info': {}}
+        db_connection.insert_definition(existing)
+
+        # Either the new definition wasn't written, or an error other than a duplicate key was hidden
+        error = DuplicateKeyError('E11000 duplicate key error', 11000, details)
+        with patch.object(db_connection.definitions, 'insert', side_effect=error):
+            with self.assertRaises(DuplicateKeyError):
+                db_connection.insert_definitions([existing, new])
+
+    def test_bulk_operation_inserts_once(self):
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter = course_key.make_usage_key('chapter', 'chapter1')
+        # one insert of the new definitions, one of the new structure and one index update
+        with check_mongo_calls_range(max_sends=3):
+            with modulestore().bulk_operations(course_key):
+                for index in range(5):
+                    modulestore().create_child(
+                        self.user_id, chapter, 'html', fields={'data': str(index), 'display_name': str(index)}
+                    )
+
+
+class TestPublishedDescriptorCache(SplitModuleTest):
+    """Tests for the cross-request cache of published block data"""
+
+    def setUp(self):
+        super(TestPublishedDescriptorCache, self).setUp()
+        modulestore().published_module_data = LRUCache(2)
+        draft_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        self.course_key = draft_key.for_branch(BRANCH_NAME_PUBLISHED)
+        modulestore().copy(
+            self.user_id, draft_key, self.course_key, [draft_key.make_usage_key('course', 'head12345')], None
+        )
+
+    def test_published_reads_share_block_data(self):
+        first = modulestore().get_course(self.course_key)
+        self.assertEqual(len(modulestore().published_module_data), 1)
+
+        # all the definitions were loaded with the first read: only the index and structure are fetched
+        with check_mongo_calls(2):
+            second = modulestore().get_course(self.course_key)
+            children = second.get_children()
+
+        # but every read builds its own descriptors
+        self.assertIsNot(first, second)
+        self.assertEqual(
+            [child.location for child in children],
+            [child.location for child in first.get_children()]
+        )
+        self.assertIsNot(children[0], first.get_children()[0])
+
+    def test_draft_reads_not_cached(self):
+        modulestore().get_course(self.course_key.for_branch(BRANCH_NAME_DRAFT))
+        self.assertEqual(len(modulestore().published_module_data), 0)
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
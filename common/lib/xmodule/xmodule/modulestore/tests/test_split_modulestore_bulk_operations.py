@@ -139,7 +139,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key, self.structure)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertConnCalls(call.insert_structure(self.structure, self.course_key))
+        self.assertConnCalls(call.insert_structures([self.structure], self.course_key))
 
     def test_write_multiple_structures_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -150,13 +150,8 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key.replace(branch='b'), other_structure)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_structure(self.structure, self.course_key),
-                call.insert_structure(other_structure, self.course_key)
-            ],
-            self.conn.mock_calls
-        )
+        self.assertEqual(len(self.conn.mock_calls), 1)
+        self.assertItemsEqual(self.conn.insert_structures.call_args[0][0], [self.structure, other_structure])
 
     def test_write_index_and_definition_on_close(self):
         original_index = {'versions': {}}
@@ -168,7 +163,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
         self.assertConnCalls(
-            call.insert_definition(self.definition, self.course_key),
+            call.insert_definitions([self.definition], self.course_key),
             call.update_course_index(
                 {'versions': {self.course_key.branch: self.definition['_id']}},
                 from_index=original_index,
@@ -186,18 +181,13 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.bulk.insert_course_index(self.course_key, {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}})
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key),
-                call.update_course_index(
-                    {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
-                    from_index=original_index,
-                    course_context=self.course_key,
-                )
-            ],
-            self.conn.mock_calls
+        self.assertItemsEqual(self.conn.insert_definitions.call_args[0][0], [self.definition, other_definition])
+        self.conn.update_course_index.assert_called_once_with(
+            {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
+            from_index=original_index,
+            course_context=self.course_key,
         )
+        self.assertEqual(len(self.conn.mock_calls), 2)
 
     def test_write_definition_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -206,7 +196,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key, self.definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertConnCalls(call.insert_definition(self.definition, self.course_key))
+        self.assertConnCalls(call.insert_definitions([self.definition], self.course_key))
 
     def test_write_multiple_definitions_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -217,13 +207,8 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key)
-            ],
-            self.conn.mock_calls
-        )
+        self.assertEqual(len(self.conn.mock_calls), 1)
+        self.assertItemsEqual(self.conn.insert_definitions.call_args[0][0], [self.definition, other_definition])
 
     def test_write_index_and_structure_on_close(self):
         original_index = {'versions': {}}
@@ -235,7 +220,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
         self.assertConnCalls(
-            call.insert_structure(self.structure, self.course_key),
+            call.insert_structures([self.structure], self.course_key),
             call.update_course_index(
                 {'versions': {self.course_key.branch: self.structure['_id']}},
                 from_index=original_index,
@@ -253,18 +238,13 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key.replace(branch='b'), other_structure)
         self.bulk.insert_course_index(self.course_key, {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}})
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_structure(self.structure, self.course_key),
-                call.insert_structure(other_structure, self.course_key),
-                call.update_course_index(
-                    {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}},
-                    from_index=original_index,
-                    course_context=self.course_key,
-                )
-            ],
-            self.conn.mock_calls
+        self.assertItemsEqual(self.conn.insert_structures.call_args[0][0], [self.structure, other_structure])
+        self.conn.update_course_index.assert_called_once_with(
+            {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}},
+            from_index=original_index,
+            course_context=self.course_key,
         )
+        self.assertEqual(len(self.conn.mock_calls), 2)
 
     def test_version_structure_creates_new_version(self):
         self.assertNotEquals(
@@ -698,7 +678,7 @@ class TestBulkWriteMixinOpen(TestBulkWriteMixin):
         index_copy['versions']['draft'] = index['versions']['published']
         self.bulk.update_course_index(self.course_key, index_copy)
         self.bulk._end_bulk_operation(self.course_key)
-        self.conn.insert_structure.assert_called_once_with(published_structure, self.course_key)
+        self.conn.insert_structures.assert_called_once_with([published_structure], self.course_key)
         self.conn.update_course_index.assert_called_once_with(
             index_copy,
             from_index=self.conn.get_course_index.return_value,
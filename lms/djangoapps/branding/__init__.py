@@ -1,5 +1,3 @@
-from xmodule.modulestore.django import modulestore
-from xmodule.course_module import CourseDescriptor
 from django.conf import settings
 
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
@@ -8,16 +6,14 @@ from microsite_configuration import microsite
 
 def get_visible_courses():
     """
-    Return the set of CourseDescriptors that should be visible in this branded instance
+    Return the set of CourseOverviews that should be visible in this branded instance
     """
+    # Imported here to avoid a circular import, since course overviews import courseware.courses.
+    from openedx.core.djangoapps.content.course_overviews.catalog import get_catalog_index
 
-    filtered_by_org = microsite.get_value('course_org_filter')
-
-    _courses = modulestore().get_courses(org=filtered_by_org)
+    index = get_catalog_index()
 
-    courses = [c for c in _courses
-               if isinstance(c, CourseDescriptor)]
-    courses = sorted(courses, key=lambda course: course.number)
+    filtered_by_org = microsite.get_value('course_org_filter')
 
     subdomain = microsite.get_value('subdomain', 'default')
 
@@ -29,14 +25,14 @@ def get_visible_courses():
         filtered_visible_ids = frozenset([SlashSeparatedCourseKey.from_deprecated_string(c) for c in settings.COURSE_LISTINGS[subdomain]])
 
     if filtered_by_org:
-        return [course for course in courses if course.location.org == filtered_by_org]
+        return list(index.courses_of_org(filtered_by_org))
     if filtered_visible_ids:
-        return [course for course in courses if course.id in filtered_visible_ids]
+        return [course for course in index.courses if course.id in filtered_visible_ids]
     else:
         # Let's filter out any courses in an "org" that has been declared to be
         # in a Microsite
         org_filter_out_set = microsite.get_all_orgs()
-        return [course for course in courses if course.location.org not in org_filter_out_set]
+        return [course for course in index.courses if course.org not in org_filter_out_set]
 
 
 def get_university_for_request():
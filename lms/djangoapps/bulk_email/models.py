@@ -12,6 +12,9 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -20,7 +23,7 @@ from openedx.core.lib.html_to_text import html_to_text
 from openedx.core.lib.mail_utils import wrap_message
 
 from xmodule_django.models import CourseKeyField
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import anonymous_id_from_user_id, substitute_keywords_with_data
 
 log = logging.getLogger(__name__)
 
@@ -228,6 +231,126 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, global_context):
+        """
+        Returns a CompiledEmailTemplate rendering the plain text message of
+        each recipient of an email with the plain text body `plaintext`.
+        """
+        return CompiledEmailTemplate(self.plain_template, plaintext, global_context)
+
+    def compile_htmltext(self, htmltext, global_context):
+        """
+        Returns a CompiledEmailTemplate rendering the HTML message of each
+        recipient of an email with the HTML body `htmltext`.
+        """
+        return CompiledEmailTemplate(self.html_template, htmltext, global_context)
+
+
+class CompiledEmailTemplate(object):
+    """
+    An email template and message body rendered once with the context values
+    shared by all the recipients of an email, leaving slots for the values
+    of each recipient.
+
+    `render` returns the same message as `CourseEmailTemplate._render` would
+    with the context of a recipient, which must hold the recipient's 'name',
+    'email' and 'user_id'. Only the lines holding a slot are rendered and
+    wrapped for each recipient.
+    """
+    # Context values which differ for each recipient.
+    RECIPIENT_KEYS = ('name', 'email', 'user_id')
+    # Keywords of the message body which are substituted with data of each recipient.
+    RECIPIENT_KEYWORDS = ('%%USER_FULLNAME%%', '%%USER_ID%%')
+
+    SLOT_MARKER = u'\x00'
+    SLOT_RE = re.compile(u'\x00(\\d+)\x00')
+
+    def __init__(self, format_string, message_body, global_context):
+        self.format_string = format_string
+        self.message_body = message_body
+        self.lines = None
+        if self.SLOT_MARKER in format_string or self.SLOT_MARKER in message_body:
+            return
+        if self._formats_recipient_fields(format_string):
+            return
+
+        slots = self.RECIPIENT_KEYS + self.RECIPIENT_KEYWORDS
+        markers = {slot: u'{0}{1}{0}'.format(self.SLOT_MARKER, index) for index, slot in enumerate(slots)}
+
+        if 'course_id' in global_context:
+            for keyword in self.RECIPIENT_KEYWORDS:
+                message_body = message_body.replace(keyword, markers[keyword])
+            # The recipient keywords are replaced by slots, so any user id will do here.
+            message_body = substitute_keywords_with_data(message_body, dict(global_context, user_id=''))
+
+        context = dict(global_context)
+        context.update((key, markers[key]) for key in self.RECIPIENT_KEYS)
+        message = format_string.format(**context)
+        message = message.replace(COURSE_EMAIL_MESSAGE_BODY_TAG.format(), message_body, 1)
+
+        # Wrap the consecutive lines without slots at once.
+        self.lines = []
+        static_lines = []
+        for line in message.split('\n'):
+            if self.SLOT_MARKER in line:
+                if static_lines:
+                    self.lines.append(wrap_message('\n'.join(static_lines)))
+                    static_lines = []
+                parts = self.SLOT_RE.split(line)
+                for index in xrange(1, len(parts), 2):
+                    parts[index] = slots[int(parts[index])]
+                self.lines.append(parts)
+            else:
+                static_lines.append(line)
+        if static_lines:
+            self.lines.append(wrap_message('\n'.join(static_lines)))
+
+    def _formats_recipient_fields(self, format_string):
+        """
+        Returns whether the template applies a conversion, a format spec or an
+        attribute access to a recipient value, which are then left to `_render`.
+        """
+        for __, field_name, format_spec, conversion in Formatter().parse(format_string):
+            if field_name is None:
+                continue
+            name = re.match(r'[^.[]*', field_name).group(0)
+            if name in self.RECIPIENT_KEYS and (name != field_name or format_spec or conversion):
+                return True
+        return False
+
+    @staticmethod
+    def _slot_value(slot, context):
+        """
+        Returns the text of `slot` for the recipient of `context`.
+        """
+        if slot == '%%USER_FULLNAME%%':
+            return context.get('name')
+        elif slot == '%%USER_ID%%':
+            return anonymous_id_from_user_id(context['user_id'])
+        return u'{0}'.format(context[slot])
+
+    def render(self, context):
+        """
+        Returns the message for the recipient of `context`.
+        """
+        if self.lines is None:
+            # pylint: disable=protected-access
+            return CourseEmailTemplate._render(self.format_string, self.message_body, context)
+
+        rendered = []
+        values = {}
+        for line in self.lines:
+            if not isinstance(line, basestring):
+                parts = list(line)
+                for index in xrange(1, len(parts), 2):
+                    slot = parts[index]
+                    if slot not in values:
+                        values[slot] = self._slot_value(slot, context)
+                    parts[index] = values[slot]
+                line = wrap_message(u''.join(parts))
+            rendered.append(line)
+        return u'\n'.join(rendered)
+
 
 class CourseAuthorization(models.Model):
     """
@@ -6,7 +6,8 @@ to a course.
 import re
 import random
 import json
-from time import sleep
+import socket
+from time import sleep, time
 from collections import Counter
 import logging
 
@@ -53,6 +54,10 @@ from util.date_utils import get_default_time_display
 
 log = logging.getLogger('edx.celery.task')
 
+# The connection to the email backend shared by the subtasks run by this
+# process, and the time it was opened; see `_open_connection`.
+_SHARED_CONNECTION = [None, None]
+
 
 # Errors that an individual email is failing to be sent, and should just
 # be treated as a fail.
@@ -142,6 +147,19 @@ def _get_recipient_querysets(user_id, to_option, course_id):
             return recipient_qsets
 
 
+def _has_more_recipients_than(recipient_qsets, limit):
+    """
+    Returns whether the query sets of recipients hold more than `limit` recipients
+    in total, reading at most `limit` + 1 keys rather than counting them all.
+    """
+    remaining = limit + 1
+    for recipient_queryset in recipient_qsets:
+        remaining -= len(recipient_queryset.values_list('pk', flat=True)[:remaining])
+        if remaining <= 0:
+            return True
+    return False
+
+
 def _get_course_email_context(course):
     """
     Returns context arguments to apply to all emails, independent of recipient.
@@ -229,12 +247,10 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s, to_option %s",
              task_id, course_id, email_id, to_option)
 
-    total_recipients = sum([recipient_queryset.count() for recipient_queryset in recipient_qsets])
-
     routing_key = settings.BULK_EMAIL_ROUTING_KEY
     # if there are few enough emails, send them through a different queue
     # to avoid large courses blocking emails to self and staff
-    if total_recipients <= settings.BULK_EMAIL_JOB_SIZE_THRESHOLD:
+    if not _has_more_recipients_than(recipient_qsets, settings.BULK_EMAIL_JOB_SIZE_THRESHOLD):
         routing_key = settings.BULK_EMAIL_ROUTING_KEY_SMALL_JOBS
 
     def _create_send_email_subtask(to_list, initial_subtask_status):
@@ -260,7 +276,6 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         recipient_qsets,
         recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
-        total_recipients,
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -482,13 +497,20 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connection = None
+    reuse_connection = False
     try:
-        connection = get_connection()
-        connection.open()
+        connection = _open_connection()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
+
+        # Render the templates with the values shared by all recipients once,
+        # so that only the values of each recipient remain to be filled in.
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -502,11 +524,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             email_context['email'] = email
             email_context['name'] = current_recipient['profile__name']
             email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
 
             # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            plaintext_msg = plaintext_template.render(email_context)
+            html_msg = html_template.render(email_context)
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -522,9 +543,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             # but if a task has been retried for rate-limiting reasons, then we sleep
             # for a period of time between all emails within this task.  Choice of
             # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
+            # parallel, and what the SES throttle rate is.  The period doubles each
+            # time the task is throttled again.
             if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+                sleep(_delay_between_sends(subtask_status))
 
             try:
                 log.info(
@@ -688,11 +710,76 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         # All went well.  Update counters with progress to date,
         # and set the state to SUCCESS:
         subtask_status.increment(state=SUCCESS)
+        reuse_connection = True
         # Successful completion is marked by an exception value of None.
         return subtask_status, None
     finally:
         # Clean up at the end.
+        if connection is not None:
+            _release_connection(connection, reuse_connection)
+
+
+def _open_connection():
+    """
+    Returns an open connection to the email backend.
+
+    When settings.BULK_EMAIL_SMTP_CONNECTION_MAX_AGE is set, the connection is
+    kept open by the worker process and reused by the subtasks it runs for
+    that many seconds, saving a connection and authentication per subtask.
+    """
+    max_age = getattr(settings, 'BULK_EMAIL_SMTP_CONNECTION_MAX_AGE', 0)
+    connection, opened_at = _SHARED_CONNECTION
+    if connection is not None:
+        if time() - opened_at < max_age and _is_connection_alive(connection):
+            return connection
+        _release_connection(connection, False)
+
+    connection = get_connection()
+    connection.open()
+    if max_age > 0:
+        _SHARED_CONNECTION[:] = [connection, time()]
+    return connection
+
+
+def _is_connection_alive(connection):
+    """
+    Returns whether the email backend `connection` can still send, checking an
+    SMTP connection with a NOOP since the server may have dropped it while idle.
+    """
+    if not hasattr(connection, 'connection'):
+        # Not an SMTP backend, so there is nothing to check.
+        return True
+    if connection.connection is None:
+        return False
+    try:
+        status = connection.connection.noop()[0]
+    except (SMTPServerDisconnected, socket.error):
+        return False
+    return status == 250
+
+
+def _release_connection(connection, reusable):
+    """
+    Closes `connection` at the end of a subtask, unless it is the shared
+    connection and is `reusable`, that is the subtask didn't fail on it.
+    """
+    if connection is _SHARED_CONNECTION[0]:
+        if reusable:
+            return
+        _SHARED_CONNECTION[:] = [None, None]
+    try:
         connection.close()
+    except Exception:  # pylint: disable=broad-except
+        log.exception('Unable to close connection to the email backend')
+
+
+def _delay_between_sends(subtask_status):
+    """
+    Returns the number of seconds to wait between two sends of a subtask which
+    was retried because of the sending rate.  The delay doubles with each such
+    retry, up to five of them.
+    """
+    return settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS * 2 ** (min(subtask_status.retried_nomax, 5) - 1)
 
 
 def _get_current_task():
@@ -137,6 +137,24 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_templates_render_like_templates(self):
+        template = CourseEmailTemplate.get_template()
+        global_context = self._get_sample_html_context()
+        global_context.update({'course_id': 'abc/123/doremi', 'name': '', 'email': ''})
+        plaintext = template.compile_plaintext(u"Dear %%USER_FULLNAME%% of %%COURSE_DISPLAY_NAME%%.", global_context)
+        htmltext = template.compile_htmltext(u"<p>Dear %%USER_FULLNAME%%.</p>", global_context)
+        for name, email, user_id in ((u"J\xf6hn", 'john@test.com', 1), (u"Ann", 'ann@test.com', 2)):
+            context = dict(global_context, name=name, email=email, user_id=user_id)
+            self.assertEqual(
+                plaintext.render(context),
+                template.render_plaintext(u"Dear %%USER_FULLNAME%% of %%COURSE_DISPLAY_NAME%%.", context)
+            )
+            self.assertEqual(
+                htmltext.render(context),
+                template.render_htmltext(u"<p>Dear %%USER_FULLNAME%%.</p>", context)
+            )
+            self.assertIn(email, plaintext.render(context))
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
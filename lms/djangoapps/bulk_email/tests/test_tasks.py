@@ -32,6 +32,7 @@ from django.core.management import call_command
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from bulk_email import tasks as bulk_email_tasks
 from bulk_email.models import CourseEmail, Optout, SEND_TO_ALL
 
 from instructor_task.tasks import send_bulk_course_email
@@ -195,6 +196,38 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    def test_successful_with_shared_connection(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        self.addCleanup(bulk_email_tasks._SHARED_CONNECTION.__setitem__, slice(None), [None, None])
+        with self.settings(BULK_EMAIL_SMTP_CONNECTION_MAX_AGE=60):
+            with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+                get_conn.return_value.send_messages.side_effect = cycle([None])
+                get_conn.return_value.connection.noop.return_value = (250, 'OK')
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        # The subtasks of both tasks sent through the same connection, which is left open.
+        self.assertEqual(get_conn.call_count, 1)
+        self.assertFalse(get_conn.return_value.close.called)
+
+    def test_disconnected_shared_connection_reopened(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        self.addCleanup(bulk_email_tasks._SHARED_CONNECTION.__setitem__, slice(None), [None, None])
+        with self.settings(BULK_EMAIL_SMTP_CONNECTION_MAX_AGE=60):
+            with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+                get_conn.return_value.send_messages.side_effect = cycle([None])
+                get_conn.return_value.connection.noop.side_effect = SMTPServerDisconnected
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        # The server dropped the idle connection, so the second task opened a new one.
+        self.assertEqual(get_conn.call_count, 2)
+        self.assertTrue(get_conn.return_value.close.called)
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
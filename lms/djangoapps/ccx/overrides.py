@@ -4,18 +4,24 @@ by the individual custom courses feature.
 """
 import json
 import logging
+from collections import defaultdict
 
 from django.db import transaction, IntegrityError
 
 from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
+from request_cache.middleware import RequestCache
 
 from .models import CcxFieldOverride, CustomCourseForEdX
 
 
 log = logging.getLogger(__name__)
 
+# Request cache keys of the ccxs, and of their overrides, keyed by ccx id
+CURRENT_CCX_KEY = "ccx.overrides.current_ccx"
+CCX_OVERRIDES_KEY = "ccx.overrides.ccx_overrides"
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -27,26 +33,23 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
         """
         Just call the get_override_for_ccx method if there is a ccx
         """
-        # The incoming block might be a CourseKey instance of some type, a
-        # UsageKey instance of some type, or it might be something that has a
-        # location attribute.  That location attribute will be a UsageKey
-        ccx = course_key = None
-        identifier = getattr(block, 'id', None)
-        if isinstance(identifier, CourseKey):
-            course_key = block.id
-        elif isinstance(identifier, UsageKey):
-            course_key = block.id.course_key
-        elif hasattr(block, 'location'):
-            course_key = block.location.course_key
-        else:
-            msg = "Unable to get course id when calculating ccx overide for block type %r"
-            log.error(msg, type(block))
-        if course_key is not None:
-            ccx = get_current_ccx(course_key)
+        ccx = _get_ccx_for_block(block)
         if ccx:
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def overridden_fields(self, block):
+        """
+        Returns the names of the fields overridden in `block` by the ccx it
+        belongs to, if any.
+        """
+        if not hasattr(block, 'location'):
+            return None
+        ccx = _get_ccx_for_block(block)
+        if not ccx:
+            return ()
+        return _get_ccx_overrides(ccx).get(_override_location(block), {})
+
     @classmethod
     def enabled_for(cls, course):
         """CCX field overrides are enabled per-course
@@ -56,6 +59,29 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
         return getattr(course, 'enable_ccx', False)
 
 
+def _get_ccx_for_block(block):
+    """
+    Returns the ccx that is active for the course of `block`, or None.
+    """
+    # The incoming block might be a CourseKey instance of some type, a
+    # UsageKey instance of some type, or it might be something that has a
+    # location attribute.  That location attribute will be a UsageKey
+    course_key = None
+    identifier = getattr(block, 'id', None)
+    if isinstance(identifier, CourseKey):
+        course_key = block.id
+    elif isinstance(identifier, UsageKey):
+        course_key = block.id.course_key
+    elif hasattr(block, 'location'):
+        course_key = block.location.course_key
+    else:
+        msg = "Unable to get course id when calculating ccx overide for block type %r"
+        log.error(msg, type(block))
+    if course_key is not None:
+        return get_current_ccx(course_key)
+    return None
+
+
 def get_current_ccx(course_key):
     """
     Return the ccx that is active for this course.
@@ -69,7 +95,12 @@ def get_current_ccx(course_key):
     if not isinstance(course_key, CCXLocator):
         return None
 
-    return CustomCourseForEdX.objects.get(pk=course_key.ccx)
+    # Every block of a ccx course needs its ccx, so cache it for the request.
+    ccxs = RequestCache.get_request_cache().data.setdefault(CURRENT_CCX_KEY, {})
+    ccx_id = int(course_key.ccx)
+    if ccx_id not in ccxs:
+        ccxs[ccx_id] = CustomCourseForEdX.objects.get(pk=ccx_id)
+    return ccxs[ccx_id]
 
 
 def get_override_for_ccx(ccx, block, name, default=None):
@@ -87,25 +118,55 @@ def get_override_for_ccx(ccx, block, name, default=None):
     return overrides.get(name, default)
 
 
+def _override_location(block):
+    """
+    Returns the location under which the overrides of `block` are stored.
+    """
+    # block as passed in may have a location specific to a CCX, we must strip
+    # that, as well as any branch and version, to match the stored locations
+    location = block.location
+    if isinstance(location, CCXBlockUsageLocator):
+        location = location.to_block_locator()
+    return CcxFieldOverride._meta.get_field('location').get_prep_value(location)  # pylint: disable=protected-access
+
+
+def _get_ccx_overrides(ccx):
+    """
+    Returns a dictionary mapping each location of a block with overrides in
+    the `ccx` to a dictionary mapping field names to their JSON-encoded
+    overriden values.
+
+    All the overrides of the ccx are loaded with a single query, once per request.
+    """
+    overrides_by_ccx = RequestCache.get_request_cache().data.setdefault(CCX_OVERRIDES_KEY, {})
+    overrides = overrides_by_ccx.get(ccx.id)
+    if overrides is None:
+        overrides = defaultdict(dict)
+        query = CcxFieldOverride.objects.filter(ccx=ccx).values_list('location', 'field', 'value')
+        for location, field, value in query:
+            overrides[unicode(location)][field] = value
+        overrides = overrides_by_ccx[ccx.id] = dict(overrides)
+    return overrides
+
+
+def _clear_ccx_overrides(ccx, block):
+    """
+    Drops the overrides of the `ccx` cached for the request and in `block`.
+    """
+    RequestCache.get_request_cache().data.get(CCX_OVERRIDES_KEY, {}).pop(ccx.id, None)
+    if hasattr(block, '_ccx_overrides'):
+        block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
+
+
 def _get_overrides_for_ccx(ccx, block):
     """
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
     """
     overrides = {}
-    # block as passed in may have a location specific to a CCX, we must strip
-    # that for this query
-    location = block.location
-    if isinstance(block.location, CCXBlockUsageLocator):
-        location = block.location.to_block_locator()
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=location
-    )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in _get_ccx_overrides(ccx).get(_override_location(block), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
@@ -132,8 +193,7 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
-    if hasattr(block, '_ccx_overrides'):
-        del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+    _clear_ccx_overrides(ccx, block)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -149,8 +209,7 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
-        if hasattr(block, '_ccx_overrides'):
-            del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+        _clear_ccx_overrides(ccx, block)
 
     except CcxFieldOverride.DoesNotExist:
         pass
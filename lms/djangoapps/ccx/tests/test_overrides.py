@@ -113,6 +113,21 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overrides_loaded_once_per_request(self):
+        """
+        Test that the overrides of all the blocks are read with one query.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx.course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        with self.assertNumQueries(1):
+            for block in iter_blocks(self.ccx.course):
+                dummy1 = block.start
+                dummy2 = block.due
+        for chapter in chapters:
+            self.assertEqual(chapter.start, ccx_start)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
@@ -99,6 +99,7 @@ class XQueueCertInterface(object):
             settings.XQUEUE_INTERFACE['url'],
             settings.XQUEUE_INTERFACE['django_auth'],
             requests_auth,
+            timeout=settings.XQUEUE_HTTP_TIMEOUT,
         )
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
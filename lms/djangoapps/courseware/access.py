@@ -95,9 +95,12 @@ def has_access(user, action, obj, course_key=None):
     if isinstance(course_key, CCXLocator):
         course_key = course_key.to_course_locator()
 
+    # Imported here to avoid a circular import, since course overviews import courseware.courses.
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
-    if isinstance(obj, CourseDescriptor):
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
         return _has_access_course_desc(user, action, obj)
 
     if isinstance(obj, ErrorDescriptor):
@@ -131,7 +134,7 @@ def has_access(user, action, obj, course_key=None):
 # ================ Implementation helpers ================================
 def _has_access_course_desc(user, action, course):
     """
-    Check if user has access to a course descriptor.
+    Check if user has access to a course descriptor or course overview.
 
     Valid actions:
 
@@ -304,6 +307,62 @@ def _has_access_course_desc(user, action, course):
     return _dispatch(checkers, action, user, course)
 
 
+def has_access_without_grants(action, course):
+    """
+    Check whether users holding no role in a course, no enrollment allowance
+    for it and no external auth mapping are allowed the catalog `action` on
+    the course descriptor or overview `course`.
+
+    This mirrors _has_access_course_desc for such users, without any database
+    access, so that a catalog can be filtered cheaply and has_access only
+    called for the courses where a user holds any of those grants.
+
+    Valid actions: 'see_exists', 'see_in_catalog' and 'see_about_page'.
+    Returns None for any other action.
+    """
+    def can_enroll():
+        """
+        The enrollment period check of can_enroll in _has_access_course_desc.
+        """
+        if settings.FEATURES.get('RESTRICT_ENROLL_BY_REG_METHOD') and course.enrollment_domain:
+            return False
+        if course.invitation_only:
+            return False
+        now = datetime.now(UTC())
+        start = course.enrollment_start or datetime.min.replace(tzinfo=pytz.UTC)
+        end = course.enrollment_end or datetime.max.replace(tzinfo=pytz.UTC)
+        return start < now < end
+
+    def can_load():
+        """
+        The start date check of can_load in _has_access_descriptor.
+        """
+        if course.visible_to_staff_only:
+            return False
+        if settings.FEATURES['DISABLE_START_DATES'] or course.start is None:
+            return True
+        return bool(in_preview_mode()) or datetime.now(UTC()) > course.start
+
+    def see_exists():
+        """
+        The see_exists check of _has_access_course_desc.
+        """
+        if settings.FEATURES.get('ACCESS_REQUIRE_STAFF_FOR_COURSE'):
+            return bool(course.ispublic)
+        return can_enroll() or can_load()
+
+    checkers = {
+        'see_exists': see_exists,
+        'see_in_catalog': lambda: course.catalog_visibility == CATALOG_VISIBILITY_CATALOG_AND_ABOUT,
+        'see_about_page': lambda: course.catalog_visibility in (
+            CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT
+        ),
+    }
+    if action not in checkers:
+        return None
+    return checkers[action]()
+
+
 def _has_access_error_desc(user, action, descriptor, course_key):
     """
     Only staff should see error descriptors.
@@ -411,8 +470,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
         if descriptor.visible_to_staff_only and not _has_staff_access_to_descriptor(user, descriptor, course_key):
             return False
 
-        # enforce group access
-        if not _has_group_access(descriptor, user, course_key):
+        # enforce group access; course overviews carry no group access settings
+        if isinstance(descriptor, XBlock) and not _has_group_access(descriptor, user, course_key):
             # if group_access check failed, deny access unless the requestor is staff,
             # in which case immediately grant access.
             return _has_staff_access_to_descriptor(user, descriptor, course_key)
@@ -423,7 +482,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
             return True
 
         # Check start date
-        if 'detached' not in descriptor._class_tags and descriptor.start is not None:
+        is_detached = isinstance(descriptor, XBlock) and 'detached' in descriptor._class_tags
+        if not is_detached and descriptor.start is not None:
             now = datetime.now(UTC())
             effective_start = _adjust_start_date_for_beta_testers(
                 user,
@@ -17,11 +17,13 @@ from static_replace import replace_static_urls
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.x_module import STUDENT_VIEW
 from microsite_configuration import microsite
+from openedx.core.lib.cache_utils import request_cached
 
-from courseware.access import has_access
+from courseware.access import has_access, has_access_without_grants
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
-from student.models import CourseEnrollment
+from student.models import CourseAccessRole, CourseEnrollment, CourseEnrollmentAllowed
+from student.roles import GlobalStaff
 import branding
 
 from opaque_keys.edx.keys import UsageKey
@@ -68,6 +70,21 @@ def get_course_by_id(course_key, depth=0):
     If such a course does not exist, raises a 404.
 
     depth: The number of levels of children for the modulestore to cache. None means infinite depth
+
+    The descriptor is shared by the callers within a request until one of them
+    binds it to a student; later callers then get a fresh, unbound descriptor.
+    """
+    course = _get_unbound_course(course_key, depth)
+    if course.scope_ids.user_id is not None:
+        _get_unbound_course.invalidate(course_key, depth)
+        course = _get_unbound_course(course_key, depth)
+    return course
+
+
+@request_cached(key_func=lambda course_key, depth=0: u'{}.{}'.format(course_key, depth))
+def _get_unbound_course(course_key, depth=0):
+    """
+    Returns the course descriptor of get_course_by_id, cached for the rest of the request.
     """
     with modulestore().bulk_operations(course_key):
         course = modulestore().get_course(course_key, depth=depth)
@@ -346,7 +363,7 @@ def get_courses_by_university(user, domain=None):
 
 def get_courses(user, domain=None):
     '''
-    Returns a list of courses available, sorted by course.number
+    Returns a list of the CourseOverviews of the courses available, sorted by course.number
     '''
     courses = branding.get_visible_courses()
 
@@ -355,37 +372,75 @@ def get_courses(user, domain=None):
         settings.COURSE_CATALOG_VISIBILITY_PERMISSION
     )
 
-    courses = [c for c in courses if has_access(user, permission_name, c)]
+    # Only the courses where the user holds a role, an enrollment allowance or
+    # an external auth mapping need the full, per-user access check.
+    granted_ids = _course_ids_with_user_grants(user, courses)
 
-    courses = sorted(courses, key=lambda course: course.number)
+    visible_courses = []
+    for course in courses:
+        allowed = None
+        if course.id not in granted_ids:
+            allowed = has_access_without_grants(permission_name, course)
+        if allowed is None:
+            allowed = has_access(user, permission_name, course)
+        if allowed:
+            visible_courses.append(course)
 
-    return courses
+    return visible_courses
+
+
+def _course_ids_with_user_grants(user, courses):
+    """
+    Returns the ids of those of `courses` where `user` may have more access
+    than a user with no grants; see courseware.access.has_access_without_grants.
+    """
+    if user is None or not user.is_authenticated():
+        return set()
+    if GlobalStaff().has_user(user):
+        return set(course.id for course in courses)
+
+    role_course_ids = set()
+    role_orgs = set()
+    for role in CourseAccessRole.objects.filter(user=user):
+        if role.course_id:
+            role_course_ids.add(role.course_id)
+        elif role.org:
+            role_orgs.add(role.org)
+    allowed_course_ids = set(
+        allowance.course_id for allowance in CourseEnrollmentAllowed.objects.filter(email=user.email)
+    )
+    check_enrollment_domain = settings.FEATURES.get('RESTRICT_ENROLL_BY_REG_METHOD')
+
+    return set(
+        course.id for course in courses
+        if course.id in role_course_ids or course.id in allowed_course_ids or course.org in role_orgs
+        or (check_enrollment_domain and course.enrollment_domain)
+    )
 
 
 def sort_by_announcement(courses):
     """
-    Sorts a list of courses by their announcement date. If the date is
+    Sorts a list of course overviews by their announcement date. If the date is
     not available, sort them by their start date.
     """
+    # Imported here to avoid a circular import, since course overviews import this module.
+    from openedx.core.djangoapps.content.course_overviews.catalog import get_catalog_index
 
-    # Sort courses by how far are they from they start day
-    key = lambda course: course.sorting_score
-    courses = sorted(courses, key=key)
-
-    return courses
+    # Use the ordering precomputed by the catalog index
+    ranks = get_catalog_index().announcement_ranks
+    return sorted(courses, key=lambda course: ranks.get(course.id, len(ranks)))
 
 
 def sort_by_start_date(courses):
     """
-    Returns a list of courses sorted by their start date, latest first.
+    Returns a list of course overviews sorted by their start date, latest first.
     """
-    courses = sorted(
-        courses,
-        key=lambda course: (course.has_ended(), course.start is None, course.start),
-        reverse=False
-    )
+    # Imported here to avoid a circular import, since course overviews import this module.
+    from openedx.core.djangoapps.content.course_overviews.catalog import get_catalog_index
 
-    return courses
+    # Use the ordering precomputed by the catalog index
+    ranks = get_catalog_index().start_date_ranks
+    return sorted(courses, key=lambda course: ranks.get(course.id, len(ranks)))
 
 
 def get_cms_course_link(course, page='course'):
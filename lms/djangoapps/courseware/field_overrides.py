@@ -120,6 +120,10 @@ class OverrideFieldData(FieldData):
         """
         if not overrides_disabled():
             for provider in self.providers:
+                # Skip the providers which know they don't override this field.
+                overridden = provider.overridden_fields(block)
+                if overridden is not None and name not in overridden:
+                    continue
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
                     return value
@@ -224,6 +228,14 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def overridden_fields(self, block):
+        """
+        Returns the names of the fields this provider overrides in `block`, or
+        None if it can't tell cheaply, in which case `get` is called for every
+        field. `OverrideFieldData` only calls `get` for the returned fields.
+        """
+        return None
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -123,14 +123,18 @@ def answer_distributions(course_key):
 
 
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, send_grades_updated=True):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
-    Send a signal to update the minimum grade requirement status.
+    Send a signal to update the minimum grade requirement status, unless
+    `send_grades_updated` is False because the caller updates it in bulk.
     """
     with manual_transaction():
         grade_summary = _grade(student, request, course, keep_raw_scores)
+        if not send_grades_updated:
+            return grade_summary
+
         responses = GRADES_UPDATED.send_robust(
             sender=None,
             username=request.user.username,
@@ -522,11 +526,14 @@ def manual_transaction():
         transaction.commit()
 
 
-def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
+def iterate_grades_for(course_or_id, students, keep_raw_scores=False, send_grades_updated=True):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
 
+    The GRADES_UPDATED signal is sent for each student unless
+    `send_grades_updated` is False.
+
     If an error occurred, gradeset will be an empty dict and err_msg will be an
     exception message. If there was no error, err_msg is an empty string.
 
@@ -559,7 +566,7 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
                 # It's not pretty, but untangling that is currently beyond the
                 # scope of this feature.
                 request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
+                gradeset = grade(student, request, course, keep_raw_scores, send_grades_updated)
                 yield student, gradeset, ""
             except Exception as exc:  # pylint: disable=broad-except
                 # Keep marching on even if this student couldn't be graded for
@@ -0,0 +1,179 @@
+"""
+Write-behind storage for StudentModuleHistory entries.
+
+Saving a StudentModule whose type is in StudentModuleHistory.HISTORY_SAVING_TYPES
+records a history entry. How that entry reaches the database is controlled by
+settings.STUDENT_MODULE_HISTORY_WRITE_MODE:
+
+    'immediate' (the default)
+        Each entry is inserted as soon as its StudentModule is saved.
+
+    'buffered'
+        Entries recorded while serving a request are buffered in the process and
+        inserted with a single bulk_create once STUDENT_MODULE_HISTORY_BATCH_SIZE
+        entries are waiting, or at the end of the first request served after the
+        oldest entry has waited STUDENT_MODULE_HISTORY_MAX_DELAY seconds (0 flushes
+        at the end of every request). Entries still buffered when a process dies
+        are lost.
+
+    'celery'
+        As 'buffered', but flushed entries are handed to a Celery task which
+        inserts them, so web workers never write history themselves. Entries are
+        then as durable as the broker. If the task can't be queued, the entries
+        are inserted directly.
+
+Entries recorded outside of a request (management commands, Celery tasks) are
+always inserted immediately.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from courseware.models import StudentModuleHistory
+from request_cache.middleware import RequestCache
+
+log = logging.getLogger(__name__)
+
+IMMEDIATE = 'immediate'
+BUFFERED = 'buffered'
+CELERY = 'celery'
+
+_BUFFER = []
+_BUFFER_LOCK = threading.Lock()
+_OLDEST_BUFFERED_AT = [None]
+
+
+def write_mode():
+    """
+    Returns the configured STUDENT_MODULE_HISTORY_WRITE_MODE.
+    """
+    return getattr(settings, 'STUDENT_MODULE_HISTORY_WRITE_MODE', IMMEDIATE)
+
+
+def record_history(entry):
+    """
+    Store the unsaved StudentModuleHistory `entry` according to the configured write mode.
+    """
+    if write_mode() == IMMEDIATE or RequestCache.get_current_request() is None:
+        entry.save()
+        return
+
+    _buffer([entry])
+
+
+def record_history_entries(entries):
+    """
+    Store the unsaved StudentModuleHistory `entries` according to the configured
+    write mode. When they are written immediately, they are inserted with one query.
+    """
+    if not entries:
+        return
+
+    if write_mode() == IMMEDIATE or RequestCache.get_current_request() is None:
+        bulk_create_history(entries)
+        return
+
+    _buffer(entries)
+
+
+def _buffer(entries):
+    """
+    Buffer `entries`, and flush the buffer if it is full.
+    """
+    with _BUFFER_LOCK:
+        if not _BUFFER:
+            _OLDEST_BUFFERED_AT[0] = time.time()
+        _BUFFER.extend(entries)
+        full = len(_BUFFER) >= settings.STUDENT_MODULE_HISTORY_BATCH_SIZE
+
+    if full:
+        flush()
+
+
+def flush_if_due():
+    """
+    Flush the buffered entries if the oldest of them has waited long enough.
+    """
+    oldest = _OLDEST_BUFFERED_AT[0]
+    if _BUFFER and oldest is not None and time.time() - oldest >= settings.STUDENT_MODULE_HISTORY_MAX_DELAY:
+        flush()
+
+
+def flush():
+    """
+    Write out all buffered entries.
+    """
+    with _BUFFER_LOCK:
+        entries = _BUFFER[:]
+        del _BUFFER[:]
+        _OLDEST_BUFFERED_AT[0] = None
+
+    if not entries:
+        return
+
+    if write_mode() == CELERY:
+        # Imported here to avoid a circular import, since the task module imports this one.
+        from courseware.tasks import bulk_create_student_module_history
+        try:
+            bulk_create_student_module_history.delay([serialize_entry(entry) for entry in entries])
+            return
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Unable to queue %d StudentModuleHistory entries, inserting them directly", len(entries))
+
+    bulk_create_history(entries)
+
+
+def write_buffered(student_module_ids):
+    """
+    Insert the buffered entries of the StudentModules with ids in `student_module_ids`
+    right away, for readers which need their history to be complete. The other
+    buffered entries stay buffered.
+    """
+    student_module_ids = set(student_module_ids)
+    with _BUFFER_LOCK:
+        entries = [entry for entry in _BUFFER if entry.student_module_id in student_module_ids]
+        if not entries:
+            return
+        _BUFFER[:] = [entry for entry in _BUFFER if entry.student_module_id not in student_module_ids]
+        if not _BUFFER:
+            _OLDEST_BUFFERED_AT[0] = None
+
+    bulk_create_history(entries)
+
+
+def bulk_create_history(entries):
+    """
+    Insert `entries` with one query, falling back to one insert per entry if
+    that fails (for instance because the StudentModule of an entry was rolled back).
+    """
+    try:
+        StudentModuleHistory.objects.bulk_create(entries)
+    except DatabaseError:
+        log.warning("Bulk insert of %d StudentModuleHistory entries failed, inserting them one by one", len(entries))
+        for entry in entries:
+            try:
+                entry.save()
+            except DatabaseError:
+                log.exception("Unable to save history for StudentModule %s", entry.student_module_id)
+
+
+def serialize_entry(entry):
+    """
+    Return a json-serializable dict describing the StudentModuleHistory `entry`.
+    """
+    return {
+        'student_module_id': entry.student_module_id,
+        'version': entry.version,
+        'created': entry.created.isoformat() if entry.created else None,
+        'state': entry.state,
+        'grade': entry.grade,
+        'max_grade': entry.max_grade,
+    }
+
+
+# Don't drop entries buffered by a process that shuts down cleanly.
+atexit.register(flush)
@@ -5,6 +5,7 @@ Middleware for the courseware app
 from django.shortcuts import redirect
 from django.core.urlresolvers import reverse
 
+from courseware import history
 from courseware.courses import UserNotEnrolled
 
 
@@ -22,3 +23,13 @@ class RedirectUnenrolledMiddleware(object):
                     args=[course_key.to_deprecated_string()]
                 )
             )
+
+
+class StudentModuleHistoryMiddleware(object):
+    """
+    Flush StudentModuleHistory entries buffered by courseware.history once they are due.
+    """
+    def process_response(self, _request, response):
+        if history.write_mode() != history.IMMEDIATE:
+            history.flush_if_due()
+        return response
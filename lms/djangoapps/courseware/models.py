@@ -165,8 +165,11 @@ class StudentModuleHistory(models.Model):
         """
         Checks the instance's module_type, and creates & saves a
         StudentModuleHistory entry if the module_type is one that
-        we save.
+        we save. The entry may be written behind; see courseware.history.
         """
+        # Imported here to avoid a circular import, since courseware.history imports this module.
+        from courseware.history import record_history
+
         if instance.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
             history_entry = StudentModuleHistory(student_module=instance,
                                                  version=None,
@@ -174,7 +177,7 @@ class StudentModuleHistory(models.Model):
                                                  state=instance.state,
                                                  grade=instance.grade,
                                                  max_grade=instance.max_grade)
-            history_entry.save()
+            record_history(history_entry)
 
 
 class XBlockFieldBase(models.Model):
@@ -11,7 +11,6 @@ import static_replace
 
 from collections import OrderedDict
 from functools import partial
-from requests.auth import HTTPBasicAuth
 import dogstats_wrapper as dog_stats_api
 
 from django.conf import settings
@@ -26,15 +25,15 @@ from django.views.decorators.csrf import csrf_exempt
 
 import newrelic.agent
 
-from capa.xqueue_interface import XQueueInterface
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
-from courseware.models import SCORE_CHANGED
+from courseware.models import SCORE_CHANGED, StudentModule
 from courseware.entrance_exams import (
     get_entrance_exam_score,
     user_must_complete_entrance_exam
 )
+from courseware.xqueue import XQUEUE_INTERFACE
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
@@ -44,9 +43,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import UsageKey, CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from openedx.core.lib.xblock_utils import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     add_staff_markup,
     wrap_xblock,
     request_token as xblock_request_token,
@@ -78,17 +75,6 @@ from .field_overrides import OverrideFieldData
 log = logging.getLogger(__name__)
 
 
-if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
-    REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
-else:
-    REQUESTS_AUTH = None
-
-XQUEUE_INTERFACE = XQueueInterface(
-    settings.XQUEUE_INTERFACE['url'],
-    settings.XQUEUE_INTERFACE['django_auth'],
-    REQUESTS_AUTH,
-)
-
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -558,27 +544,21 @@ def get_module_system_for_user(user, field_data_cache,  # TODO  # pylint: disabl
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # Rewrite urls in a single pass over the rendered content:
+    #  * urls beginning in /static point to course-specific content
+    #  * urls of the form '/course/' refer to the root of multicourse directory
+    #    hierarchy of this course
+    #  * intra-courseware links (/jump_to_id/<id>) are rewritten. This format
+    #    is an improvement over the /course/... format for studio authored courses,
+    #    because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
         course_id,
         reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        data_dir=getattr(descriptor, 'data_dir', None),
+        static_asset_path=static_asset_path or descriptor.static_asset_path,
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -658,6 +638,7 @@ def get_module_system_for_user(user, field_data_cache,  # TODO  # pylint: disabl
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
         user_location=user_location,
         request_token=request_token,
+        fragment_cache_timeout=settings.XBLOCK_FRAGMENT_CACHE_TIMEOUT,
     )
 
     # pass position specified in URL to module through ModuleSystem
@@ -766,6 +747,41 @@ def load_single_xblock(request, user_id, course_id, usage_key_string, course=Non
     return instance
 
 
+def _is_stale_score_update(user_id, course_key, usage_key_string, queuekey):
+    """
+    Returns whether a score update from the xqueue can be dropped without loading
+    the problem it is for, because the stored state of the problem has no response
+    waiting for `queuekey`. This is the case of callbacks repeated by the xqueue,
+    or made after the student reset the problem.
+    """
+    try:
+        usage_key = UsageKey.from_string(usage_key_string).map_into_course(course_key)
+    except InvalidKeyError:
+        return False
+
+    states = list(StudentModule.objects.filter(
+        student_id=user_id,
+        course_id=course_key,
+        module_state_key=usage_key,
+        module_type='problem',
+    ).values_list('state', flat=True))
+    if not states:
+        return False
+
+    try:
+        correct_map = json.loads(states[0] or '{}').get('correct_map')
+    except ValueError:
+        return False
+    if not isinstance(correct_map, dict):
+        return False
+
+    return not any(
+        (answer.get('queuestate') or {}).get('key') == queuekey
+        for answer in correct_map.itervalues()
+        if isinstance(answer, dict)
+    )
+
+
 @csrf_exempt
 def xqueue_callback(request, course_id, userid, mod_id, dispatch):
     '''
@@ -786,6 +802,12 @@ def xqueue_callback(request, course_id, userid, mod_id, dispatch):
 
     course_key = CourseKey.from_string(course_id)
 
+    # Updating the score of a problem which isn't waiting for it doesn't change
+    # anything, so don't load the course and the problem to find that out.
+    if dispatch == 'score_update' and _is_stale_score_update(userid, course_key, mod_id, header['lms_key']):
+        log.info(u"Ignoring stale xqueue score update for %s of user %s", mod_id, userid)
+        return HttpResponse("")
+
     with modulestore().bulk_operations(course_key):
         course = modulestore().get_course(course_key, depth=0)
 
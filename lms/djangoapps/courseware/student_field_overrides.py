@@ -3,10 +3,16 @@ API related to providing field overrides for individual students.  This is used
 by the individual due dates feature.
 """
 import json
+from collections import defaultdict
+
+from request_cache.middleware import RequestCache
 
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
+# Request cache key of the overrides of each user, keyed by (user id, course id)
+STUDENT_OVERRIDES_KEY = "courseware.student_field_overrides.overrides"
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -17,6 +23,14 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def overridden_fields(self, block):
+        """
+        Returns the names of the fields overridden in `block` for the user.
+        """
+        if not hasattr(block, 'location') or not hasattr(block, 'runtime'):
+            return None
+        return _get_user_overrides(self.user, block.runtime.course_id).get(_override_location(block), {})
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -43,19 +57,56 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    user_overrides = _get_user_overrides(user, block.runtime.course_id)
+    for field_name, value in user_overrides.get(_override_location(block), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
+    return overrides
+
+
+def _override_location(block):
+    """
+    Returns the location under which the overrides of `block` are stored.
+    """
+    location_field = StudentFieldOverride._meta.get_field('location')  # pylint: disable=protected-access
+    return location_field.get_prep_value(block.location)
+
+
+def _get_user_overrides(user, course_id):
+    """
+    Returns a dictionary mapping each location of a block with overrides for
+    the `user` in the course to a dictionary mapping field names to their
+    JSON-encoded overridden values.
+
+    All the overrides of the user in the course are loaded with a single
+    query, once per request.
+    """
+    overrides_by_user = RequestCache.get_request_cache().data.setdefault(STUDENT_OVERRIDES_KEY, {})
+    overrides = overrides_by_user.get((user.id, course_id))
+    if overrides is None:
+        overrides = defaultdict(dict)
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        ).values_list('location', 'field', 'value')
+        for location, field, value in query:
+            overrides[unicode(location)][field] = value
+        overrides = overrides_by_user[(user.id, course_id)] = dict(overrides)
     return overrides
 
 
+def _clear_user_overrides(user, block):
+    """
+    Drops the overrides of the `user` cached for the request and in `block`.
+    """
+    RequestCache.get_request_cache().data.get(STUDENT_OVERRIDES_KEY, {}).pop(
+        (user.id, block.runtime.course_id), None
+    )
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +121,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_user_overrides(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +139,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_user_overrides(user, block)
@@ -0,0 +1,68 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+import json
+import logging
+
+from celery.exceptions import MaxRetriesExceededError
+from dateutil.parser import parse as parse_date
+from django.conf import settings
+
+from courseware.history import bulk_create_history
+from courseware.models import StudentModuleHistory
+from courseware.xqueue import XQUEUE_INTERFACE, fail_submission, is_transient_failure
+from lms import CELERY_APP
+
+log = logging.getLogger(__name__)
+
+
+@CELERY_APP.task
+def bulk_create_student_module_history(entries):
+    """
+    Insert the StudentModuleHistory entries described by `entries`, as serialized
+    by courseware.history.serialize_entry, in a single query.
+    """
+    bulk_create_history([
+        StudentModuleHistory(
+            student_module_id=entry['student_module_id'],
+            version=entry['version'],
+            created=parse_date(entry['created']) if entry['created'] else None,
+            state=entry['state'],
+            grade=entry['grade'],
+            max_grade=entry['max_grade'],
+        )
+        for entry in entries
+    ])
+
+
+@CELERY_APP.task(
+    default_retry_delay=settings.XQUEUE_SUBMISSION_RETRY_DELAY,
+    max_retries=settings.XQUEUE_SUBMISSION_MAX_RETRIES
+)
+def send_xqueue_submission(header, body):
+    """
+    Post a submission handed over by courseware.xqueue.LmsXQueueInterface to the XQueue.
+
+    If the XQueue can't be reached, the task is retried with an exponential backoff.
+    If the XQueue rejects the submission or the retries run out, the student is
+    told that the submission couldn't be delivered.
+    """
+    (error, msg) = XQUEUE_INTERFACE.post_to_queue(header, body)
+    if not error:
+        return
+
+    queue_name = json.loads(header).get('queue_name', u'')
+    if not is_transient_failure(msg):
+        log.error(u"XQueue rejected a submission to queue %s: %s", queue_name, msg)
+        fail_submission(header, msg)
+        return
+
+    retries = send_xqueue_submission.request.retries
+    try:
+        raise send_xqueue_submission.retry(countdown=settings.XQUEUE_SUBMISSION_RETRY_DELAY * 2 ** retries)
+    except MaxRetriesExceededError:
+        log.error(
+            u"Giving up posting a submission to queue %s after %s retries: %s",
+            queue_name, retries, msg
+        )
+        fail_submission(header, msg)
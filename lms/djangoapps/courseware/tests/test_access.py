@@ -11,6 +11,7 @@ import courseware.access as access
 from courseware.masquerade import CourseMasquerade
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from courseware.tests.helpers import LoginEnrollmentTestCase
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowedFactory, CourseEnrollmentFactory
 from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
@@ -256,6 +257,33 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         )
         self.assertFalse(access._has_access_course_desc(user, 'enroll', course))
 
+    def test_course_overview_access(self):
+        """
+        Course overviews get the same access as the courses they describe.
+        """
+        yesterday = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
+        tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
+        courses = [
+            CourseFactory.create(start=tomorrow, enrollment_start=yesterday, enrollment_end=tomorrow),
+            CourseFactory.create(start=yesterday, enrollment_start=tomorrow, invitation_only=True),
+            CourseFactory.create(start=tomorrow, days_early_for_beta=2, catalog_visibility=CATALOG_VISIBILITY_NONE),
+            CourseFactory.create(start=yesterday, visible_to_staff_only=True),
+        ]
+        for course in courses:
+            overview = CourseOverview.get_from_id(course.id)
+            users = [self.anonymous_user, self.student, StaffFactory(course_key=course.id)]
+            for user in users:
+                for action in ('load', 'enroll', 'see_exists', 'see_in_catalog', 'see_about_page', 'staff'):
+                    self.assertEqual(
+                        access.has_access(user, action, course),
+                        access.has_access(user, action, overview),
+                    )
+            for action in ('see_exists', 'see_in_catalog', 'see_about_page'):
+                self.assertEqual(
+                    bool(access.has_access(self.student, action, course)),
+                    access.has_access_without_grants(action, overview),
+                )
+
     def test__user_passed_as_none(self):
         """Ensure has_access handles a user being passed as null"""
         access.has_access(None, 'staff', 'global', None)
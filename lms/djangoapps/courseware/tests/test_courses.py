@@ -2,6 +2,7 @@
 """
 Tests for course access
 """
+import datetime
 import ddt
 import itertools
 import mock
@@ -12,15 +13,19 @@ from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 from django.test.client import RequestFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from pytz import UTC
 
 from courseware.courses import (
     get_course_by_id, get_cms_course_link, course_image_url,
-    get_course_info_section, get_course_about_section, get_cms_block_link
+    get_course_info_section, get_course_about_section, get_cms_block_link,
+    get_courses, sort_by_announcement, sort_by_start_date
 )
 from courseware.module_render import get_module_for_descriptor
 from courseware.tests.helpers import get_request_for_user
 from courseware.model_data import FieldDataCache
-from student.tests.factories import UserFactory
+from request_cache.middleware import RequestCache
+from student.roles import CourseStaffRole, OrgStaffRole
+from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowedFactory, UserFactory
 from xmodule.modulestore.django import _get_modulestore_branch_setting, modulestore
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
@@ -53,6 +58,102 @@ class CoursesTest(ModuleStoreTestCase):
         cms_url = u"//{}/course/{}".format(CMS_BASE_TEST, unicode(self.course.location))
         self.assertEqual(cms_url, get_cms_block_link(self.course, 'course'))
 
+    def test_get_course_by_id_not_shared_once_bound(self):
+        """
+        Tests that get_course_by_id shares a descriptor within a request until it is bound to a student
+        """
+        course = CourseFactory.create()
+        RequestCache.get_request_cache().request = mock.Mock()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        shared_course = get_course_by_id(course.id)
+        self.assertIs(get_course_by_id(course.id), shared_course)
+
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course.id, self.user, shared_course)
+        get_module_for_descriptor(
+            self.user, get_request_for_user(self.user), shared_course, field_data_cache, course.id, course=shared_course
+        )
+        unbound_course = get_course_by_id(course.id)
+        self.assertIsNot(unbound_course, shared_course)
+        self.assertIsNone(unbound_course.scope_ids.user_id)
+
+
+@attr('shard_1')
+class CourseCatalogTest(ModuleStoreTestCase):
+    """
+    Tests for listing the courses of the catalog.
+    """
+    def setUp(self):
+        super(CourseCatalogTest, self).setUp()
+        now = datetime.datetime.now(UTC)
+        self.open_course = CourseFactory.create(org='OpenX', start=now - datetime.timedelta(days=10))
+        self.announced_course = CourseFactory.create(
+            org='OpenX',
+            start=now + datetime.timedelta(days=20),
+            enrollment_start=now - datetime.timedelta(days=1),
+            announcement=now - datetime.timedelta(days=2),
+        )
+        self.unreleased_course = CourseFactory.create(org='HiddenX', start=now + datetime.timedelta(days=30))
+        self.staff_only_course = CourseFactory.create(
+            org='HiddenX',
+            start=now - datetime.timedelta(days=10),
+            visible_to_staff_only=True,
+        )
+        self.public_ids = [self.announced_course.id, self.open_course.id]
+        self.public_ids.sort(key=lambda course_id: course_id.course)
+
+    def assert_catalog(self, user, expected_ids):
+        """
+        Asserts that the catalog shown to `user` lists the courses of `expected_ids`, sorted by number.
+        """
+        expected_ids = sorted(expected_ids, key=lambda course_id: course_id.course)
+        self.assertEqual([course.id for course in get_courses(user)], expected_ids)
+
+    def test_anonymous_user(self):
+        with self.assertNumQueries(1):
+            self.assert_catalog(AnonymousUserFactory(), self.public_ids)
+
+    def test_user_without_grants(self):
+        user = UserFactory()
+        with self.assertNumQueries(3):
+            self.assert_catalog(user, self.public_ids)
+
+    def test_user_with_grants(self):
+        user = UserFactory()
+        CourseStaffRole(self.unreleased_course.id).add_users(user)
+        self.assert_catalog(user, self.public_ids + [self.unreleased_course.id])
+
+        OrgStaffRole('HiddenX').add_users(user)
+        self.assert_catalog(
+            user,
+            self.public_ids + [self.unreleased_course.id, self.staff_only_course.id]
+        )
+
+    def test_enrollment_allowed(self):
+        user = UserFactory()
+        CourseEnrollmentAllowedFactory(email=user.email, course_id=self.unreleased_course.id)
+        self.assert_catalog(user, self.public_ids + [self.unreleased_course.id])
+
+    def test_global_staff(self):
+        user = UserFactory(is_staff=True)
+        self.assert_catalog(
+            user,
+            self.public_ids + [self.unreleased_course.id, self.staff_only_course.id]
+        )
+
+    def test_sorting(self):
+        courses = get_courses(UserFactory(is_staff=True))
+
+        # Announced courses come first, then the courses starting the latest.
+        by_announcement = [course.id for course in sort_by_announcement(courses)]
+        self.assertEqual(by_announcement[:2], [self.announced_course.id, self.unreleased_course.id])
+        self.assertEqual(set(by_announcement[2:]), {self.open_course.id, self.staff_only_course.id})
+
+        # Courses which haven't ended come first, the earliest start first.
+        by_start_date = [course.id for course in sort_by_start_date(courses)]
+        self.assertEqual(set(by_start_date[:2]), {self.open_course.id, self.staff_only_course.id})
+        self.assertEqual(by_start_date[2:], [self.announced_course.id, self.unreleased_course.id])
+
 
 @attr('shard_1')
 class ModuleStoreBranchSettingTest(ModuleStoreTestCase):
@@ -89,6 +89,17 @@ class OverrideFieldDataTests(ModuleStoreTestCase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=(
+        'courseware.tests.test_field_overrides.TestOverriddenFieldsProvider',))
+    def test_overridden_fields(self):
+        data = self.make_one()
+        TestOverriddenFieldsProvider.calls = []
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(data.get('block', 'bees'), 'knees')
+        self.assertFalse(data.has('block', 'oh'))
+        # `get` is only called for the fields the provider says it overrides
+        self.assertEqual(TestOverriddenFieldsProvider.calls, ['foo'])
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
@@ -132,3 +143,17 @@ class TestOverrideProvider(FieldOverrideProvider):
     @classmethod
     def enabled_for(cls, course):
         return True
+
+
+class TestOverriddenFieldsProvider(TestOverrideProvider):
+    """
+    A `FieldOverrideProvider` which tells which fields it overrides.
+    """
+    calls = []
+
+    def get(self, block, name, default):
+        self.calls.append(name)
+        return super(TestOverriddenFieldsProvider, self).get(block, name, default)
+
+    def overridden_fields(self, block):
+        return frozenset(['foo'])
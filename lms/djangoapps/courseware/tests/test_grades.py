@@ -12,7 +12,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, send_grades_updated=True):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -23,7 +23,7 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(student, request, course, keep_raw_scores=keep_raw_scores, send_grades_updated=send_grades_updated)
 
 
 @attr('shard_1')
@@ -74,6 +74,17 @@ class TestGradeIteration(ModuleStoreTestCase):
             self.assertIsNone(gradeset['grade'])
             self.assertEqual(gradeset['percent'], 0.0)
 
+    @patch('courseware.grades.GRADES_UPDATED.send_robust', return_value=[])
+    def test_grades_updated_signal(self, mock_send):
+        """The GRADES_UPDATED signal is sent for each student unless the caller opts out"""
+        self._gradesets_and_errors_for(self.course.id, self.students)
+        self.assertEqual(mock_send.call_count, len(self.students))
+
+        mock_send.reset_mock()
+        for __ in iterate_grades_for(self.course.id, self.students, send_grades_updated=False):
+            pass
+        self.assertFalse(mock_send.called)
+
     @patch('courseware.grades.grade', _grade_with_errors)
     def test_grading_exception(self):
         """Test that we correctly capture exception messages that bubble up from
@@ -0,0 +1,98 @@
+"""
+Tests for the write-behind StudentModuleHistory storage in courseware.history.
+"""
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import Mock, patch
+
+from courseware import history
+from courseware.models import StudentModuleHistory
+from courseware.tasks import bulk_create_student_module_history
+from courseware.tests.factories import StudentModuleFactory, course_id, location
+
+
+@patch('courseware.history.RequestCache.get_current_request', Mock(return_value=Mock()))
+class TestStudentModuleHistoryWriter(TestCase):
+    """
+    Tests for the 'immediate', 'buffered' and 'celery' write modes.
+    """
+    def setUp(self):
+        super(TestStudentModuleHistoryWriter, self).setUp()
+        self.addCleanup(history.flush)
+
+    def create_module(self):
+        """
+        Create a problem StudentModule, which records a history entry.
+        """
+        return StudentModuleFactory.create(course_id=course_id, module_state_key=location('problem'))
+
+    def test_immediate(self):
+        module = self.create_module()
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 1)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.BUFFERED, STUDENT_MODULE_HISTORY_MAX_DELAY=0)
+    def test_buffered(self):
+        module = self.create_module()
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 0)
+
+        with self.assertNumQueries(1):
+            history.flush_if_due()
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 1)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.BUFFERED, STUDENT_MODULE_HISTORY_MAX_DELAY=60)
+    def test_buffered_not_due(self):
+        module = self.create_module()
+        history.flush_if_due()
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 0)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.BUFFERED, STUDENT_MODULE_HISTORY_BATCH_SIZE=2)
+    def test_buffered_batch_size(self):
+        first = self.create_module()
+        second = StudentModuleFactory.create(course_id=course_id, module_state_key=location('other_problem'))
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module__in=[first, second]).count(), 2)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.CELERY)
+    def test_celery(self):
+        with patch('courseware.tasks.bulk_create_student_module_history.delay') as mock_delay:
+            module = self.create_module()
+            history.flush()
+
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 0)
+        (entries,), __ = mock_delay.call_args
+        self.assertEqual([entry['student_module_id'] for entry in entries], [module.id])
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.CELERY)
+    def test_celery_unavailable(self):
+        with patch('courseware.tasks.bulk_create_student_module_history.delay', side_effect=Exception):
+            module = self.create_module()
+            history.flush()
+
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 1)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.CELERY)
+    def test_write_buffered(self):
+        with patch('courseware.tasks.bulk_create_student_module_history.delay') as mock_delay:
+            module = self.create_module()
+            other = StudentModuleFactory.create(course_id=course_id, module_state_key=location('other_problem'))
+            history.write_buffered([module.id])
+            self.assertFalse(mock_delay.called)
+
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 1)
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=other).count(), 0)
+        buffered = history._BUFFER  # pylint: disable=protected-access
+        self.assertEqual([entry.student_module_id for entry in buffered], [other.id])
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.BUFFERED)
+    def test_outside_request(self):
+        with patch('courseware.history.RequestCache.get_current_request', return_value=None):
+            module = self.create_module()
+        self.assertEqual(StudentModuleHistory.objects.filter(student_module=module).count(), 1)
+
+    def test_bulk_create_task(self):
+        module = self.create_module()
+        entry = StudentModuleHistory.objects.get(student_module=module)
+
+        bulk_create_student_module_history([history.serialize_entry(entry)])
+
+        copies = StudentModuleHistory.objects.filter(student_module=module).exclude(id=entry.id)
+        self.assertEqual([(copy.state, copy.created) for copy in copies], [(entry.state, entry.created)])
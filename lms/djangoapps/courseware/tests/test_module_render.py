@@ -5,6 +5,7 @@ Test for lms courseware app, module render unit
 import ddt
 import itertools
 import json
+from datetime import datetime
 from nose.plugins.attrib import attr
 from functools import partial
 
@@ -19,6 +20,7 @@ from mock import MagicMock, patch, Mock
 from opaque_keys.edx.keys import UsageKey, CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from pyquery import PyQuery
+from pytz import UTC
 from courseware.module_render import hash_resource
 from xblock.field_data import FieldData
 from xblock.runtime import Runtime
@@ -38,11 +40,13 @@ from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
+from openedx.core.lib.xblock_utils import fragment_cache_key
 from student.models import anonymous_id_for_user
 from xmodule.modulestore.tests.django_utils import (
     TEST_DATA_MIXED_TOY_MODULESTORE,
     TEST_DATA_XML_MODULESTORE,
 )
+from xmodule.html_module import HtmlModule
 from xmodule.lti_module import LTIDescriptor
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
@@ -188,7 +192,7 @@ class ModuleRenderTestCase(ModuleStoreTestCase, LoginEnrollmentTestCase):
                 request,
                 unicode(self.course_key),
                 self.mock_user.id,
-                self.mock_module.id,
+                unicode(self.mock_module.id),
                 self.dispatch
             )
 
@@ -225,6 +229,45 @@ class ModuleRenderTestCase(ModuleStoreTestCase, LoginEnrollmentTestCase):
                     self.dispatch
                 )
 
+    def send_xqueue_score_update(self, queuestate):
+        """
+        Call xqueue_callback with a score update for a problem whose stored
+        response has `queuestate`, and return the mock of load_single_xblock.
+        """
+        user = UserFactory()
+        usage_key = self.course_key.make_usage_key('problem', 'queued_problem')
+        StudentModuleFactory.create(
+            student=user,
+            course_id=self.course_key,
+            module_state_key=usage_key,
+            state=json.dumps({'correct_map': {'answer_id': {'queuestate': queuestate}}}),
+        )
+        data = {
+            'xqueue_header': json.dumps({'lms_key': 'fake key'}),
+            'xqueue_body': 'hello world',
+        }
+        with patch('courseware.module_render.load_single_xblock', return_value=self.mock_module) as mock_load:
+            request = self.request_factory.post(self.callback_url, data)
+            response = render.xqueue_callback(
+                request,
+                unicode(self.course_key),
+                user.id,
+                unicode(usage_key),
+                self.dispatch
+            )
+        self.assertEqual(response.status_code, 200)
+        return mock_load
+
+    def test_xqueue_callback_pending_score_update(self):
+        mock_load = self.send_xqueue_score_update({'key': 'fake key', 'time': '20150101000000'})
+        self.assertTrue(mock_load.called)
+        self.assertTrue(self.mock_module.handle_ajax.called)
+
+    @ddt.data({'key': 'other key', 'time': '20150101000000'}, None)
+    def test_xqueue_callback_stale_score_update(self, queuestate):
+        mock_load = self.send_xqueue_score_update(queuestate)
+        self.assertFalse(mock_load.called)
+
     def test_get_score_bucket(self):
         self.assertEquals(render.get_score_bucket(0, 10), 'incorrect')
         self.assertEquals(render.get_score_bucket(1, 10), 'partial')
@@ -827,6 +870,78 @@ class TestHtmlModifiers(ModuleStoreTestCase):
             result_fragment.content
         )
 
+    @override_settings(XBLOCK_FRAGMENT_CACHE_TIMEOUT=60)
+    def test_fragment_cache(self):
+        """
+        Test that the student view of an html block is rendered once and then served
+        from the fragment cache, while the block wrappers are still applied.
+        """
+        module = render.get_module(
+            self.user,
+            self.request,
+            self.location,
+            self.field_data_cache,
+        )
+        first_fragment = module.render(STUDENT_VIEW)
+
+        other_user = UserFactory.create()
+        self.request.user = other_user
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course.id,
+            other_user,
+            self.descriptor
+        )
+        with patch.object(HtmlModule, 'get_html') as mock_get_html:
+            module = render.get_module(
+                other_user,
+                self.request,
+                self.location,
+                field_data_cache,
+            )
+            second_fragment = module.render(STUDENT_VIEW)
+            self.assertFalse(mock_get_html.called)
+
+        self.assertEqual(first_fragment.content, second_fragment.content)
+        self.assertIn(
+            '/courses/{course_id}/bar/content'.format(
+                course_id=self.course.id.to_deprecated_string()
+            ),
+            second_fragment.content
+        )
+        self.assertEquals(len(PyQuery(second_fragment.content)('div.xblock.xblock-student_view')), 1)
+
+    @override_settings(XBLOCK_FRAGMENT_CACHE_TIMEOUT=60)
+    def test_fragment_cache_skips_learner_specific_html(self):
+        """
+        Test that html including the learner's anonymous id is rendered for each learner.
+        """
+        descriptor = ItemFactory.create(category='html', data='<p>%%USER_ID%%</p>')
+        for user in (self.user, UserFactory.create()):
+            self.request.user = user
+            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, descriptor)
+            module = render.get_module(user, self.request, descriptor.location, field_data_cache)
+            self.assertIn(anonymous_id_for_user(user, None), module.render(STUDENT_VIEW).content)
+
+    def test_fragment_cache_key(self):
+        """
+        Test that the fragment cache key changes with the block version and the learner's groups.
+        """
+        block = Mock(scope_ids=Mock(usage_id=self.location), edited_on=datetime(2015, 1, 1, tzinfo=UTC))
+        key = fragment_cache_key(block, STUDENT_VIEW, {})
+        self.assertEqual(key, fragment_cache_key(block, STUDENT_VIEW, {}))
+        self.assertNotEqual(key, fragment_cache_key(block, 'other_view', {}))
+        self.assertNotEqual(key, fragment_cache_key(block, STUDENT_VIEW, {0: 1}))
+        self.assertNotEqual(
+            fragment_cache_key(block, STUDENT_VIEW, {0: 1}),
+            fragment_cache_key(block, STUDENT_VIEW, {0: 2})
+        )
+
+        block.edited_on = datetime(2015, 1, 2, tzinfo=UTC)
+        self.assertNotEqual(key, fragment_cache_key(block, STUDENT_VIEW, {}))
+
+        block.edited_on = None
+        self.assertIsNone(fragment_cache_key(block, STUDENT_VIEW, {}))
+
 
 class XBlockWithJsonInitData(XBlock):
     """
@@ -876,6 +991,34 @@ class JsonInitDataTest(ModuleStoreTestCase):
         # No matter what data goes in, there should only be one close-script tag.
         self.assertEqual(html.count("</script>"), 1)
 
+    @XBlock.register_temp_plugin(XBlockWithJsonInitData, identifier='withjson')
+    def test_json_init_data_urls_rewritten(self):
+        """
+        Test that urls in the markup added by wrap_xblock, such as the JSON init data,
+        are rewritten like those in the block's own content.
+        """
+        XBlockWithJsonInitData.the_json_data = {'image': '/static/image.png'}
+        mock_user = UserFactory()
+        mock_request = MagicMock()
+        mock_request.user = mock_user
+        course = CourseFactory()
+        descriptor = ItemFactory(category='withjson', parent=course)
+        field_data_cache = FieldDataCache([course, descriptor], course.id, mock_user)   # pylint: disable=no-member
+        module = render.get_module_for_descriptor(
+            mock_user,
+            mock_request,
+            descriptor,
+            field_data_cache,
+            course.id,                          # pylint: disable=no-member
+            course=course
+        )
+        html = module.render(STUDENT_VIEW).content
+        self.assertNotIn('"/static/image.png"', html)
+        self.assertIn(
+            '/c4x/{org}/{course}/asset/image.png'.format(org=course.location.org, course=course.location.course),
+            html
+        )
+
 
 class ViewInStudioTest(ModuleStoreTestCase):
     """Tests for the 'View in Studio' link visiblity."""
@@ -0,0 +1,132 @@
+"""
+Tests for the multi-user bulk operations of DjangoXBlockUserStateClient.
+"""
+import json
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import Mock, patch
+from nose.plugins.attrib import attr
+
+from courseware import history
+from courseware.models import StudentModule, StudentModuleHistory
+from courseware.tests.factories import StudentModuleFactory, UserFactory, course_id, location
+from courseware.user_state_client import DjangoXBlockUserStateClient
+
+
+@attr('shard_1')
+class TestBulkUserStateClient(TestCase):
+    """
+    Tests for get_many_for_users, set_many_for_users and the iter_all_* methods.
+    """
+    def setUp(self):
+        super(TestBulkUserStateClient, self).setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.block_keys = [location('block_{}'.format(index)) for index in range(2)]
+        for user in self.users[:2]:
+            for block_key in self.block_keys:
+                StudentModuleFactory.create(
+                    student=user,
+                    course_id=course_id,
+                    module_state_key=block_key,
+                    state=json.dumps({'user': user.username, 'block': unicode(block_key)}),
+                )
+
+    def test_get_many_for_users(self):
+        with self.assertNumQueries(2):
+            results = list(self.client.get_many_for_users(
+                [user.username for user in self.users],
+                self.block_keys,
+            ))
+
+        self.assertEqual(len(results), 4)
+        for username, block_key, state in results:
+            self.assertEqual(state, {'user': username, 'block': unicode(block_key)})
+
+    def test_get_many_for_users_fields(self):
+        results = list(self.client.get_many_for_users([self.users[0].username], self.block_keys, fields=['user']))
+        self.assertEqual(
+            [state for __, __, state in results],
+            [{'user': self.users[0].username}] * 2
+        )
+
+    def test_set_many_for_users(self):
+        new_user = self.users[2]
+        existing_history = list(StudentModuleHistory.objects.values_list('id', flat=True))
+        self.client.set_many_for_users({
+            self.users[0].username: {self.block_keys[0]: {'user': 'changed', 'extra': 1}},
+            new_user.username: {self.block_keys[0]: {'user': new_user.username}},
+        })
+
+        updated = StudentModule.objects.get(student=self.users[0], module_state_key=self.block_keys[0])
+        self.assertEqual(
+            json.loads(updated.state),
+            {'user': 'changed', 'extra': 1, 'block': unicode(self.block_keys[0])}
+        )
+        created = StudentModule.objects.get(student=new_user, module_state_key=self.block_keys[0])
+        self.assertEqual(json.loads(created.state), {'user': new_user.username})
+        new_history = StudentModuleHistory.objects.exclude(id__in=existing_history)
+        self.assertEqual(
+            set(new_history.values_list('student_module_id', flat=True)),
+            {updated.id, created.id}
+        )
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITE_MODE=history.BUFFERED)
+    @patch('courseware.history.RequestCache.get_current_request', Mock(return_value=Mock()))
+    def test_set_many_for_users_buffered_history(self):
+        self.addCleanup(history.flush)
+        existing_history = list(StudentModuleHistory.objects.values_list('id', flat=True))
+        self.client.set_many_for_users({self.users[0].username: {self.block_keys[0]: {'user': 'changed'}}})
+        self.assertFalse(StudentModuleHistory.objects.exclude(id__in=existing_history).exists())
+
+        history.flush()
+        self.assertEqual(StudentModuleHistory.objects.exclude(id__in=existing_history).count(), 1)
+
+    def test_set_many_for_users_concurrent_insert(self):
+        # Another request created one of the modules after they were read
+        new_user = self.users[2]
+        existing_history = list(StudentModuleHistory.objects.values_list('id', flat=True))
+        with patch.object(StudentModule.objects, 'bulk_create', Mock(side_effect=IntegrityError)):
+            self.client.set_many_for_users({
+                self.users[0].username: {self.block_keys[0]: {'user': 'changed'}},
+                new_user.username: {block_key: {'user': new_user.username} for block_key in self.block_keys},
+            })
+
+        created = StudentModule.objects.filter(student=new_user)
+        self.assertEqual(
+            [json.loads(student_module.state) for student_module in created],
+            [{'user': new_user.username}] * 2
+        )
+        self.assertEqual(StudentModuleHistory.objects.exclude(id__in=existing_history).count(), 3)
+
+    def test_set_many_for_users_same_state(self):
+        # Modules ending up with the same state are updated with a single query: one
+        # query reads the users, one the modules, one updates them and one writes history.
+        same_state = {'user': 'reset', 'block': 'reset'}
+        with self.assertNumQueries(4):
+            self.client.set_many_for_users({
+                user.username: {block_key: same_state for block_key in self.block_keys}
+                for user in self.users[:2]
+            })
+
+        self.assertEqual(
+            [json.loads(state) for state in StudentModule.objects.values_list('state', flat=True)],
+            [same_state] * 4
+        )
+
+    def test_set_many_for_unknown_user(self):
+        with self.assertRaises(DjangoXBlockUserStateClient.DoesNotExist):
+            self.client.set_many_for_users({'no_such_user': {self.block_keys[0]: {}}})
+
+    def test_iter_all_for_block(self):
+        results = list(self.client.iter_all_for_block(self.block_keys[0], batch_size=1))
+        self.assertEqual(
+            sorted(username for username, __, __ in results),
+            sorted(user.username for user in self.users[:2])
+        )
+
+    def test_iter_all_for_course(self):
+        self.assertEqual(len(list(self.client.iter_all_for_course(course_id, batch_size=3))), 4)
+        self.assertEqual(len(list(self.client.iter_all_for_course(course_id, block_type='html'))), 0)
@@ -0,0 +1,193 @@
+"""
+Tests for the LMS XQueue interface in courseware.xqueue and the task posting queued submissions.
+"""
+import json
+
+import ddt
+from celery.exceptions import MaxRetriesExceededError, Retry
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+from mock import Mock, patch
+
+from capa.correctmap import CorrectMap
+from capa.responsetypes import CodeResponse
+
+from courseware import tasks
+from courseware.models import StudentModule
+from courseware.tests.factories import StudentModuleFactory, course_id, location
+from courseware.xqueue import LmsXQueueInterface, fail_submission, is_transient_failure
+from request_cache.middleware import RequestCache
+from util.db import RunAfterCommitMiddleware
+
+HEADER = json.dumps({'lms_callback_url': '/', 'lms_key': 'secret', 'queue_name': 'test-queue'})
+BODY = json.dumps({'student_response': 'print "hello"'})
+
+
+@ddt.ddt
+class LmsXQueueInterfaceTest(TestCase):
+    """
+    Tests for LmsXQueueInterface.send_to_queue.
+    """
+    def setUp(self):
+        super(LmsXQueueInterfaceTest, self).setUp()
+        self.interface = LmsXQueueInterface('http://xqueue.example.com', {'username': 'lms', 'password': 'secret'})
+        self.interface._http_post = Mock(return_value=(0, '3'))  # pylint: disable=protected-access
+
+    def test_posts_directly_by_default(self):
+        with patch('courseware.tasks.send_xqueue_submission.delay') as mock_delay:
+            self.assertEqual(self.interface.send_to_queue(HEADER, BODY), (0, '3'))
+        self.assertFalse(mock_delay.called)
+        self.assertEqual(self.interface._http_post.call_count, 1)  # pylint: disable=protected-access
+
+    def test_queues_submission(self):
+        with patch.dict(settings.FEATURES, {'ENABLE_ASYNC_XQUEUE_SUBMISSION': True}):
+            with patch('courseware.tasks.send_xqueue_submission.delay') as mock_delay:
+                self.assertEqual(self.interface.send_to_queue(HEADER, BODY), (0, ''))
+        mock_delay.assert_called_once_with(HEADER, BODY)
+        self.assertFalse(self.interface._http_post.called)  # pylint: disable=protected-access
+
+    @patch.object(RequestCache.get_request_cache(), 'request', Mock())
+    def test_queues_submission_after_commit(self):
+        with patch.dict(settings.FEATURES, {'ENABLE_ASYNC_XQUEUE_SUBMISSION': True}):
+            with patch('courseware.tasks.send_xqueue_submission.delay') as mock_delay:
+                self.assertEqual(self.interface.send_to_queue(HEADER, BODY), (0, ''))
+                self.assertFalse(mock_delay.called)
+                RunAfterCommitMiddleware().process_response(Mock(), Mock())
+        mock_delay.assert_called_once_with(HEADER, BODY)
+
+    def test_posts_files_directly(self):
+        upload = Mock()
+        upload.name = 'prog1.py'
+        with patch.dict(settings.FEATURES, {'ENABLE_ASYNC_XQUEUE_SUBMISSION': True}):
+            with patch('courseware.tasks.send_xqueue_submission.delay') as mock_delay:
+                self.assertEqual(self.interface.send_to_queue(HEADER, BODY, [upload]), (0, '3'))
+        self.assertFalse(mock_delay.called)
+
+    def test_posts_directly_if_task_cannot_be_queued(self):
+        with patch.dict(settings.FEATURES, {'ENABLE_ASYNC_XQUEUE_SUBMISSION': True}):
+            with patch('courseware.tasks.send_xqueue_submission.delay', side_effect=Exception):
+                with patch('courseware.xqueue.fail_submission') as mock_fail:
+                    self.assertEqual(self.interface.send_to_queue(HEADER, BODY), (0, ''))
+        self.assertEqual(self.interface._http_post.call_count, 1)  # pylint: disable=protected-access
+        self.assertFalse(mock_fail.called)
+
+    def test_fails_if_task_cannot_be_queued_nor_posted(self):
+        self.interface._http_post.return_value = (1, 'cannot connect to server')  # pylint: disable=protected-access
+        with patch.dict(settings.FEATURES, {'ENABLE_ASYNC_XQUEUE_SUBMISSION': True}):
+            with patch('courseware.tasks.send_xqueue_submission.delay', side_effect=Exception):
+                with patch('courseware.xqueue.fail_submission') as mock_fail:
+                    self.interface.send_to_queue(HEADER, BODY)
+        mock_fail.assert_called_once_with(HEADER, 'cannot connect to server')
+
+    @ddt.data(
+        ('cannot connect to server', True),
+        ('unexpected HTTP status code [502]', True),
+        ('unexpected HTTP status code [429]', True),
+        ('unexpected HTTP status code [404]', False),
+        ('unexpected HTTP status code [302]', False),
+        ('timed out waiting for a reply from the server', False),
+        ('unexpected reply from server', False),
+        ('Queue test-queue not found', False),
+    )
+    @ddt.unpack
+    def test_is_transient_failure(self, msg, transient):
+        self.assertEqual(is_transient_failure(msg), transient)
+
+
+@ddt.ddt
+class SendXQueueSubmissionTest(TestCase):
+    """
+    Tests for the send_xqueue_submission task.
+    """
+    def send(self, result):
+        """
+        Run the task, with the XQueue answering `result`, and return the mock of fail_submission.
+        """
+        with patch('courseware.tasks.XQUEUE_INTERFACE.post_to_queue', return_value=result) as mock_post:
+            with patch('courseware.tasks.fail_submission') as mock_fail:
+                tasks.send_xqueue_submission(HEADER, BODY)
+        mock_post.assert_called_once_with(HEADER, BODY)
+        return mock_fail
+
+    def test_success(self):
+        with patch.object(tasks.send_xqueue_submission, 'retry') as retry_mock:
+            mock_fail = self.send((0, '3'))
+        self.assertFalse(retry_mock.called)
+        self.assertFalse(mock_fail.called)
+
+    @ddt.data('cannot connect to server', 'unexpected HTTP status code [503]')
+    def test_retried(self, msg):
+        with patch.object(tasks.send_xqueue_submission, 'retry', return_value=Retry()) as retry_mock:
+            with self.assertRaises(Retry):
+                self.send((1, msg))
+        retry_mock.assert_called_once_with(countdown=settings.XQUEUE_SUBMISSION_RETRY_DELAY)
+
+    @ddt.data('Queue test-queue not found', 'timed out waiting for a reply from the server')
+    def test_not_retried_when_rejected(self, msg):
+        with patch.object(tasks.send_xqueue_submission, 'retry') as retry_mock:
+            mock_fail = self.send((1, msg))
+        self.assertFalse(retry_mock.called)
+        mock_fail.assert_called_once_with(HEADER, msg)
+
+    def test_gives_up_after_max_retries(self):
+        with patch.object(tasks.send_xqueue_submission, 'retry', side_effect=MaxRetriesExceededError):
+            mock_fail = self.send((1, 'cannot connect to server'))
+        mock_fail.assert_called_once_with(HEADER, 'cannot connect to server')
+
+
+class FailSubmissionTest(TestCase):
+    """
+    Tests for fail_submission.
+    """
+    def create_queued_problem(self, state):
+        """
+        Create the StudentModule of a problem with `state`, and return it with
+        the xqueue header of a submission to it.
+        """
+        module = StudentModuleFactory.create(
+            course_id=course_id,
+            module_state_key=location('queued_problem'),
+            state=json.dumps(state),
+        )
+        callback_url = 'http://lms.example.com' + reverse('xqueue_callback', kwargs={
+            'course_id': course_id.to_deprecated_string(),
+            'userid': str(module.student_id),
+            'mod_id': location('queued_problem').to_deprecated_string(),
+            'dispatch': 'score_update',
+        })
+        header = json.dumps({'lms_callback_url': callback_url, 'lms_key': 'secret', 'queue_name': 'test-queue'})
+        return module, header
+
+    def test_fail_submission(self):
+        queuestate = {'key': 'secret', 'time': '20150101000000'}
+        correct_map = CorrectMap('queued_answer', correctness='incomplete', queuestate=queuestate)
+        correct_map.set('other_answer', correctness='correct', npoints=1)
+        state = {'correct_map': correct_map.get_dict(), 'attempts': 1}
+        module, header = self.create_queued_problem(state)
+
+        fail_submission(header, 'cannot connect to server')
+
+        new_state = json.loads(StudentModule.objects.get(id=module.id).state)
+        correct_map = new_state['correct_map']
+        self.assertIsNone(correct_map['queued_answer']['queuestate'])
+        self.assertIsNone(correct_map['queued_answer']['correctness'])
+        self.assertEqual(
+            correct_map['queued_answer']['msg'],
+            CodeResponse.get_undelivered_msg('cannot connect to server', lambda text: text)
+        )
+        self.assertEqual(correct_map['other_answer'], state['correct_map']['other_answer'])
+        self.assertEqual(new_state['attempts'], 1)
+
+    def test_other_submission(self):
+        queuestate = {'key': 'other_secret', 'time': '20150101000000'}
+        state = {'correct_map': CorrectMap('queued_answer', correctness='incomplete', queuestate=queuestate).get_dict()}
+        module, header = self.create_queued_problem(state)
+
+        fail_submission(header, 'cannot connect to server')
+
+        self.assertEqual(json.loads(StudentModule.objects.get(id=module.id).state), state)
+
+    def test_unknown_problem(self):
+        header = json.dumps({'lms_callback_url': 'http://lms.example.com/unknown', 'lms_key': 'secret'})
+        fail_submission(header, 'cannot connect to server')
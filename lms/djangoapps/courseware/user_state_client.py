@@ -3,6 +3,7 @@ An implementation of :class:`XBlockUserStateClient`, which stores XBlock Scope.u
 data in a Django ORM model.
 """
 
+from collections import defaultdict
 import itertools
 from operator import attrgetter
 
@@ -12,8 +13,11 @@ except ImportError:
     import json
 
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from xblock.fields import Scope, ScopeBase
 from edx_user_state_client.interface import XBlockUserStateClient
+from courseware import history
 from courseware.models import StudentModule, StudentModuleHistory
 from contracts import contract, new_contract
 from opaque_keys.edx.keys import UsageKey
@@ -44,6 +48,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         pass
 
+    # The default number of rows fetched per query by iter_all_for_block and iter_all_for_course
+    ITER_BATCH_SIZE = 1000
+
     def __init__(self, user=None):
         """
         Arguments:
@@ -223,25 +230,33 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             user = User.objects.get(username=username)
 
         for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
+            self._set_student_module_state(user.id, usage_key, state)
+
+    def _set_student_module_state(self, user_id, usage_key, state):
+        """
+        Overlay `state` over the stored state of the :class:`~StudentModule` of the user
+        with id `user_id` for the XBlock `usage_key`, creating it if needed. Saving the
+        module records its history.
+        """
+        student_module, created = StudentModule.objects.get_or_create(
+            student_id=user_id,
+            course_id=usage_key.course_key,
+            module_state_key=usage_key,
+            defaults={
+                'state': json.dumps(state),
+                'module_type': usage_key.block_type,
+            },
+        )
 
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                current_state.update(state)
-                student_module.state = json.dumps(current_state)
-                # We just read this object, so we know that we can do an update
-                student_module.save(force_update=True)
+        if not created:
+            if student_module.state is None:
+                current_state = {}
+            else:
+                current_state = json.loads(student_module.state)
+            current_state.update(state)
+            student_module.state = json.dumps(current_state)
+            # We just read this object, so we know that we can do an update
+            student_module.save(force_update=True)
 
     @contract(
         username="basestring",
@@ -330,6 +345,10 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if len(student_modules) == 0:
             raise self.DoesNotExist()
 
+        # Entries buffered by a write-behind history mode aren't in the database yet.
+        # Write them out here, since flushing them may only hand them to a Celery task.
+        student_module_ids = [student_module.id for student_module in student_modules]
+        history.write_buffered(student_module_ids)
         history_entries = StudentModuleHistory.objects.filter(
             student_module__in=student_modules
         ).order_by('-id')
@@ -338,28 +357,251 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if not history_entries:
             for student_module in student_modules:
                 student_module.save()
+            history.write_buffered(student_module_ids)
             history_entries = StudentModuleHistory.objects.filter(
                 student_module__in=student_modules
             ).order_by('-id')
 
         return history_entries
 
+    @contract(
+        usernames="seq(basestring)|set(basestring)",
+        block_keys="seq(UsageKey)|set(UsageKey)",
+        scope=ScopeBase,
+        fields="seq(basestring)|set(basestring)|None"
+    )
+    def get_many_for_users(self, usernames, block_keys, scope=Scope.user_state, fields=None):
+        """
+        Retrieve the stored XBlock state for many users and many xblock usages at once.
+
+        State is loaded with one query per course (per chunk of block keys), rather
+        than one query per user as with :meth:`get_many`.
+
+        Arguments:
+            usernames: The names of the users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+
+        Yields:
+            (username, UsageKey, field_state) tuples for each stored state.
+            field_state is a dict mapping field names to values.
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
+
+        usernames_by_id = dict(
+            User.objects.filter(username__in=list(usernames)).values_list('id', 'username')
+        )
+        if not usernames_by_id:
+            return
+
+        for student_module, usage_key in self._get_student_modules_for_users(usernames_by_id.keys(), block_keys):
+            yield (
+                usernames_by_id[student_module.student_id],
+                usage_key,
+                self._state_for_fields(student_module, fields),
+            )
+
+    @contract(username_to_block_keys_to_state="dict(basestring: dict(UsageKey: dict(basestring: *)))", scope=ScopeBase)
+    def set_many_for_users(self, username_to_block_keys_to_state, scope=Scope.user_state):
+        """
+        Set fields for many XBlocks for many users at once.
+
+        Existing rows are read with one query per course (per chunk of block keys)
+        and updated with one query per distinct resulting state, missing rows are
+        written with ``bulk_create``, history entries are recorded through
+        :mod:`courseware.history`, and everything happens in a single transaction.
+        If another request creates some of the missing rows meanwhile, they are
+        written one by one instead.
+
+        Arguments:
+            username_to_block_keys_to_state (dict): A dict mapping usernames to dicts which
+                map UsageKeys to state dicts. Each state dict maps field names to values.
+                These state dicts are overlaid over the stored state, as in :meth:`set_many`.
+            scope (Scope): The scope to load data from
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported")
+
+        user_ids = dict(
+            User.objects.filter(username__in=username_to_block_keys_to_state.keys()).values_list('username', 'id')
+        )
+        missing_users = set(username_to_block_keys_to_state) - set(user_ids)
+        if missing_users:
+            raise self.DoesNotExist("Unknown usernames: {}".format(", ".join(sorted(missing_users))))
+
+        updates = {}
+        block_keys = set()
+        for username, block_keys_to_state in username_to_block_keys_to_state.iteritems():
+            for usage_key, state in block_keys_to_state.iteritems():
+                updates[(user_ids[username], usage_key)] = state
+                block_keys.add(usage_key)
+
+        with transaction.commit_on_success():
+            now = timezone.now()
+            changed_modules = []
+            ids_by_state = defaultdict(list)
+            for student_module, usage_key in self._get_student_modules_for_users(user_ids.values(), block_keys):
+                state = updates.pop((student_module.student_id, usage_key), None)
+                if state is None:
+                    continue
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = now
+                ids_by_state[student_module.state].append(student_module.id)
+                changed_modules.append(student_module)
+
+            # The modules ending up with the same state are updated together. A queryset
+            # update skips the post_save history receiver; their history is recorded below.
+            for new_state, ids in ids_by_state.iteritems():
+                StudentModule.objects.filter(id__in=ids).update(state=new_state, modified=now)
+
+            if updates:
+                savepoint = transaction.savepoint()
+                try:
+                    StudentModule.objects.bulk_create([
+                        StudentModule(
+                            student_id=user_id,
+                            course_id=usage_key.course_key,
+                            module_state_key=usage_key,
+                            module_type=usage_key.block_type,
+                            state=json.dumps(new_state),
+                            created=now,
+                            modified=now,
+                        )
+                        for (user_id, usage_key), new_state in updates.iteritems()
+                    ])
+                    transaction.savepoint_commit(savepoint)
+                except IntegrityError:
+                    # Another request created some of these rows; saving them one by one
+                    # records their history too.
+                    transaction.savepoint_rollback(savepoint)
+                    for (user_id, usage_key), new_state in updates.iteritems():
+                        self._set_student_module_state(user_id, usage_key, new_state)
+                    updates = {}
+
+            if updates:
+                # bulk_create doesn't return primary keys, which the history rows need
+                created_keys = set(updates)
+                changed_modules.extend(
+                    student_module
+                    for student_module, usage_key in self._get_student_modules_for_users(
+                        set(user_id for user_id, __ in created_keys),
+                        set(usage_key for __, usage_key in created_keys),
+                    )
+                    if (student_module.student_id, usage_key) in created_keys
+                )
+
+            history.record_history_entries([
+                StudentModuleHistory(
+                    student_module_id=student_module.id,
+                    version=None,
+                    created=student_module.modified,
+                    state=student_module.state,
+                    grade=student_module.grade,
+                    max_grade=student_module.max_grade,
+                )
+                for student_module in changed_modules
+                if student_module.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES
+            ])
+
+    def _get_student_modules_for_users(self, user_ids, block_keys):
+        """
+        Retrieve the :class:`~StudentModule`s for all of the supplied ``user_ids`` and ``block_keys``.
+
+        Arguments:
+            user_ids (list of int): The ids of the users to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+
+        Yields:
+            (StudentModule, UsageKey) tuples.
+        """
+        user_ids = list(user_ids)
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        for course_key, usage_keys in by_course:
+            query = StudentModule.objects.chunked_filter(
+                'module_state_key__in',
+                usage_keys,
+                student__in=user_ids,
+                course_id=course_key,
+            )
+
+            for student_module in query:
+                usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                yield (student_module, usage_key)
+
+    @staticmethod
+    def _state_for_fields(student_module, fields):
+        """
+        Return the decoded state of `student_module`, restricted to `fields` if that isn't None.
+        """
+        state = {} if student_module.state is None else json.loads(student_module.state)
+        if fields is not None:
+            state = {field: value for field, value in state.iteritems() if field in fields}
+        return state
+
+    def _iter_student_modules_by_id(self, queryset, batch_size=None):
+        """
+        Iterate over all :class:`~StudentModule`s in `queryset`, in primary key order.
+
+        Rows are fetched in batches of ``batch_size`` using ranges on the primary key
+        (``id > last_id ORDER BY id LIMIT batch_size``) rather than OFFSET, so each batch
+        is an index range scan no matter how far into the table the iteration is.
+
+        Yields:
+            (username, UsageKey, field_state) tuples.
+        """
+        batch_size = batch_size or self.ITER_BATCH_SIZE
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).select_related('student').order_by('id')[:batch_size])
+            if not batch:
+                return
+
+            for student_module in batch:
+                usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                yield (student_module.student.username, usage_key, self._state_for_fields(student_module, None))
+
+            last_id = batch[-1].id
+
     def iter_all_for_block(self, block_key, scope=Scope.user_state, batch_size=None):
         """
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Yields:
+            (username, UsageKey, field_state) tuples for every user with state for `block_key`.
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
-        raise NotImplementedError()
+
+        return self._iter_student_modules_by_id(
+            StudentModule.objects.filter(course_id=block_key.course_key, module_state_key=block_key),
+            batch_size,
+        )
 
     def iter_all_for_course(self, course_key, block_type=None, scope=Scope.user_state, batch_size=None):
         """
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Yields:
+            (username, UsageKey, field_state) tuples for every stored state in
+            `course_key`, optionally restricted to blocks of type `block_type`.
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
-        raise NotImplementedError()
+
+        queryset = StudentModule.objects.filter(course_id=course_key)
+        if block_type is not None:
+            queryset = queryset.filter(module_type=block_type)
+        return self._iter_student_modules_by_id(queryset, batch_size)
@@ -0,0 +1,153 @@
+"""
+The interface through which the LMS submits student responses to the XQueue.
+
+By default, each submission is posted to the XQueue while the student waits.
+When FEATURES['ENABLE_ASYNC_XQUEUE_SUBMISSION'] is set, submissions without
+uploaded files are instead handed to the courseware.tasks.send_xqueue_submission
+Celery task once the request which submitted them is committed. The task posts
+them through the interface of its worker process, whose session keeps its
+connections to the XQueue open from one submission to the next. Submissions
+which can't reach the XQueue, or which it answers with a server error or a 429,
+are retried after XQUEUE_SUBMISSION_RETRY_DELAY seconds, then twice as long on
+each further retry, up to XQUEUE_SUBMISSION_MAX_RETRIES times. A read timeout
+isn't retried, since the XQueue may have accepted the submission. When a
+submission is rejected or its retries run out, the problem shows the student
+that the submission couldn't be delivered, as it does for a direct submission.
+
+Submissions with uploaded files are always posted directly, since the files
+only exist for the duration of the request.
+"""
+import json
+import logging
+import re
+from urllib import unquote
+from urlparse import urlparse
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.urlresolvers import Resolver404, resolve
+from django.db import transaction
+from django.utils.translation import ugettext
+from requests.auth import HTTPBasicAuth
+
+from capa.correctmap import CorrectMap
+from capa.responsetypes import CodeResponse
+from capa.xqueue_interface import XQueueInterface
+from courseware.user_state_client import DjangoXBlockUserStateClient
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey, UsageKey
+from util.db import run_after_commit
+
+log = logging.getLogger(__name__)
+
+# Message of XQueueInterface for a reply with an HTTP status code other than 200
+UNEXPECTED_STATUS_CODE_RE = re.compile(r'^unexpected HTTP status code \[(\d+)\]$')
+
+
+def async_submission_enabled():
+    """
+    Returns whether submissions without uploaded files should be posted by a Celery task.
+    """
+    return settings.FEATURES.get('ENABLE_ASYNC_XQUEUE_SUBMISSION', False)
+
+
+def is_transient_failure(msg):
+    """
+    Returns whether a submission which XQueueInterface reported as failed with
+    `msg` failed in a way which a retry may fix: the XQueue couldn't be reached,
+    answered with a server error or asked to slow down.
+    """
+    if msg == 'cannot connect to server':
+        return True
+
+    match = UNEXPECTED_STATUS_CODE_RE.match(msg)
+    if match is None:
+        return False
+    status_code = int(match.group(1))
+    return status_code >= 500 or status_code == 429
+
+
+@transaction.commit_on_success
+def fail_submission(header, msg):
+    """
+    Tell the student that the submission described by the xqueue `header`
+    couldn't be delivered, because of `msg`.
+
+    The responses of the problem which are waiting for the submission are no
+    longer queued, and show the same message as a direct submission which
+    failed.
+    """
+    header = json.loads(header)
+    try:
+        callback = resolve(unquote(urlparse(header['lms_callback_url']).path))
+        course_key = CourseKey.from_string(callback.kwargs['course_id'])
+        usage_key = UsageKey.from_string(callback.kwargs['mod_id']).map_into_course(course_key)
+        user = User.objects.get(id=callback.kwargs['userid'])
+        state = DjangoXBlockUserStateClient(user).get(user.username, usage_key, fields=['correct_map'])
+    except (
+            Resolver404, KeyError, InvalidKeyError, User.DoesNotExist, DjangoXBlockUserStateClient.DoesNotExist
+    ):
+        log.warning(u"Unable to find the problem of the undelivered submission to %s", header.get('lms_callback_url'))
+        return
+
+    correct_map = CorrectMap()
+    correct_map.set_dict(state.get('correct_map') or {})
+    if CodeResponse.fail_queued_submission(correct_map, header['lms_key'], msg, ugettext):
+        DjangoXBlockUserStateClient(user).set(user.username, usage_key, {'correct_map': correct_map.get_dict()})
+
+
+class LmsXQueueInterface(XQueueInterface):
+    """
+    XQueueInterface which can hand submissions to a Celery task.
+    """
+
+    def send_to_queue(self, header, body, files_to_upload=None):
+        """
+        Submit a request to xqueue, or queue a task which submits it.
+
+        See XQueueInterface.send_to_queue. A submission handed to the task is
+        reported as successful with an empty message, since the length of the
+        queue isn't known until the task posts it.
+
+        The task is queued once the request is committed, so that it can't
+        run before the queued state of the problem is saved.
+        """
+        if files_to_upload or not async_submission_enabled():
+            return self.post_to_queue(header, body, files_to_upload)
+
+        run_after_commit(self.queue_submission, header, body)
+        return (0, '')
+
+    def queue_submission(self, header, body):
+        """
+        Hand a submission to the send_xqueue_submission task, or post it right
+        away if the task can't be queued.
+        """
+        # Imported here to avoid a circular import, since the task module imports this one.
+        from courseware.tasks import send_xqueue_submission
+        try:
+            send_xqueue_submission.delay(header, body)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Unable to queue an XQueue submission, posting it directly")
+            (error, msg) = self.post_to_queue(header, body)
+            if error:
+                fail_submission(header, msg)
+
+    def post_to_queue(self, header, body, files_to_upload=None):
+        """
+        Submit a request to xqueue right away; see XQueueInterface.send_to_queue.
+        """
+        return super(LmsXQueueInterface, self).send_to_queue(header, body, files_to_upload)
+
+
+if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
+    REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
+else:
+    REQUESTS_AUTH = None
+
+XQUEUE_INTERFACE = LmsXQueueInterface(
+    settings.XQUEUE_INTERFACE['url'],
+    settings.XQUEUE_INTERFACE['django_auth'],
+    REQUESTS_AUTH,
+    timeout=settings.XQUEUE_HTTP_TIMEOUT,
+)
@@ -52,4 +52,20 @@ def edxnotes(cls):
             })
 
     cls.get_html = get_html
+
+    original_has_learner_independent_view = getattr(cls, 'has_learner_independent_view', None)
+    if original_has_learner_independent_view is not None:
+        def has_learner_independent_view(self, view_name):
+            """
+            Returns whether `view_name` renders the same for every learner. The notes
+            markup carries the learner's token, so no view does when notes are enabled.
+            """
+            is_studio = getattr(self.system, "is_author_mode", False)
+            course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
+            if not is_studio and is_feature_enabled(course):
+                return False
+            return original_has_learner_independent_view(self, view_name)
+
+        cls.has_learner_independent_view = has_learner_independent_view
+
     return cls
@@ -2600,6 +2600,19 @@ class TestInstructorAPILevelsDataDump(ModuleStoreTestCase, LoginEnrollmentTestCa
                                  " report when it is complete.".format(report_type=report_type)
         self.assertIn(already_running_status, response.content)
 
+    def test_calculate_credit_eligibility(self):
+        url = reverse('calculate_credit_eligibility', kwargs={'course_id': unicode(self.course.id)})
+        with patch('instructor_task.api.submit_calculate_credit_eligibility') as mock_submit:
+            response = self.client.post(url, {})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(mock_submit.called)
+        self.assertIn("The credit eligibility of the students is being updated!", response.content)
+
+        with patch('instructor_task.api.submit_calculate_credit_eligibility') as mock_submit:
+            mock_submit.side_effect = AlreadyRunningError()
+            response = self.client.post(url, {})
+        self.assertIn("A credit eligibility update is already in progress.", response.content)
+
     def test_get_distribution_no_feature(self):
         """
         Test that get_distribution lists available features
@@ -921,9 +921,8 @@ def get_sale_records(request, course_id, csv=False):  # pylint: disable=unused-a
         'internal_reference', 'invoice_number', 'codes', 'course_id'
     ]
 
-    sale_data = instructor_analytics.basic.sale_record_features(course_id, query_features)
-
     if not csv:
+        sale_data = instructor_analytics.basic.sale_record_features(course_id, query_features)
         for item in sale_data:
             item['created_by'] = item['created_by'].username
 
@@ -934,8 +933,11 @@ def get_sale_records(request, course_id, csv=False):  # pylint: disable=unused-a
         }
         return JsonResponse(response_payload)
     else:
-        header, datarows = instructor_analytics.csvs.format_dictlist(sale_data, query_features)
-        return instructor_analytics.csvs.create_csv_response("e-commerce_sale_invoice_records.csv", header, datarows)
+        sale_data = instructor_analytics.basic.iter_sale_record_features(course_id, query_features)
+        datarows = instructor_analytics.csvs.iter_dictlist_rows(sale_data, query_features)
+        return instructor_analytics.csvs.create_streaming_csv_response(
+            "e-commerce_sale_invoice_records.csv", query_features, datarows
+        )
 
 
 @ensure_csrf_cookie
@@ -2145,6 +2147,30 @@ def calculate_grades_csv(request, course_id):
         })
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+@require_POST
+def calculate_credit_eligibility(request, course_id):
+    """
+    Start updating the credit eligibility of all students enrolled in the course.
+
+    AlreadyRunningError is raised if the course's credit eligibility is already being updated.
+    """
+    course_key = CourseKey.from_string(course_id)
+    try:
+        instructor_task.api.submit_calculate_credit_eligibility(request, course_key)
+        success_status = _("The credit eligibility of the students is being updated! "
+                           "You can view the status of the task in the 'Pending Instructor Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("A credit eligibility update is already in progress. "
+                                   "Check the 'Pending Instructor Tasks' table for the status of the task.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -91,6 +91,8 @@ urlpatterns = patterns(
         'instructor.views.api.calculate_grades_csv', name="calculate_grades_csv"),
     url(r'problem_grade_report$',
         'instructor.views.api.problem_grade_report', name="problem_grade_report"),
+    url(r'calculate_credit_eligibility$',
+        'instructor.views.api.calculate_credit_eligibility', name="calculate_credit_eligibility"),
 
     # Financial Report downloads..
     url(r'^list_financial_report_downloads$',
@@ -15,6 +15,7 @@ from django.core.urlresolvers import reverse
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
 from microsite_configuration import microsite
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from student.models import CourseEnrollmentAllowed
 
 
@@ -119,32 +120,40 @@ def sale_record_features(course_id, features):
         {'company_name': 'group_C', 'total_codes': '3', total_amount:'total_amount3 in decimal'.}
     ]
     """
+    return list(iter_sale_record_features(course_id, features))
+
+
+def iter_sale_record_features(course_id, features):
+    """
+    Generate the sales features of sale_record_features one sale at a time,
+    without holding the records of all the sales in memory.
+    """
     sales = CourseRegistrationCodeInvoiceItem.objects.select_related('invoice').filter(course_id=course_id)
+    sale_features = [x for x in SALE_FEATURES if x in features]
+    course_reg_features = [x for x in COURSE_REGISTRATION_FEATURES if x in features]
 
-    def sale_records_info(sale, features):
+    def sale_records_info(sale):
         """
         Convert sales records to dictionary
 
         """
         invoice = sale.invoice
-        sale_features = [x for x in SALE_FEATURES if x in features]
-        course_reg_features = [x for x in COURSE_REGISTRATION_FEATURES if x in features]
 
         # Extracting sale information
         sale_dict = dict((feature, getattr(invoice, feature))
                          for feature in sale_features)
 
+        reg_codes = sale.courseregistrationcode_set.all()
+        codes = list(reg_codes.values_list('code', flat=True))
         total_used_codes = RegistrationCodeRedemption.objects.filter(
-            registration_code__in=sale.courseregistrationcode_set.all()
+            registration_code__in=reg_codes
         ).count()
         sale_dict.update({"invoice_number": getattr(invoice, 'id')})
-        sale_dict.update({"total_codes": sale.courseregistrationcode_set.all().count()})
+        sale_dict.update({"total_codes": len(codes)})
         sale_dict.update({'total_used_codes': total_used_codes})
 
-        codes = [reg_code.code for reg_code in sale.courseregistrationcode_set.all()]
-
         # Extracting registration code information
-        obj_course_reg_code = sale.courseregistrationcode_set.all()[:1].get()
+        obj_course_reg_code = reg_codes.select_related('created_by')[:1].get()
         course_reg_dict = dict((feature, getattr(obj_course_reg_code, feature))
                                for feature in course_reg_features)
 
@@ -154,7 +163,8 @@ def sale_record_features(course_id, features):
 
         return sale_dict
 
-    return [sale_records_info(sale, features) for sale in sales]
+    for sale in sales.iterator():
+        yield sale_records_info(sale)
 
 
 def enrolled_students_features(course_key, features):
@@ -168,6 +178,14 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Generate the student features of enrolled_students_features one student
+    at a time, without holding the records of all the students in memory.
+    """
     include_cohort_column = 'cohort' in features
 
     students = User.objects.filter(
@@ -175,23 +193,30 @@ def enrolled_students_features(course_key, features):
         courseenrollment__is_active=1,
     ).order_by('username').select_related('profile')
 
+    # prefetch_related() doesn't apply to iterator(), so the cohort of every
+    # student is read with a single query instead.
+    cohort_names = {}
     if include_cohort_column:
-        students = students.prefetch_related('course_groups')
-
-    def extract_student(student, features):
+        memberships = CourseUserGroup.users.through.objects.filter(
+            courseusergroup__course_id=course_key
+        ).values_list('user_id', 'courseusergroup__name')
+        for user_id, cohort_name in memberships:
+            cohort_names.setdefault(user_id, cohort_name)
+
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = []
+    for feature in features:
+        if 'meta.' in feature:
+            meta_key = feature.split('.')[1]
+            meta_features.append((feature, meta_key))
+
+    def extract_student(student):
         """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
         student_dict = dict((feature, getattr(student, feature))
                             for feature in student_features)
         profile = student.profile
@@ -201,21 +226,17 @@ def enrolled_students_features(course_key, features):
             student_dict.update(profile_dict)
 
             # now featch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
+            if meta_features:
+                meta_dict = json.loads(profile.meta) if profile.meta else {}
+                for meta_feature, meta_key in meta_features:
+                    student_dict[meta_feature] = meta_dict.get(meta_key)
 
         if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
+            student_dict['cohort'] = cohort_names.get(student.id, "[unassigned]")
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    for student in students.iterator():
+        yield extract_student(student)
 
 
 def list_may_enroll(course_key, features):
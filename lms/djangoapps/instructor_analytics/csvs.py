@@ -31,6 +31,45 @@ def create_csv_response(filename, header, datarows):
     return response
 
 
+class _EchoBuffer(object):
+    """
+    A file-like object whose write() returns what it is given, so that a csv
+    writer produces each formatted row rather than storing it.
+    """
+    def write(self, value):
+        """ Return `value` instead of storing it """
+        return value
+
+
+def create_streaming_csv_response(filename, header, datarows):
+    """
+    Create an HttpResponse with an attached .csv file, whose rows are
+    formatted one at a time as the response is sent.
+
+    Takes the same arguments as create_csv_response, but `datarows` can be
+    any iterable, such as a generator reading the rows from the database,
+    so that the whole file is never held in memory.
+    """
+    csvwriter = csv.writer(
+        _EchoBuffer(),
+        dialect='excel',
+        quotechar='"',
+        quoting=csv.QUOTE_ALL)
+
+    def csv_lines():
+        """ Generate the formatted lines of the csv file """
+        yield csvwriter.writerow(header)
+        for datarow in datarows:
+            yield csvwriter.writerow([unicode(s).encode('utf-8') for s in datarow])
+
+    # Django 1.4 sends an HttpResponse built from an iterator as it iterates,
+    # as long as no middleware reads its content.
+    response = HttpResponse(csv_lines(), mimetype='text/csv')
+    response['Content-Disposition'] = 'attachment; filename={0}'\
+        .format(filename)
+    return response
+
+
 def format_dictlist(dictlist, features):
     """
     Convert a list of dictionaries to be compatible with create_csv_response
@@ -64,19 +103,23 @@ def format_dictlist(dictlist, features):
     }
     """
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
-
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = list(iter_dictlist_rows(dictlist, features))
 
     return header, datarows
 
 
+def iter_dictlist_rows(dictlist, features):
+    """
+    Generate the datarows of format_dictlist one at a time.
+
+    `dictlist` can be any iterable of dictionaries, such as a generator, so
+    that the rows of a large export are formatted as they are written out.
+    """
+    for dct in dictlist:
+        yield [dct[feature] for feature in features if feature in dct]
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
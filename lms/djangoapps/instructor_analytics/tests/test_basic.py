@@ -15,6 +15,7 @@ from shoppingcart.models import (
 from course_modes.models import CourseMode
 from instructor_analytics.basic import (
     sale_record_features, sale_order_record_features, enrolled_students_features,
+    iter_enrolled_students_features,
     course_registration_features, coupon_codes_features, list_may_enroll,
     AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES
 )
@@ -71,6 +72,16 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             self.assertIn(userreport['email'], [user.email for user in self.users])
             self.assertIn(userreport['name'], [user.profile.name for user in self.users])
 
+    def test_iter_enrolled_students_features(self):
+        query_features = ('username', 'email')
+        first_user = min(self.users, key=lambda user: user.username)
+        userreports = iter_enrolled_students_features(self.course_key, query_features)
+        self.assertEqual(next(userreports), {'username': first_user.username, 'email': first_user.email})
+        self.assertEqual(
+            [userreport['username'] for userreport in userreports],
+            sorted(user.username for user in self.users)[1:]
+        )
+
     def test_enrolled_students_meta_features_keys(self):
         """
         Assert that we can query individual fields in the 'meta' field in the UserProfile
@@ -101,9 +112,9 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
 
         query_features = ('username', 'cohort')
         # There should be a constant of 2 SQL queries when calling
-        # enrolled_students_features.  The first query comes from the call to
-        # User.objects.filter(...), and the second comes from
-        # prefetch_related('course_groups').
+        # enrolled_students_features.  The first query reads the cohort of
+        # every student, and the second comes from the call to
+        # User.objects.filter(...).
         with self.assertNumQueries(2):
             userreports = enrolled_students_features(course.id, query_features)
         self.assertEqual(len([r for r in userreports if r['username'] in cohorted_usernames]), len(cohorted_students))
@@ -3,7 +3,9 @@
 from django.test import TestCase
 from nose.tools import raises
 
-from instructor_analytics.csvs import create_csv_response, format_dictlist, format_instances
+from instructor_analytics.csvs import (
+    create_csv_response, create_streaming_csv_response, format_dictlist, format_instances, iter_dictlist_rows
+)
 
 
 class TestAnalyticsCSVS(TestCase):
@@ -36,6 +38,15 @@ class TestAnalyticsCSVS(TestCase):
         self.assertEqual(res['Content-Disposition'], 'attachment; filename={0}'.format('robot.csv'))
         self.assertEqual(res.content.strip(), '')
 
+    def test_create_streaming_csv_response(self):
+        header = ['Name', 'Email']
+        datarows = [['Jim', 'jim@edy.org'], ['Jake', 'jake@edy.org'], [u'J\xe9r\xf4me', 'jerome@edy.org']]
+
+        res = create_streaming_csv_response('robot.csv', header, (row for row in datarows))
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertEqual(res['Content-Disposition'], 'attachment; filename={0}'.format('robot.csv'))
+        self.assertEqual(res.content, create_csv_response('robot.csv', header, datarows).content)
+
 
 class TestAnalyticsFormatDictlist(TestCase):
     """ Test format_dictlist method """
@@ -66,6 +77,12 @@ class TestAnalyticsFormatDictlist(TestCase):
         self.assertEqual(header, ideal_header)
         self.assertEqual(datarows, ideal_datarows)
 
+    def test_iter_dictlist_rows(self):
+        dictlist = ({'label1': 'value-{},1'.format(i), 'label2': 'value-{},2'.format(i)} for i in xrange(2))
+        datarows = iter_dictlist_rows(dictlist, ['label2', 'label1'])
+        self.assertEqual(next(datarows), ['value-0,2', 'value-0,1'])
+        self.assertEqual(list(datarows), [['value-1,2', 'value-1,1']])
+
     def test_format_dictlist_empty(self):
         header, datarows = format_dictlist([], [])
         self.assertEqual(header, [])
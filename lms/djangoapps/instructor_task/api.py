@@ -26,6 +26,7 @@ from instructor_task.tasks import (
     calculate_may_enroll_csv,
     exec_summary_report_csv,
     generate_certificates,
+    calculate_credit_eligibility,
 )
 
 from instructor_task.api_helper import (
@@ -434,3 +435,17 @@ def generate_certificates_for_all_students(request, course_key):   # pylint: dis
     task_key = ""
 
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_calculate_credit_eligibility(request, course_key):
+    """
+    Submits a task to update the credit eligibility of all students enrolled in the course.
+
+    Raises AlreadyRunningError if the credit eligibility is already being updated.
+    """
+    task_type = 'calculate_credit_eligibility'
+    task_class = calculate_credit_eligibility
+    task_input = {}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
@@ -23,6 +23,8 @@ SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
+# Number of primary keys read per query when splitting items into subtasks.
+KEYSET_PAGE_SIZE = 10000
 
 
 class DuplicateTaskException(Exception):
@@ -30,22 +32,6 @@ class DuplicateTaskException(Exception):
     pass
 
 
-def _get_number_of_subtasks(total_num_items, items_per_task):
-    """
-    Determines number of subtasks that would be generated by _generate_items_for_subtask.
-
-    This needs to be calculated before the query is executed so that the list of all subtasks can be
-    stored in the InstructorTask before any subtasks are started.
-
-    The number of subtask_id values returned by this should match the number of chunks returned
-    by the generate_items_for_subtask generator.
-    """
-    num_subtasks, remainder = divmod(total_num_items, items_per_task)
-    if remainder:
-        num_subtasks += 1
-    return num_subtasks
-
-
 @contextmanager
 def track_memory_usage(metric, course_id):
     """
@@ -69,12 +55,57 @@ def track_memory_usage(metric, course_id):
         )
 
 
+def _get_subtask_segments(item_querysets, items_per_task):
+    """
+    Splits the "items" of `item_querysets` into the chunks to pass to subtasks.
+
+    The primary keys of the items are read in order, KEYSET_PAGE_SIZE at a time,
+    each page starting after the last key of the previous one, so that neither
+    a count nor an OFFSET scan of the querysets is needed.
+
+    Arguments:
+        `item_querysets` : a list of query sets, each of which defines the "items" that should be passed to subtasks.
+        `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
+
+    Returns:  a tuple of the list of the segments of each subtask, and the total number of items.
+        A segment is a list of the index of a query set in `item_querysets` and of the first
+        and last primary keys of the items of the subtask in that query set.
+    """
+    subtask_segments = []
+    segments = []
+    num_items_for_task = 0
+    total_num_items = 0
+
+    for index, queryset in enumerate(item_querysets):
+        keys = queryset.order_by('pk').values_list('pk', flat=True)
+        last_key = None
+        while True:
+            page_keys = keys if last_key is None else keys.filter(pk__gt=last_key)
+            page = list(page_keys[:KEYSET_PAGE_SIZE])
+            for key in page:
+                if num_items_for_task == items_per_task:
+                    subtask_segments.append(segments)
+                    segments = []
+                    num_items_for_task = 0
+                if segments and segments[-1][0] == index:
+                    segments[-1][2] = key
+                else:
+                    segments.append([index, key, key])
+                num_items_for_task += 1
+            total_num_items += len(page)
+            if len(page) < KEYSET_PAGE_SIZE:
+                break
+            last_key = page[-1]
+
+    if segments:
+        subtask_segments.append(segments)
+    return subtask_segments, total_num_items
+
+
 def _generate_items_for_subtask(
     item_querysets,  # pylint: disable=bad-continuation
     item_fields,
-    total_num_items,
-    items_per_task,
-    total_num_subtasks,
+    subtask_segments,
     course_id,
 ):
     """
@@ -84,45 +115,28 @@ def _generate_items_for_subtask(
         `item_querysets` : a list of query sets, each of which defines the "items" that should be passed to subtasks.
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
-        `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
-        `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
+        `subtask_segments` : the segments of the items of each subtask, as returned by _get_subtask_segments().
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
 
     Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
 
-    Warning:  if the algorithm here changes, the _get_number_of_subtasks() method should similarly be changed.
+    The items of each subtask are read with a range query on the primary keys of each of its segments.
     """
-    num_items_queued = 0
     all_item_fields = list(item_fields)
     all_item_fields.append('pk')
-    num_subtasks = 0
-
-    items_for_task = []
 
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
-        for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
-                if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
-                    yield items_for_task
-                    num_items_queued += items_per_task
-                    items_for_task = []
-                    num_subtasks += 1
-                items_for_task.append(item)
-
-        # yield remainder items for task, if any
-        if items_for_task:
+        for num_subtask, segments in enumerate(subtask_segments):
+            items_for_task = []
+            for num_segment, (index, first_key, last_key) in enumerate(segments):
+                queryset = item_querysets[index].filter(pk__gte=first_key)
+                # Items added since the segments were computed have greater keys: the
+                # last subtask takes those of the last query set.
+                is_last = num_subtask == len(subtask_segments) - 1 and num_segment == len(segments) - 1
+                if not is_last:
+                    queryset = queryset.filter(pk__lte=last_key)
+                items_for_task.extend(queryset.order_by('pk').values(*all_item_fields))
             yield items_for_task
-            num_items_queued += len(items_for_task)
-
-    # Note, depending on what kind of DB is used, it's possible for the queryset
-    # we iterate over to change in the course of the query. Therefore it's
-    # possible that there are more (or fewer) items queued than were initially
-    # calculated. It also means it's possible that the last task contains
-    # more items than items_per_task allows. We expect this to be a small enough
-    # number as to be negligible.
-    if num_items_queued != total_num_items:
-        TASK_LOG.info("Number of items generated by chunking %s not equal to original total %s", num_items_queued, total_num_items)
 
 
 class SubtaskStatus(object):
@@ -283,7 +297,7 @@ def queue_subtasks_for_query(
     item_querysets,
     item_fields,
     items_per_task,
-    total_num_items,
+    total_num_items=None,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -298,15 +312,22 @@ def queue_subtasks_for_query(
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
-        `total_num_items` : total amount of items that will be put into subtasks
+        `total_num_items` : expected number of items, if known.  The items are counted while
+            they are split into chunks, so this is only used to log a discrepancy.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
     """
     task_id = entry.task_id
 
-    # Calculate the number of tasks that will be created, and create a list of ids for each task.
-    total_num_subtasks = _get_number_of_subtasks(total_num_items, items_per_task)
+    # Split the items into subtasks, and create a list of ids for each subtask.
+    subtask_segments, num_items = _get_subtask_segments(item_querysets, items_per_task)
+    if total_num_items is not None and num_items != total_num_items:
+        TASK_LOG.info(
+            "Number of items generated by chunking %s not equal to original total %s", num_items, total_num_items
+        )
+    total_num_items = num_items
+    total_num_subtasks = len(subtask_segments)
     subtask_id_list = [str(uuid4()) for _ in range(total_num_subtasks)]
 
     # Update the InstructorTask  with information about the subtasks we've defined.
@@ -324,9 +345,7 @@ def queue_subtasks_for_query(
     item_list_generator = _generate_items_for_subtask(
         item_querysets,
         item_fields,
-        total_num_items,
-        items_per_task,
-        total_num_subtasks,
+        subtask_segments,
         entry.course_id,
     )
 
@@ -338,13 +357,23 @@ def queue_subtasks_for_query(
         total_num_items,
     )
     num_subtasks = 0
+    num_items_queued = 0
     for item_list in item_list_generator:
         subtask_id = subtask_id_list[num_subtasks]
         num_subtasks += 1
+        num_items_queued += len(item_list)
         subtask_status = SubtaskStatus.create(subtask_id)
         new_subtask = create_subtask_fcn(item_list, subtask_status)
         new_subtask.apply_async()
 
+    # Note, items may be added to or removed from the querysets after they were
+    # split into subtasks. Therefore it's possible that there are more (or fewer)
+    # items queued than were initially counted. It also means it's possible that
+    # the last task contains more items than items_per_task allows. We expect this
+    # to be a small enough number as to be negligible.
+    if num_items_queued != total_num_items:
+        TASK_LOG.info("Number of items queued %s not equal to original total %s", num_items_queued, total_num_items)
+
     # Subtasks have been queued so no exceptions should be raised after this point.
 
     # Return the task progress as stored in the InstructorTask object.
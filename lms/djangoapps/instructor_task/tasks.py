@@ -42,6 +42,7 @@ from instructor_task.tasks_helper import (
     upload_may_enroll_csv,
     upload_exec_summary_report,
     generate_students_certificates,
+    update_credit_eligibility,
 )
 
 
@@ -242,6 +243,22 @@ def generate_certificates(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_credit_eligibility(entry_id, xmodule_instance_args):
+    """
+    Grade students and update their credit eligibility in bulk.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('credit eligibility updated')
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, Task type: %s, Preparing for task execution",
+        xmodule_instance_args.get('task_id'), entry_id, action_name
+    )
+
+    task_fn = partial(update_credit_eligibility, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=E1102
 def cohort_students(entry_id, xmodule_instance_args):
     """
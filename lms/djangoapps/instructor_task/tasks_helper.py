@@ -45,13 +45,18 @@ from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features, list_may_enroll
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_enrolled_students_features, list_may_enroll
+from instructor_analytics.csvs import format_dictlist, iter_dictlist_rows
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
+from openedx.core.djangoapps.credit.api import (
+    get_eligible_usernames,
+    is_credit_course,
+    update_credit_eligibility_for_course,
+)
 from opaque_keys.edx.keys import UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment, CourseAccessRole
@@ -592,8 +597,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     Upload data as a CSV using ReportStore.
 
     Arguments:
-        rows: CSV data in the following format (first column may be a
-            header):
+        rows: CSV data, as a list or any other iterable, in the following
+            format (first column may be a header):
             [
                 [row1_colum1, row1_colum2, ...],
                 ...
@@ -865,8 +870,7 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
     try:
-        course_structure = CourseStructure.objects.get(course_id=course_id)
-        blocks = course_structure.ordered_blocks
+        blocks = CourseStructure.get_ordered_blocks(course_id)
         problems = _order_problems(blocks)
     except CourseStructure.DoesNotExist:
         return task_progress.update_task_state(
@@ -936,21 +940,25 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and format it as it is uploaded, so
+    # that the rows of all the students are never held in memory together
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
+    student_data = iter_enrolled_students_features(course_id, query_features)
 
-    rows.insert(0, header)
+    def counted_rows():
+        """ Generate the rows of the CSV, counting the students """
+        for row in iter_dictlist_rows(student_data, query_features):
+            task_progress.attempted += 1
+            yield row
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
 
     # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    upload_csv_to_report_store(chain([query_features], counted_rows()), 'student_profile_info', course_id, start_date)
+
+    task_progress.succeeded = task_progress.attempted
+    task_progress.skipped = task_progress.total - task_progress.attempted
 
     return task_progress.update_task_state(extra_meta=current_step)
 
@@ -1291,6 +1299,52 @@ def generate_students_certificates(
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def update_credit_eligibility(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    For a given `course_id`, grade every enrolled student who is not yet
+    eligible for credit, then update the minimum grade requirement statuses
+    and the credit eligibility of all of them in bulk.
+    """
+    start_time = time()
+    status_interval = 100
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+
+    if not is_credit_course(course_id):
+        task_progress.skipped = task_progress.total
+        return task_progress.update_task_state(extra_meta={'step': 'Not a credit course'})
+
+    # Students already eligible keep their eligibility, so they needn't be graded.
+    eligible_usernames = get_eligible_usernames(course_id)
+    students = [student for student in enrolled_students if student.username not in eligible_usernames]
+    task_progress.skipped = task_progress.total - len(students)
+
+    # The statuses are updated in bulk below rather than as each student is graded.
+    course = get_course_by_id(course_id)
+    grades = {}
+    current_step = {'step': 'Calculating Grades'}
+    for student, gradeset, __ in iterate_grades_for(course, students, send_grades_updated=False):
+        if task_progress.attempted % status_interval == 0:
+            task_progress.update_task_state(extra_meta=current_step)
+        task_progress.attempted += 1
+
+        if gradeset:
+            grades[student.username] = gradeset['percent']
+            task_progress.succeeded += 1
+        else:
+            task_progress.failed += 1
+
+    current_step = {'step': 'Updating Credit Eligibility'}
+    task_progress.update_task_state(extra_meta=current_step)
+    newly_eligible = update_credit_eligibility_for_course(course_id, grades, course.end)
+    TASK_LOG.info(
+        u'Task type: %s, Course: %s, %d students became eligible for credit',
+        action_name, course_id, len(newly_eligible)
+    )
+
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
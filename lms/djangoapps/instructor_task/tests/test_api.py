@@ -20,6 +20,7 @@ from instructor_task.api import (
     submit_calculate_may_enroll_csv,
     submit_executive_summary_report,
     generate_certificates_for_all_students,
+    submit_calculate_credit_eligibility,
 )
 
 from instructor_task.api_helper import AlreadyRunningError
@@ -247,3 +248,10 @@ class InstructorTaskCourseSubmitTest(TestReportMixin, InstructorTaskCourseTestCa
             self.course.id
         )
         self._test_resubmission(api_call)
+
+    def test_submit_calculate_credit_eligibility(self):
+        api_call = lambda: submit_calculate_credit_eligibility(
+            self.create_task_request(self.instructor),
+            self.course.id
+        )
+        self._test_resubmission(api_call)
@@ -93,6 +93,17 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def test_store_rows(self):
+        report_store = self.create_report_store()
+        rows = ([u'user{}'.format(i), u'caf\xe9'] for i in xrange(3))
+        report_store.store_rows(self.course_id, 'report.csv', rows)
+
+        with open(report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            self.assertEqual(
+                report_file.read(),
+                'user0,caf\xc3\xa9\r\nuser1,caf\xc3\xa9\r\nuser2,caf\xc3\xa9\r\n'
+            )
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
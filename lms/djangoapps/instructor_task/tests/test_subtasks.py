@@ -80,3 +80,38 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    @patch('instructor_task.subtasks.KEYSET_PAGE_SIZE', 2)
+    def test_queue_subtasks_for_query_pages(self):
+        """Test queue_subtasks_for_query() reads the keys of several querysets a page at a time."""
+        self._enroll_students_in_course(self.course.id, 7)
+        enrollments = CourseEnrollment.objects.filter(course_id=self.course.id).order_by('pk')
+        split_key = enrollments[2].pk
+        task_querysets = [enrollments.filter(pk__gt=split_key), enrollments.filter(pk__lte=split_key)]
+        instructor_task = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='bulk_course_email',
+        )
+
+        mock_create_subtask_fcn = Mock()
+        with patch('instructor_task.subtasks.initialize_subtask_info') as mock_initialize_subtask_info:
+            queue_subtasks_for_query(
+                entry=instructor_task,
+                action_name='action_name',
+                create_subtask_fcn=mock_create_subtask_fcn,
+                item_querysets=task_querysets,
+                item_fields=[],
+                items_per_task=3,
+            )
+
+        # The total is counted while splitting the querysets.
+        self.assertEqual(mock_initialize_subtask_info.call_args[0][2], 7)
+        # Subtasks are filled across querysets, each of them in key order.
+        item_lists = [args[0][0] for args in mock_create_subtask_fcn.call_args_list]
+        self.assertEqual([len(item_list) for item_list in item_lists], [3, 3, 1])
+        self.assertEqual(
+            [item['pk'] for item_list in item_lists for item in item_list],
+            [enrollment.pk for enrollment in enrollments[3:]] + [enrollment.pk for enrollment in enrollments[:3]]
+        )
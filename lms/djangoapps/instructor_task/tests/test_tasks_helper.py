@@ -20,6 +20,8 @@ from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin, InstructorTaskModuleTestCase
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.credit import api as credit_api
+from openedx.core.djangoapps.credit.models import CreditCourse
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
 from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
@@ -40,6 +42,7 @@ from instructor_task.tasks_helper import (
     upload_enrollment_report,
     upload_exec_summary_report,
     generate_students_certificates,
+    update_credit_eligibility,
 )
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
 
@@ -1353,3 +1356,58 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             },
             result
         )
+
+
+class TestCreditEligibilityUpdate(InstructorTaskCourseTestCase):
+    """
+    Test that the credit eligibility task updates the students in bulk.
+    """
+    def setUp(self):
+        super(TestCreditEligibilityUpdate, self).setUp()
+        self.initialize_course()
+        CreditCourse.objects.create(course_key=self.course.id, enabled=True)
+        credit_api.set_credit_requirements(self.course.id, [
+            {
+                "namespace": "grade",
+                "name": "grade",
+                "display_name": "Grade",
+                "criteria": {"min_grade": 0.8},
+            },
+        ])
+
+    @patch('instructor_task.tasks_helper._get_current_task')
+    @patch('instructor_task.tasks_helper.iterate_grades_for')
+    def test_update_credit_eligibility(self, mock_iterate_grades_for, _mock_current_task):
+        passing, failing, eligible = [self.create_student('student{}'.format(i)) for i in xrange(3)]
+        credit_api.set_credit_requirement_status(eligible.username, self.course.id, "grade", "grade")
+        mock_iterate_grades_for.return_value = [
+            (passing, {'percent': 0.9}, ''),
+            (failing, {}, 'Cannot grade student'),
+        ]
+
+        result = update_credit_eligibility(None, None, self.course.id, None, 'credit eligibility updated')
+        self.assertDictContainsSubset(
+            {'total': 3, 'attempted': 2, 'succeeded': 1, 'failed': 1, 'skipped': 1},
+            result
+        )
+
+        # Students already eligible are not graded, and the others are graded without
+        # updating their requirement statuses one by one.
+        args, kwargs = mock_iterate_grades_for.call_args
+        self.assertItemsEqual(args[1], [passing, failing])
+        self.assertEqual(kwargs, {'send_grades_updated': False})
+
+        self.assertTrue(credit_api.is_user_eligible_for_credit(passing.username, self.course.id))
+        self.assertFalse(credit_api.is_user_eligible_for_credit(failing.username, self.course.id))
+
+    @patch('instructor_task.tasks_helper._get_current_task')
+    @patch('instructor_task.tasks_helper.iterate_grades_for')
+    def test_not_a_credit_course(self, mock_iterate_grades_for, _mock_current_task):
+        credit_course = CreditCourse.objects.get(course_key=self.course.id)
+        credit_course.enabled = False
+        credit_course.save()
+        self.create_student('student')
+
+        result = update_credit_eligibility(None, None, self.course.id, None, 'credit eligibility updated')
+        self.assertDictContainsSubset({'total': 1, 'attempted': 0, 'skipped': 1}, result)
+        self.assertFalse(mock_iterate_grades_for.called)
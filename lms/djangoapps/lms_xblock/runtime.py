@@ -7,9 +7,12 @@ import xblock.reference.plugins
 
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
 from request_cache.middleware import RequestCache
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 from openedx.core.djangoapps.user_api.course_tag import api as user_course_tag_api
+from openedx.core.lib.xblock_utils import fragment_cache_key
+from xblock.fragment import Fragment
 from xmodule.modulestore.django import modulestore
 from xmodule.services import SettingsService
 from xmodule.library_tools import LibraryToolsService
@@ -209,8 +212,72 @@ class LmsModuleSystem(LmsHandlerUrls, ModuleSystem):  # pylint: disable=abstract
         services['fs'] = xblock.reference.plugins.FSService()
         services['settings'] = SettingsService()
         self.request_token = kwargs.pop('request_token', None)
+        self.fragment_cache_timeout = kwargs.pop('fragment_cache_timeout', 0)
+        self._partition_service = services['partitions']
+        # The cache keys of the fragments being rendered to be cached, by usage id and view
+        self._fragment_cache_misses = {}
         super(LmsModuleSystem, self).__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Renders `block`, serving the output of views which render the same for every
+        learner from the fragment cache when `fragment_cache_timeout` is set. The view
+        isn't called on a hit, but the block wrappers are applied either way.
+        """
+        cache_key = self._fragment_cache_key(block, view_name)
+        if cache_key is None:
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+
+        pods = cache.get(cache_key)
+        if pods is not None:
+            return self.wrap_xblock(block, view_name, Fragment.from_pods(pods), context or {})
+
+        # wrap_xblock caches the output of the view before wrapping it
+        miss = (block.scope_ids.usage_id, view_name)
+        self._fragment_cache_misses[miss] = cache_key
+        try:
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+        finally:
+            self._fragment_cache_misses.pop(miss, None)
+
+    def wrap_xblock(self, block, view, frag, context):
+        """
+        Applies the block wrappers to `frag`, caching it first if it is the output of
+        a view to be cached.
+        """
+        cache_key = self._fragment_cache_misses.pop((block.scope_ids.usage_id, view), None)
+        if cache_key is not None:
+            cache.set(cache_key, frag.to_pods(), self.fragment_cache_timeout)
+        return super(LmsModuleSystem, self).wrap_xblock(block, view, frag, context)
+
+    def _fragment_cache_key(self, block, view_name):
+        """
+        Returns the key of the output of `view_name` of `block` in the fragment cache,
+        or None if it isn't to be cached.
+
+        Only the views which a block reports as rendering the same for every learner are
+        cached, and only for blocks without asides, since these are rendered with the view.
+        """
+        if not self.fragment_cache_timeout:
+            return None
+
+        has_learner_independent_view = getattr(block, 'has_learner_independent_view', None)
+        if has_learner_independent_view is None or not has_learner_independent_view(view_name):
+            return None
+
+        if self.applicable_aside_types(block):
+            return None
+
+        group_access = getattr(block, 'merged_group_access', None) or {}
+        user_groups = {}
+        if group_access:
+            for partition in self._partition_service.course_partitions:
+                if partition.id in group_access:
+                    group = self._partition_service.get_group(partition, assign=False)
+                    user_groups[partition.id] = group.id if group else None
+
+        return fragment_cache_key(block, view_name, user_groups)
+
     def wrap_aside(self, block, aside, view, frag, context):
         """
         Creates a div which identifies the aside, points to the original block,
@@ -14,6 +14,11 @@ from lti_provider.models import GradedAssignment, OutcomeService
 
 log = logging.getLogger("edx.lti_provider")
 
+# The requests session of each LTI consumer, by consumer id. A session keeps a
+# pool of connections to the consumer's outcome service, so that a burst of
+# score updates doesn't open a new connection for each of them.
+_CONSUMER_SESSIONS = {}
+
 
 def store_outcome_parameters(request_params, user, lti_consumer):
     """
@@ -95,6 +100,17 @@ def generate_replace_result_xml(result_sourcedid, score):
     return etree.tostring(xml, xml_declaration=True, encoding='UTF-8')
 
 
+def get_consumer_session(consumer):
+    """
+    Returns the requests session used to send outcomes to the LTI consumer.
+    """
+    session = _CONSUMER_SESSIONS.get(consumer.id)
+    if session is None:
+        session = requests.Session()
+        _CONSUMER_SESSIONS[consumer.id] = session
+    return session
+
+
 def sign_and_send_replace_result(assignment, xml):
     """
     Take the XML document generated in generate_replace_result_xml, and sign it
@@ -115,7 +131,7 @@ def sign_and_send_replace_result(assignment, xml):
     oauth = requests_oauthlib.OAuth1(consumer_key, consumer_secret)
 
     headers = {'content-type': 'application/xml'}
-    response = requests.post(
+    response = get_consumer_session(consumer).post(
         assignment.outcome_service.lis_outcome_service_url,
         data=xml,
         auth=oauth,
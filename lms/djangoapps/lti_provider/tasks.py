@@ -2,6 +2,9 @@
 Asynchronous tasks for the LTI provider app.
 """
 
+from celery.exceptions import MaxRetriesExceededError
+from django.conf import settings
+from django.core.cache import cache
 from django.dispatch import receiver
 import logging
 from requests.exceptions import RequestException
@@ -14,6 +17,71 @@ from lti_provider.views import parse_course_and_usage_keys
 
 log = logging.getLogger("edx.lti_provider")
 
+# How long past the passback delay a pending score survives, so that a passback
+# which was lost by the broker doesn't block the user's passbacks forever.
+PENDING_SCORE_GRACE = 5 * 60
+
+
+def outcome_passback_delay():
+    """
+    Returns the number of seconds during which the score changes of a user on
+    a problem are coalesced into a single outcome passback.
+    """
+    return getattr(settings, 'LTI_OUTCOME_PASSBACK_DELAY', 0)
+
+
+def _pending_score_key(user_id, course_id, usage_id):
+    """
+    Returns the cache key of the latest score of a user on a problem.
+    """
+    return u'lti_provider.pending_score.{}.{}.{}'.format(user_id, course_id, usage_id)
+
+
+def _pending_passback_key(user_id, course_id, usage_id):
+    """
+    Returns the cache key marking a queued passback of a user's score on a problem.
+    """
+    return u'lti_provider.pending_passback.{}.{}.{}'.format(user_id, course_id, usage_id)
+
+
+def _latest_outcome_key(user_id, course_id, usage_id):
+    """
+    Returns the cache key of the score sent by the latest passback queued for a
+    user's score on a problem.
+    """
+    return u'lti_provider.latest_outcome.{}.{}.{}'.format(user_id, course_id, usage_id)
+
+
+def _latest_outcome_timeout():
+    """
+    Returns how long the score of the latest queued passback is remembered: long
+    enough for any earlier passback to have exhausted its retries.
+    """
+    retry_period = settings.LTI_OUTCOME_RETRY_DELAY * 2 ** (settings.LTI_OUTCOME_MAX_RETRIES + 1)
+    return outcome_passback_delay() + retry_period + PENDING_SCORE_GRACE
+
+
+def queue_outcome(points_possible, points_earned, user_id, course_id, usage_id):
+    """
+    Queue the passback of a user's score on a problem, recording it as the
+    latest so that the retries of earlier passbacks don't overwrite it.
+    """
+    cache.set(
+        _latest_outcome_key(user_id, course_id, usage_id),
+        (points_possible, points_earned),
+        _latest_outcome_timeout()
+    )
+    send_outcome.delay(points_possible, points_earned, user_id, course_id, usage_id)
+
+
+def _is_superseded(points_possible, points_earned, user_id, course_id, usage_id):
+    """
+    Returns whether a passback queued after the one sending this score sends
+    a different score.
+    """
+    latest = cache.get(_latest_outcome_key(user_id, course_id, usage_id))
+    return latest is not None and tuple(latest) != (points_possible, points_earned)
+
 
 @receiver(SCORE_CHANGED)
 def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -28,13 +96,17 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
     usage_id = kwargs.get('usage_id', None)
 
     if None not in (points_earned, points_possible, user_id, course_id, user_id):
-        send_outcome.delay(
-            points_possible,
-            points_earned,
-            user_id,
-            course_id,
-            usage_id
-        )
+        delay = outcome_passback_delay()
+        if delay:
+            schedule_outcome(points_possible, points_earned, user_id, course_id, usage_id, delay)
+        else:
+            queue_outcome(
+                points_possible,
+                points_earned,
+                user_id,
+                course_id,
+                usage_id
+            )
     else:
         log.error(
             "Outcome Service: Required signal parameter is None. "
@@ -44,12 +116,74 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
         )
 
 
+def schedule_outcome(points_possible, points_earned, user_id, course_id, usage_id, delay):
+    """
+    Record the latest score of a user on a problem, and queue its passback in
+    `delay` seconds unless one is already waiting.
+
+    Returns whether a passback was queued.
+    """
+    timeout = delay + PENDING_SCORE_GRACE
+    cache.set(_pending_score_key(user_id, course_id, usage_id), (points_possible, points_earned), timeout)
+    if not cache.add(_pending_passback_key(user_id, course_id, usage_id), True, timeout):
+        return False
+
+    send_pending_outcome.apply_async([user_id, course_id, usage_id], countdown=delay)
+    return True
+
+
 @CELERY_APP.task
+def send_pending_outcome(user_id, course_id, usage_id):
+    """
+    Send the latest score recorded by schedule_outcome for a user on a problem.
+    """
+    # Clear the marker before reading the score, so that a score change made
+    # from now on queues a new passback rather than being lost.
+    cache.delete(_pending_passback_key(user_id, course_id, usage_id))
+    score = cache.get(_pending_score_key(user_id, course_id, usage_id))
+    if score is None:
+        log.warning(
+            "Outcome Service: Pending score expired before it was sent. "
+            "User: %s, course: %s, usage: %s",
+            user_id, course_id, usage_id
+        )
+        return
+
+    points_possible, points_earned = score
+    queue_outcome(points_possible, points_earned, user_id, course_id, usage_id)
+
+
+def _is_transient_failure(response):
+    """
+    Returns whether sending an outcome failed in a way which a retry may fix:
+    the consumer couldn't be reached, or it is overloaded or failing.
+    """
+    return response is None or response.status_code == 429 or response.status_code >= 500
+
+
+@CELERY_APP.task(
+    default_retry_delay=settings.LTI_OUTCOME_RETRY_DELAY,
+    max_retries=settings.LTI_OUTCOME_MAX_RETRIES
+)
 def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
     """
     Calculate the score for a given user in a problem and send it to the
     appropriate LTI consumer's outcome service.
+
+    If the consumer can't be reached or fails, the task is retried with an
+    exponential backoff. Replacing a result is idempotent, so the outcomes
+    which were sent successfully are simply sent again. A retry is dropped if
+    a passback of a newer score was queued in the meantime, so that it doesn't
+    overwrite that score.
     """
+    if send_outcome.request.retries and _is_superseded(points_possible, points_earned, user_id, course_id, usage_id):
+        log.info(
+            "Outcome Service: Dropping retry superseded by a newer score. "
+            "User: %s, course: %s, usage: %s",
+            user_id, course_id, usage_id
+        )
+        return
+
     course_key, usage_key = parse_course_and_usage_keys(course_id, usage_id)
     assignments = GradedAssignment.objects.filter(
         user=user_id, course_key=course_key, usage_key=usage_key
@@ -68,6 +202,7 @@ def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
     # is embedded more than once in a single course. This would be a strange
     # course design on the consumer's part, but we handle it by sending update
     # messages for all launches of the content.
+    retry = False
     for assignment in assignments:
         xml = lti_provider.outcomes.generate_replace_result_xml(
             assignment.lis_result_sourcedid, score
@@ -96,3 +231,15 @@ def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
                 response,
                 response.text if response else 'Unknown'
             )
+            retry = retry or _is_transient_failure(response)
+
+    if retry:
+        retries = send_outcome.request.retries
+        try:
+            raise send_outcome.retry(countdown=settings.LTI_OUTCOME_RETRY_DELAY * 2 ** retries)
+        except MaxRetriesExceededError:
+            log.error(
+                "Outcome Service: Giving up updating score on LTI consumer after %s retries. "
+                "User: %s, course: %s, usage: %s",
+                retries, user_id, course_key, usage_key
+            )
@@ -2,9 +2,14 @@
 Tests for the LTI outcome service handlers, both in outcomes.py and in tasks.py
 """
 
+import ddt
+from celery.exceptions import MaxRetriesExceededError, Retry
+from django.conf import settings
 from django.test import TestCase
+from django.test.utils import override_settings
 from lxml import etree
 from mock import patch, MagicMock, ANY
+from requests.exceptions import RequestException
 from student.tests.factories import UserFactory
 
 from lti_provider.models import GradedAssignment, LtiConsumer, OutcomeService
@@ -165,7 +170,7 @@ class SignAndSendReplaceResultTest(TestCase):
         )
         self.assignment.save()
 
-    @patch('requests.post', return_value='response')
+    @patch('requests.Session.post', return_value='response')
     def test_sign_and_send_replace_result(self, post_mock):
         response = outcomes.sign_and_send_replace_result(self.assignment, 'xml')
         post_mock.assert_called_with(
@@ -176,7 +181,19 @@ class SignAndSendReplaceResultTest(TestCase):
         )
         self.assertEqual(response, 'response')
 
+    def test_consumer_session_reused(self):
+        consumer = self.assignment.outcome_service.lti_consumer
+        other_consumer = LtiConsumer.objects.create(
+            consumer_name='other consumer',
+            consumer_key='other_consumer_key',
+            consumer_secret='secret'
+        )
+        session = outcomes.get_consumer_session(consumer)
+        self.assertIs(outcomes.get_consumer_session(consumer), session)
+        self.assertIsNot(outcomes.get_consumer_session(other_consumer), session)
+
 
+@ddt.ddt
 class SendOutcomeTest(TestCase):
     """
     Tests for the send_outcome method in tasks.py
@@ -251,6 +268,119 @@ class SendOutcomeTest(TestCase):
         self.generate_xml_mock.assert_called_once_with('sourcedid', 0.3)
         self.replace_result_mock.assert_called_once_with(self.assignment, 'replace result XML')
 
+    def send_failing_outcome(self, status_code=None):
+        """
+        Send an outcome which the consumer answers with `status_code`, or
+        which can't reach the consumer if `status_code` is None.
+        """
+        if status_code is None:
+            self.replace_result_mock.side_effect = RequestException
+        else:
+            self.replace_result_mock.return_value = MagicMock(status_code=status_code)
+        self.check_result_mock.return_value = False
+        tasks.send_outcome(
+            self.points_possible,
+            self.points_earned,
+            self.user.id,
+            unicode(self.course_key),
+            unicode(self.usage_key)
+        )
+
+    @ddt.data(None, 429, 503)
+    def test_send_outcome_retried(self, status_code):
+        with patch.object(tasks.send_outcome, 'retry', return_value=Retry()) as retry_mock:
+            with self.assertRaises(Retry):
+                self.send_failing_outcome(status_code)
+        retry_mock.assert_called_once_with(countdown=settings.LTI_OUTCOME_RETRY_DELAY)
+
+    def test_send_outcome_not_retried_on_client_error(self):
+        with patch.object(tasks.send_outcome, 'retry') as retry_mock:
+            self.send_failing_outcome(400)
+        self.assertFalse(retry_mock.called)
+
+    def test_send_outcome_gives_up_after_max_retries(self):
+        with patch.object(tasks.send_outcome, 'retry', side_effect=MaxRetriesExceededError):
+            self.send_failing_outcome(503)
+
+    def retry_outcome(self, latest_points_earned):
+        """
+        Run a retry of the outcome task after a passback of `latest_points_earned` was queued.
+        """
+        with patch('lti_provider.tasks.send_outcome.delay'):
+            tasks.queue_outcome(
+                self.points_possible,
+                latest_points_earned,
+                self.user.id,
+                unicode(self.course_key),
+                unicode(self.usage_key)
+            )
+        tasks.send_outcome.push_request(retries=1)
+        self.addCleanup(tasks.send_outcome.pop_request)
+        tasks.send_outcome(
+            self.points_possible,
+            self.points_earned,
+            self.user.id,
+            unicode(self.course_key),
+            unicode(self.usage_key)
+        )
+
+    def test_retry_superseded_by_newer_score(self):
+        self.retry_outcome(self.points_earned + 1)
+        self.assertFalse(self.replace_result_mock.called)
+
+    def test_retry_of_latest_score(self):
+        self.retry_outcome(self.points_earned)
+        self.replace_result_mock.assert_called_once_with(self.assignment, 'replace result XML')
+
+
+@override_settings(LTI_OUTCOME_PASSBACK_DELAY=10)
+class CoalescedOutcomeTest(TestCase):
+    """
+    Tests for the coalescing of score changes into a single outcome passback in tasks.py
+    """
+
+    def setUp(self):
+        super(CoalescedOutcomeTest, self).setUp()
+        self.user = UserFactory.create()
+        self.course_id = u'course-v1:some_org+some_course+some_run'
+        self.usage_id = u'block-v1:some_org+some_course+some_run+type@problem+block@block_id'
+
+    def change_score(self, points_earned):
+        """
+        Send a SCORE_CHANGED signal for the user.
+        """
+        tasks.score_changed_handler(
+            None,
+            points_possible=10,
+            points_earned=points_earned,
+            user_id=self.user.id,
+            course_id=self.course_id,
+            usage_id=self.usage_id,
+        )
+
+    @patch('lti_provider.tasks.send_outcome.delay')
+    @patch('lti_provider.tasks.send_pending_outcome.apply_async')
+    def test_score_changes_coalesced(self, apply_async_mock, send_outcome_mock):
+        self.change_score(3)
+        self.change_score(5)
+        apply_async_mock.assert_called_once_with([self.user.id, self.course_id, self.usage_id], countdown=10)
+        self.assertFalse(send_outcome_mock.called)
+
+        # The latest score is sent, and later score changes queue a new passback
+        tasks.send_pending_outcome(self.user.id, self.course_id, self.usage_id)
+        send_outcome_mock.assert_called_once_with(10, 5, self.user.id, self.course_id, self.usage_id)
+        self.change_score(7)
+        self.assertEqual(apply_async_mock.call_count, 2)
+
+    @override_settings(LTI_OUTCOME_PASSBACK_DELAY=0)
+    @patch('lti_provider.tasks.send_outcome.delay')
+    @patch('lti_provider.tasks.send_pending_outcome.apply_async')
+    def test_score_changes_not_coalesced(self, apply_async_mock, send_outcome_mock):
+        self.change_score(3)
+        self.change_score(5)
+        self.assertFalse(apply_async_mock.called)
+        self.assertEqual(send_outcome_mock.call_count, 2)
+
 
 class XmlHandlingTest(TestCase):
     """
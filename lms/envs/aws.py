@@ -213,6 +213,9 @@ BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_SMTP_CONNECTION_MAX_AGE = ENV_TOKENS.get(
+    'BULK_EMAIL_SMTP_CONNECTION_MAX_AGE', BULK_EMAIL_SMTP_CONNECTION_MAX_AGE
+)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -423,6 +426,9 @@ FILE_UPLOAD_STORAGE_PREFIX = ENV_TOKENS.get('FILE_UPLOAD_STORAGE_PREFIX', FILE_U
 DATABASES = AUTH_TOKENS['DATABASES']
 
 XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
+XQUEUE_HTTP_TIMEOUT = ENV_TOKENS.get('XQUEUE_HTTP_TIMEOUT', XQUEUE_HTTP_TIMEOUT)
+XQUEUE_SUBMISSION_RETRY_DELAY = ENV_TOKENS.get('XQUEUE_SUBMISSION_RETRY_DELAY', XQUEUE_SUBMISSION_RETRY_DELAY)
+XQUEUE_SUBMISSION_MAX_RETRIES = ENV_TOKENS.get('XQUEUE_SUBMISSION_MAX_RETRIES', XQUEUE_SUBMISSION_MAX_RETRIES)
 
 # Get the MODULESTORE from auth.json, but if it doesn't exist,
 # use the one from common.py
@@ -593,10 +599,21 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = ENV_TOKENS.get(
     'COURSE_ABOUT_VISIBILITY_PERMISSION',
     COURSE_ABOUT_VISIBILITY_PERMISSION
 )
+COURSE_OVERVIEW_CACHE_TIMEOUT = ENV_TOKENS.get('COURSE_OVERVIEW_CACHE_TIMEOUT', COURSE_OVERVIEW_CACHE_TIMEOUT)
+COURSE_CATALOG_INDEX_TIMEOUT = ENV_TOKENS.get('COURSE_CATALOG_INDEX_TIMEOUT', COURSE_CATALOG_INDEX_TIMEOUT)
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT
+)
+STATIC_CONTENT_MISSING_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'STATIC_CONTENT_MISSING_CACHE_TIMEOUT', STATIC_CONTENT_MISSING_CACHE_TIMEOUT
+)
 
 
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = ENV_TOKENS.get('ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT', 60)
+ENROLLED_COURSE_IDS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'ENROLLED_COURSE_IDS_CACHE_TIMEOUT', ENROLLED_COURSE_IDS_CACHE_TIMEOUT
+)
 
 # PDF RECEIPT/INVOICE OVERRIDES
 PDF_RECEIPT_TAX_ID = ENV_TOKENS.get('PDF_RECEIPT_TAX_ID', PDF_RECEIPT_TAX_ID)
@@ -676,3 +693,24 @@ ENV_TOKENS.get('CERTIFICATES_STATIC_VERIFY_URL', CERTIFICATES_STATIC_VERIFY_URL)
 if FEATURES.get('ENABLE_LTI_PROVIDER'):
     INSTALLED_APPS += ('lti_provider',)
     AUTHENTICATION_BACKENDS += ('lti_provider.users.LtiBackend', )
+LTI_OUTCOME_PASSBACK_DELAY = ENV_TOKENS.get('LTI_OUTCOME_PASSBACK_DELAY', LTI_OUTCOME_PASSBACK_DELAY)
+LTI_OUTCOME_RETRY_DELAY = ENV_TOKENS.get('LTI_OUTCOME_RETRY_DELAY', LTI_OUTCOME_RETRY_DELAY)
+LTI_OUTCOME_MAX_RETRIES = ENV_TOKENS.get('LTI_OUTCOME_MAX_RETRIES', LTI_OUTCOME_MAX_RETRIES)
+
+##################### StudentModuleHistory #####################
+STUDENT_MODULE_HISTORY_WRITE_MODE = ENV_TOKENS.get(
+    'STUDENT_MODULE_HISTORY_WRITE_MODE', STUDENT_MODULE_HISTORY_WRITE_MODE
+)
+STUDENT_MODULE_HISTORY_BATCH_SIZE = ENV_TOKENS.get(
+    'STUDENT_MODULE_HISTORY_BATCH_SIZE', STUDENT_MODULE_HISTORY_BATCH_SIZE
+)
+STUDENT_MODULE_HISTORY_MAX_DELAY = ENV_TOKENS.get(
+    'STUDENT_MODULE_HISTORY_MAX_DELAY', STUDENT_MODULE_HISTORY_MAX_DELAY
+)
+
+##################### XBlock fragment cache #####################
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = ENV_TOKENS.get('XBLOCK_FRAGMENT_CACHE_TIMEOUT', XBLOCK_FRAGMENT_CACHE_TIMEOUT)
+
+##################### Signed asset URLs #####################
+ASSET_URL_SIGNATURE_TTL = ENV_TOKENS.get('ASSET_URL_SIGNATURE_TTL', ASSET_URL_SIGNATURE_TTL)
+ASSET_URL_SIGNING_KEY = AUTH_TOKENS.get('ASSET_URL_SIGNING_KEY', ASSET_URL_SIGNING_KEY)
@@ -416,6 +416,16 @@ FEATURES = {
 
     # The block types to disable need to be specified in "x block disable config" in django admin.
     'ENABLE_DISABLING_XBLOCK_TYPES': True,
+
+    # Sign course asset URLs at render time so that the content server can
+    # serve locked assets without a session or enrollment lookup.
+    # See ASSET_URL_SIGNATURE_TTL below.
+    'ENABLE_SIGNED_ASSET_URLS': False,
+
+    # Hand XQueue submissions without uploaded files to a Celery task rather
+    # than posting them to the XQueue while the student waits.
+    # See XQUEUE_SUBMISSION_RETRY_DELAY below.
+    'ENABLE_ASYNC_XQUEUE_SUBMISSION': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -430,6 +440,17 @@ GENERATE_PROFILE_SCORES = False
 # Used with XQueue
 XQUEUE_WAITTIME_BETWEEN_REQUESTS = 5  # seconds
 
+# Seconds to wait for each HTTP request to the XQueue, not to be confused with
+# the time a problem waits for the grader's reply.
+XQUEUE_HTTP_TIMEOUT = 30
+
+# Initial delay in seconds used for retrying queued XQueue submissions which
+# could not reach the XQueue. Each further retry waits twice as long.
+XQUEUE_SUBMISSION_RETRY_DELAY = 10
+
+# Maximum number of retries of a queued XQueue submission.
+XQUEUE_SUBMISSION_MAX_RETRIES = 5
+
 
 ############################# SET PATH INFORMATION #############################
 PROJECT_ROOT = path(__file__).abspath().dirname().dirname()  # /edx-platform/lms
@@ -1123,6 +1144,8 @@ TEMPLATE_LOADERS = (
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    # Must come before the session middleware; a no-op unless ENABLE_SIGNED_ASSET_URLS is set
+    'contentserver.middleware.SignedStaticContentServer',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -1168,6 +1191,8 @@ MIDDLEWARE_CLASSES = (
     # 'django.middleware.locale.LocaleMiddleware',
     'django_locale.middleware.LocaleMiddleware',
 
+    # Must come before TransactionMiddleware, to run functions once the request is committed
+    'util.db.RunAfterCommitMiddleware',
     'django.middleware.transaction.TransactionMiddleware',
     # 'debug_toolbar.middleware.DebugToolbarMiddleware',
 
@@ -1187,6 +1212,7 @@ MIDDLEWARE_CLASSES = (
 
     # to redirected unenrolled students to the course info page
     'courseware.middleware.RedirectUnenrolledMiddleware',
+    'courseware.middleware.StudentModuleHistoryMiddleware',
 
     'course_wiki.middleware.WikiAccessMiddleware',
 
@@ -1728,6 +1754,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of seconds a worker keeps its connection to the email backend open,
+# to send the emails of the bulk email subtasks it runs.  Keep this below the
+# idle timeout of the SMTP server.  0 opens a connection for each subtask.
+BULK_EMAIL_SMTP_CONNECTION_MAX_AGE = 0
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2074,6 +2105,35 @@ if FEATURES.get('AUTH_USE_CAS'):
     INSTALLED_APPS += ('django_cas',)
     MIDDLEWARE_CLASSES += ('django_cas.middleware.CASMiddleware',)
 
+############# StudentModuleHistory #################
+
+# How StudentModuleHistory entries are written: 'immediate', 'buffered' or
+# 'celery'. See courseware.history for the durability of each mode.
+STUDENT_MODULE_HISTORY_WRITE_MODE = 'immediate'
+
+# In the 'buffered' and 'celery' modes, the number of buffered entries that
+# triggers a flush, and the number of seconds an entry may wait before it is
+# flushed at the end of a request.
+STUDENT_MODULE_HISTORY_BATCH_SIZE = 100
+STUDENT_MODULE_HISTORY_MAX_DELAY = 0
+
+############# XBlock fragment cache #################
+
+# How long, in seconds, to cache the output of XBlock views which render the same
+# for every learner, such as the student view of html blocks, so that they aren't
+# rendered again. Entries are keyed by block version, view and the learner's user
+# partition groups. The block wrappers still run on every render. 0 disables the cache.
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = 0
+
+############# Signed asset URLs #################
+
+# Lifetime, in seconds, of signed course asset URLs. Signed URLs remain valid
+# for between one and two times this value after they are rendered.
+ASSET_URL_SIGNATURE_TTL = 60 * 10
+
+# Key used to sign asset URLs; SECRET_KEY is used when this is not set.
+ASSET_URL_SIGNING_KEY = None
+
 ############# Cross-domain requests #################
 
 if FEATURES.get('ENABLE_CORS_HEADERS'):
@@ -2424,10 +2484,32 @@ COURSE_CATALOG_VISIBILITY_PERMISSION = 'see_exists'
 # visible. We default this to the legacy permission 'see_exists'.
 COURSE_ABOUT_VISIBILITY_PERMISSION = 'see_exists'
 
+# Number of seconds course overviews, and the course catalog built from them, are
+# kept in the memory of each process. 0 disables this cache, so that every read
+# goes to the database.
+COURSE_OVERVIEW_CACHE_TIMEOUT = 0
+
+# Number of seconds each process keeps the course catalog index it built before
+# building it again. Changes to course overviews rebuild it earlier.
+COURSE_CATALOG_INDEX_TIMEOUT = 5 * 60
+
+# Number of seconds each process keeps the configuration models it reads in
+# memory, in front of the 'configuration' cache. Saving a configuration entry
+# makes every process read it again on its next request. 0 disables this tier.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 60
+
+# Number of seconds the static content server remembers that an asset doesn't exist,
+# rather than looking for it in the contentstore on each request. Uploading the asset
+# from Studio forgets it at once. 0 disables this.
+STATIC_CONTENT_MISSING_CACHE_TIMEOUT = 60
 
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# Number of seconds the set of courses a user is enrolled in is cached between requests.
+# Saving an enrollment invalidates it. 0 caches it for a single request only.
+ENROLLED_COURSE_IDS_CACHE_TIMEOUT = 60
+
 # for Student Notes we would like to avoid too frequent token refreshes (default is 30 seconds)
 if FEATURES['ENABLE_EDXNOTES']:
     OAUTH_ID_TOKEN_EXPIRATION = 60 * 60
@@ -2560,3 +2642,15 @@ CREDIT_PROVIDER_TIMESTAMP_EXPIRATION = 15 * 60
 # not expected to be active; this setting simply allows administrators to
 # route any messages intended for LTI users to a common domain.
 LTI_USER_EMAIL_DOMAIN = 'lti.example.com'
+
+# Number of seconds during which the score changes of a user on a problem
+# launched through the LTI Provider are coalesced into a single outcome
+# passback to the LTI consumer. 0 sends every score change.
+LTI_OUTCOME_PASSBACK_DELAY = 15
+
+# Initial delay in seconds used for retrying failed outcome passbacks.
+# Each further retry waits twice as long.
+LTI_OUTCOME_RETRY_DELAY = 30
+
+# Maximum number of retries of a failed outcome passback.
+LTI_OUTCOME_MAX_RETRIES = 5
@@ -305,6 +305,26 @@ GIT_REPO_DIR = TEST_ROOT / "course_repos"
 CELERY_ALWAYS_EAGER = True
 CELERY_RESULT_BACKEND = 'djcelery.backends.cache:CacheBackend'
 
+########################### COURSE CATALOG ###############################
+
+# Tests roll back the course overviews the catalog index is built from.
+COURSE_CATALOG_INDEX_TIMEOUT = 0
+
+########################### CONFIGURATION MODELS ###############################
+
+# Tests roll back the configuration entries kept in memory.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 0
+
+########################### ENROLLMENTS ###############################
+
+# Tests roll back the enrollments whose course ids would be cached.
+ENROLLED_COURSE_IDS_CACHE_TIMEOUT = 0
+
+########################### STATIC CONTENT ###############################
+
+# Tests add assets which earlier requests found missing.
+STATIC_CONTENT_MISSING_CACHE_TIMEOUT = 0
+
 ######################### MARKETING SITE ###############################
 
 MKTG_URL_LINK_MAP = {
@@ -494,3 +514,4 @@ PROFILE_IMAGE_MIN_BYTES = 100
 FEATURES['ENABLE_LTI_PROVIDER'] = True
 INSTALLED_APPS += ('lti_provider',)
 AUTHENTICATION_BACKENDS += ('lti_provider.users.LtiBackend',)
+LTI_OUTCOME_PASSBACK_DELAY = 0
@@ -0,0 +1,100 @@
+"""
+Precomputed index of the course catalog.
+
+The index holds the overview of every course, sorted by course number, along
+with the other orderings the catalog offers and the courses of each org, so
+that listing the catalog doesn't mean sorting and partitioning every course
+on each request.
+
+Each process builds the index at most once per COURSE_CATALOG_INDEX_TIMEOUT
+seconds, and again as soon as a course overview changes in any process; 0
+rebuilds it on every call.
+"""
+from collections import defaultdict
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Changed each time an overview changes, so that every process rebuilds its index.
+INDEX_TOKEN_KEY = 'course_overviews.catalog_index.token'
+INDEX_TOKEN_TIMEOUT = 60 * 60 * 24
+
+# (token, build time, CatalogIndex) of the index built by this process
+_PROCESS_INDEX = [None]
+
+
+class CatalogIndex(object):
+    """
+    The course overviews of the catalog, with their orderings and org partitions.
+
+    Attributes:
+        courses (tuple of CourseOverview): all the courses, sorted by number
+        by_org (dict): maps each org to the tuple of its courses, sorted by number
+        announcement_ranks (dict): maps each course id to its rank when the
+            newest courses come first; see CourseDescriptor.sorting_score
+        start_date_ranks (dict): maps each course id to its rank when courses
+            which haven't ended come first, latest start first
+    """
+    def __init__(self, courses):
+        self.courses = tuple(sorted(courses, key=lambda course: course.number))
+
+        by_org = defaultdict(list)
+        for course in self.courses:
+            by_org[course.org].append(course)
+        self.by_org = {org: tuple(org_courses) for org, org_courses in by_org.iteritems()}
+
+        self.announcement_ranks = self._ranks(sorted(self.courses, key=lambda course: course.sorting_score))
+        self.start_date_ranks = self._ranks(sorted(
+            self.courses,
+            key=lambda course: (course.has_ended(), course.start is None, course.start)
+        ))
+
+    @staticmethod
+    def _ranks(courses):
+        """
+        Returns a dict mapping the id of each of `courses` to its position.
+        """
+        return {course.id: rank for rank, course in enumerate(courses)}
+
+    def courses_of_org(self, org):
+        """
+        Returns the courses of `org`, sorted by number.
+        """
+        return self.by_org.get(org, ())
+
+
+def catalog_index_timeout():
+    """
+    Returns the number of seconds a process keeps using the index it built.
+    """
+    return getattr(settings, 'COURSE_CATALOG_INDEX_TIMEOUT', 0)
+
+
+def invalidate_catalog_index():
+    """
+    Makes every process rebuild its catalog index on its next use.
+    """
+    cache.set(INDEX_TOKEN_KEY, uuid.uuid4().hex, INDEX_TOKEN_TIMEOUT)
+    _PROCESS_INDEX[0] = None
+
+
+def get_catalog_index():
+    """
+    Returns the CatalogIndex of all the course overviews.
+    """
+    # Imported here to avoid a circular import, since the model invalidates the index.
+    from .models import CourseOverview
+
+    token = cache.get(INDEX_TOKEN_KEY)
+    now = time.time()
+    built = _PROCESS_INDEX[0]
+    if built is not None:
+        built_token, built_at, index = built
+        if built_token == token and now - built_at < catalog_index_timeout():
+            return index
+
+    index = CatalogIndex(CourseOverview.get_all_courses())
+    _PROCESS_INDEX[0] = (token, now, index)
+    return index
@@ -3,18 +3,31 @@ Declaration of CourseOverview model
 """
 
 import json
+from datetime import datetime
 
 import django.db.models
-from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField
+from django.conf import settings
+from django.db.models.fields import (
+    BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, NullBooleanField, TextField
+)
+from django.utils.timezone import UTC
 from django.utils.translation import ugettext
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from lms.djangoapps.courseware.courses import course_image_url
+from openedx.core.lib.cache_utils import ProcessCache
 from util.date_utils import strftime_localized
 from xmodule import course_metadata_utils
+from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
+from .catalog import invalidate_catalog_index
+
+# Overviews recently read by this process, keyed by course id. See
+# CourseOverview.cache_timeout.
+_PROCESS_CACHE = ProcessCache()
+
 
 class CourseOverview(django.db.models.Model):
     """
@@ -25,9 +38,17 @@ class CourseOverview(django.db.models.Model):
     a course as part of a user dashboard or enrollment API.
     """
 
+    # Bump this whenever fields are added or the way they are computed changes,
+    # so that overviews stored by earlier code get regenerated when loaded.
+    VERSION = 2
+
+    # Version of the code which generated this overview
+    version = IntegerField(default=0)
+
     # Course identification
     id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
     _location = UsageKeyField(max_length=255)
+    org = TextField(default='')
     display_name = TextField(null=True)
     display_number_with_default = TextField()
     display_org_with_default = TextField()
@@ -36,6 +57,7 @@ class CourseOverview(django.db.models.Model):
     start = DateTimeField(null=True)
     end = DateTimeField(null=True)
     advertised_start = TextField(null=True)
+    announcement = DateTimeField(null=True)
 
     # URLs
     course_image_url = TextField()
@@ -57,6 +79,15 @@ class CourseOverview(django.db.models.Model):
     mobile_available = BooleanField()
     visible_to_staff_only = BooleanField()
     _pre_requisite_courses_json = TextField()  # JSON representation of list of CourseKey strings
+    days_early_for_beta = FloatField(null=True)
+    ispublic = NullBooleanField()
+    catalog_visibility = TextField(null=True)
+
+    # Enrollment parameters
+    enrollment_start = DateTimeField(null=True)
+    enrollment_end = DateTimeField(null=True)
+    enrollment_domain = TextField(null=True)
+    invitation_only = BooleanField(default=False)
 
     @staticmethod
     def _create_from_course(course):
@@ -73,8 +104,10 @@ class CourseOverview(django.db.models.Model):
             CourseOverview: overview extracted from the given course
         """
         return CourseOverview(
+            version=CourseOverview.VERSION,
             id=course.id,
             _location=course.location,
+            org=course.location.org,
             display_name=course.display_name,
             display_number_with_default=course.display_number_with_default,
             display_org_with_default=course.display_org_with_default,
@@ -82,6 +115,7 @@ class CourseOverview(django.db.models.Model):
             start=course.start,
             end=course.end,
             advertised_start=course.advertised_start,
+            announcement=course.announcement,
 
             course_image_url=course_image_url(course),
             facebook_url=course.facebook_url,
@@ -97,9 +131,62 @@ class CourseOverview(django.db.models.Model):
 
             mobile_available=course.mobile_available,
             visible_to_staff_only=course.visible_to_staff_only,
-            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses)
+            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses),
+            days_early_for_beta=course.days_early_for_beta,
+            ispublic=course.ispublic,
+            catalog_visibility=course.catalog_visibility,
+
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+            invitation_only=course.invitation_only,
         )
 
+    @staticmethod
+    def cache_timeout():
+        """
+        Returns the number of seconds overviews are cached in process memory,
+        from settings.COURSE_OVERVIEW_CACHE_TIMEOUT; 0 disables that cache.
+        """
+        return getattr(settings, 'COURSE_OVERVIEW_CACHE_TIMEOUT', 0)
+
+    @staticmethod
+    def load_from_module_store(course_id):
+        """
+        Creates and saves the overview of a course from the modulestore.
+
+        Arguments:
+            course_id (CourseKey): the ID of the course to be loaded
+
+        Returns:
+            CourseOverview: overview of the course, or None if the course
+                doesn't exist or can't be loaded
+        """
+        store = modulestore()
+        with store.bulk_operations(course_id):
+            course = store.get_course(course_id)
+            if course is None or isinstance(course, ErrorDescriptor):
+                return None
+            return CourseOverview.update_from_course(course)
+
+    @staticmethod
+    def update_from_course(course):
+        """
+        Creates and saves the overview of the given course, replacing any
+        existing one.
+
+        Arguments:
+            course (CourseDescriptor): any course descriptor object
+
+        Returns:
+            CourseOverview: the saved overview
+        """
+        course_overview = CourseOverview._create_from_course(course)
+        course_overview.save()
+        _PROCESS_CACHE.delete(course_overview.id)
+        invalidate_catalog_index()
+        return course_overview
+
     @staticmethod
     def get_from_id(course_id):
         """
@@ -116,17 +203,87 @@ class CourseOverview(django.db.models.Model):
         Returns:
             CourseOverview: overview of the requested course
         """
-        course_overview = None
-        try:
-            course_overview = CourseOverview.objects.get(id=course_id)
-        except CourseOverview.DoesNotExist:
-            store = modulestore()
-            with store.bulk_operations(course_id):
-                course = store.get_course(course_id)
-                if course:
-                    course_overview = CourseOverview._create_from_course(course)
-                    course_overview.save()  # Save new overview to the cache
-        return course_overview
+        return CourseOverview.get_from_ids([course_id]).get(course_id)
+
+    @staticmethod
+    def get_from_ids(course_ids):
+        """
+        Load the CourseOverview objects for the given course IDs.
+
+        Overviews cached in process memory are used first, then all the
+        others are read from the database with a single query. Only the
+        courses with no overview, or an overview stored by an earlier
+        version of this model, are loaded from the modulestore.
+
+        Arguments:
+            course_ids (iterable of CourseKey): the IDs of the course overviews
+                to be loaded
+
+        Returns:
+            dict: maps each given course ID to its overview, or to None if the
+                course doesn't exist
+        """
+        timeout = CourseOverview.cache_timeout()
+        overviews = {}
+        missing_ids = set()
+        for course_id in course_ids:
+            course_overview = _PROCESS_CACHE.get(course_id)
+            if course_overview is None:
+                missing_ids.add(course_id)
+            else:
+                overviews[course_id] = course_overview
+
+        if missing_ids:
+            stored = {
+                course_overview.id: course_overview
+                for course_overview in CourseOverview.objects.filter(id__in=missing_ids)
+                if course_overview.version >= CourseOverview.VERSION
+            }
+            for course_id in missing_ids:
+                course_overview = stored.get(course_id) or CourseOverview.load_from_module_store(course_id)
+                if course_overview is not None:
+                    _PROCESS_CACHE.set(course_id, course_overview, timeout)
+                overviews[course_id] = course_overview
+
+        return overviews
+
+    @staticmethod
+    def get_all_courses(org=None):
+        """
+        Returns the overviews of all the courses, or of the courses of `org`.
+
+        Only courses which have an overview are returned; overviews are
+        generated on publish, by the generate_course_overview management
+        command and, for the courses which existed before this model, by a
+        data migration. The modulestore is only read to regenerate overviews
+        stored by an earlier version of this model.
+
+        Arguments:
+            org (str): if given, only the courses of this organization are
+                returned
+        """
+        course_overviews = CourseOverview.objects.all()
+        if org:
+            course_overviews = course_overviews.filter(org=org)
+
+        courses = []
+        for course_overview in course_overviews:
+            if course_overview.version < CourseOverview.VERSION:
+                course_overview = CourseOverview.load_from_module_store(course_overview.id)
+                if course_overview is None:
+                    continue
+            courses.append(course_overview)
+        return courses
+
+    @staticmethod
+    def delete_for_course(course_id):
+        """
+        Deletes the overview of the given course, in the database and in the
+        memory of this process.
+        """
+        CourseOverview.objects.filter(id=course_id).delete()
+        _PROCESS_CACHE.delete(course_id)
+        invalidate_catalog_index()
 
     def clean_id(self, padding_char='='):
         """
@@ -178,6 +335,19 @@ class CourseOverview(django.db.models.Model):
         """
         return course_metadata_utils.display_name_with_default(self)
 
+    @property
+    def sorting_score(self):
+        """
+        Returns a number which sorts courses by how "new" they are, the lower
+        the newer; see CourseDescriptor.sorting_score.
+        """
+        return course_metadata_utils.sorting_score(
+            self.start,
+            self.advertised_start,
+            self.announcement,
+            datetime.now(UTC())
+        )
+
     def has_started(self):
         """
         Returns whether the the course has started.
@@ -1,8 +1,12 @@
 """
-Signal handler for invalidating cached course overviews
+Signal handlers for regenerating cached course overviews
 """
 from django.dispatch.dispatcher import receiver
 
+from openedx.core.djangoapps.content.course_structures.publish import (
+    publish_pipeline_enabled,
+    register_publish_builder,
+)
 from xmodule.modulestore.django import SignalHandler
 
 from .models import CourseOverview
@@ -11,7 +15,28 @@ from .models import CourseOverview
 @receiver(SignalHandler.course_published)
 def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
-    Catches the signal that a course has been published in Studio and
-    invalidates the corresponding CourseOverview cache entry if one exists.
+    Catches the signal that a course has been published in Studio and queues
+    the regeneration of the corresponding CourseOverview, so that the next
+    reader doesn't have to load the course.
+
+    The existing overview is kept until it is replaced, so that the course
+    stays in the catalog while its overview is regenerated.
+    """
+    # Import tasks here to avoid a circular import.
+    from .tasks import generate_course_overview
+
+    # The overview is regenerated by the publish pipeline when it is enabled.
+    if publish_pipeline_enabled():
+        return
+
+    # As for course structures, countdown=0 lets the signal emitter finish its
+    # operations before the course is read.
+    generate_course_overview.apply_async([unicode(course_key)], countdown=0)
+
+
+@register_publish_builder
+def update_published_course_overview(course_key, course, published_at):  # pylint: disable=unused-argument
+    """
+    Publish pipeline builder which regenerates the overview of the published course.
     """
-    CourseOverview.objects.filter(id=course_key).delete()
+    CourseOverview.update_from_course(course)
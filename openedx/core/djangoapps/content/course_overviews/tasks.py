@@ -0,0 +1,23 @@
+"""
+Asynchronous tasks for the course_overviews app.
+"""
+import logging
+
+from celery.task import task
+from opaque_keys.edx.keys import CourseKey
+
+from .models import CourseOverview
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.generate_course_overview')
+def generate_course_overview(course_key):
+    """
+    Regenerates and stores the overview of the specified course.
+
+    `course_key` is a unicode string, since CourseKeys are not JSON-serializable.
+    """
+    course_key = CourseKey.from_string(course_key)
+    if CourseOverview.load_from_module_store(course_key) is None:
+        log.warning(u'Course %s was published but could not be loaded', course_key)
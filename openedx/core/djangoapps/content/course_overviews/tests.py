@@ -7,6 +7,7 @@ import itertools
 import pytz
 import math
 
+from django.test.utils import override_settings
 from django.utils import timezone
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
@@ -16,6 +17,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
+from .catalog import get_catalog_index, invalidate_catalog_index
 from .models import CourseOverview
 
 
@@ -82,6 +84,12 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             'display_name_with_default',
             'start_date_is_still_default',
             'pre_requisite_courses',
+            'days_early_for_beta',
+            'ispublic',
+            'catalog_visibility',
+            'enrollment_domain',
+            'invitation_only',
+            'org',
         ]
         for attribute_name in fields_to_test:
             course_value = getattr(course, attribute_name)
@@ -224,7 +232,7 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
 
             # Set mobile_available to False and update the course.
             # This fires a course_published signal, which should be caught in signals.py, which should in turn
-            # delete the corresponding CourseOverview from the cache.
+            # regenerate the corresponding CourseOverview.
             course.mobile_available = False
             with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
                 self.store.update_item(course, ModuleStoreEnum.UserID.test)
@@ -246,6 +254,8 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             mobile_available=True,
             default_store=modulestore_type
         )
+        # Creating the course published it, which generated its overview.
+        CourseOverview.delete_for_course(course.id)
 
         # The first time we load a CourseOverview, it will be a cache miss, so
         # we expect the modulestore to be queried.
@@ -256,3 +266,120 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         # we expect no modulestore queries to be made.
         with check_mongo_calls(0):
             _course_overview_2 = CourseOverview.get_from_id(course.id)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_overview_generated_on_publish(self, modulestore_type):
+        """
+        Tests that publishing a course regenerates its overview, so that
+        loading it doesn't read the modulestore.
+        """
+        course = CourseFactory.create(default_store=modulestore_type)
+        course.display_name = 'Updated Name'
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        with check_mongo_calls(0):
+            course_overview = CourseOverview.get_from_id(course.id)
+        self.assertEqual(course_overview.display_name, 'Updated Name')
+
+    def test_get_from_ids(self):
+        """
+        Tests that the overviews of several courses are loaded with a single
+        query, and that only the missing ones are read from the modulestore.
+        """
+        courses = [CourseFactory.create() for __ in range(3)]
+        course_ids = [course.id for course in courses]
+        CourseOverview.delete_for_course(course_ids[0])
+
+        with check_mongo_calls_range(min_finds=1):
+            overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(
+            {course_id: overview.display_name for course_id, overview in overviews.iteritems()},
+            {course.id: course.display_name for course in courses}
+        )
+
+        with self.assertNumQueries(1):
+            with check_mongo_calls(0):
+                CourseOverview.get_from_ids(course_ids)
+
+    def test_get_from_ids_unknown_course(self):
+        """
+        Tests that courses which don't exist are mapped to None.
+        """
+        course_id = CourseFactory.create().id.replace(run='no_such_run')
+        self.assertEqual(CourseOverview.get_from_ids([course_id]), {course_id: None})
+
+    def test_outdated_version_regenerated(self):
+        """
+        Tests that overviews stored by an earlier version of the model are
+        regenerated when they are loaded.
+        """
+        course = CourseFactory.create()
+        CourseOverview.objects.filter(id=course.id).update(version=CourseOverview.VERSION - 1, invitation_only=True)
+
+        course_overview = CourseOverview.get_from_id(course.id)
+        self.assertFalse(course_overview.invitation_only)
+        self.assertEqual(CourseOverview.objects.get(id=course.id).version, CourseOverview.VERSION)
+
+    @override_settings(COURSE_OVERVIEW_CACHE_TIMEOUT=60)
+    def test_process_cache(self):
+        """
+        Tests that overviews are kept in process memory when enabled, and
+        dropped from it when they are regenerated.
+        """
+        course = CourseFactory.create()
+        CourseOverview.get_from_id(course.id)
+        with self.assertNumQueries(0):
+            CourseOverview.get_from_id(course.id)
+
+        CourseOverview.delete_for_course(course.id)
+        with check_mongo_calls_range(min_finds=1):
+            CourseOverview.get_from_id(course.id)
+        CourseOverview.delete_for_course(course.id)
+
+    def test_get_all_courses(self):
+        """
+        Tests that the course listing reads overviews only, filtered by org.
+        """
+        org_courses = [CourseFactory.create(org='ListedX') for __ in range(2)]
+        CourseFactory.create(org='OtherX')
+
+        with check_mongo_calls(0):
+            courses = CourseOverview.get_all_courses(org='ListedX')
+        self.assertEqual(
+            sorted(course.id for course in courses),
+            sorted(course.id for course in org_courses)
+        )
+        self.assertEqual(len(CourseOverview.get_all_courses()), 3)
+
+
+class CatalogIndexTestCase(ModuleStoreTestCase):
+    """
+    Tests for the course catalog index.
+    """
+    def test_partitions(self):
+        courses = [
+            CourseFactory.create(org='FirstX', number='B'),
+            CourseFactory.create(org='FirstX', number='A'),
+            CourseFactory.create(org='SecondX', number='C'),
+        ]
+        index = get_catalog_index()
+        self.assertEqual([course.number for course in index.courses], ['A', 'B', 'C'])
+        self.assertEqual([course.id for course in index.courses_of_org('FirstX')], [courses[1].id, courses[0].id])
+        self.assertEqual(index.courses_of_org('NoSuchX'), ())
+        self.assertEqual(sorted(index.announcement_ranks.values()), [0, 1, 2])
+        self.assertEqual(sorted(index.start_date_ranks.values()), [0, 1, 2])
+
+    @override_settings(COURSE_CATALOG_INDEX_TIMEOUT=60)
+    def test_reused_until_overviews_change(self):
+        CourseFactory.create()
+        index = get_catalog_index()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog_index(), index)
+
+        # Publishing a course regenerates its overview, which invalidates the index.
+        CourseFactory.create()
+        new_index = get_catalog_index()
+        self.assertIsNot(new_index, index)
+        self.assertEqual(len(new_index.courses), 2)
+        invalidate_catalog_index()
@@ -6,8 +6,8 @@ of the tricky interactions between DRF and the code.
 Most of that information is available by accessing the course objects directly.
 """
 from collections import OrderedDict
-from .serializers import GradingPolicySerializer, CourseStructureSerializer
-from .errors import CourseNotFoundError, CourseStructureNotAvailableError
+from .serializers import AnnotatedBlockSerializer, GradingPolicySerializer, CourseStructureSerializer
+from .errors import BlockNotFoundError, CourseNotFoundError, CourseStructureNotAvailableError
 from openedx.core.djangoapps.content.course_structures import models, tasks
 from util.cache import cache
 from xmodule.modulestore.django import modulestore
@@ -104,6 +104,78 @@ def course_structure(course_key, block_types=None):
     raise CourseStructureNotAvailableError
 
 
+def _ensure_structure_blocks(course_key):
+    """
+    Raises CourseStructureNotAvailableError, after requesting that the course structure be
+    generated, if the course has no denormalized course structure blocks.
+    """
+    if not models.CourseStructureBlock.objects.filter(course_id=course_key).exists():
+        tasks.update_course_structure.delay(unicode(course_key))
+        raise CourseStructureNotAvailableError
+
+
+def course_structure_subtree(course_key, usage_key):
+    """
+    Retrieves the part of the course structure rooted at a block, without loading the rest of the course structure.
+
+    Args:
+        course_key: the CourseKey of the course.
+        usage_key: the UsageKey of the root block of the subtree.
+    Returns:
+        The serialized output of the subtree:
+            * root: The ID of the block the subtree is rooted at.
+
+            * blocks: A dictionary that maps block IDs to the block's information, as
+            in course_structure, along with:
+
+                * parent: The ID of the block's parent, absent for the course itself.
+
+                * depth: The depth of the block in the course, the course being at depth 0.
+
+                * ancestors: The IDs of the block's ancestors, starting with the course.
+
+                * graded_problem_count: The number of graded problems in the block's subtree.
+
+                * video_count: The number of videos in the block's subtree.
+    Raises:
+        CourseStructureNotAvailableError, BlockNotFoundError
+
+    """
+    _ensure_structure_blocks(course_key)
+    try:
+        blocks = models.CourseStructureBlock.get_subtree(course_key, usage_key)
+    except models.CourseStructureBlock.DoesNotExist:
+        raise BlockNotFoundError
+
+    return {
+        'root': unicode(usage_key),
+        'blocks': dict((key, AnnotatedBlockSerializer(block).data) for key, block in blocks.iteritems()),
+    }
+
+
+def course_structure_ancestors(course_key, usage_key):
+    """
+    Retrieves the ancestors of a block, without loading the rest of the course structure.
+
+    Args:
+        course_key: the CourseKey of the course.
+        usage_key: the UsageKey of the block.
+    Returns:
+        The list of the serialized ancestors of the block, starting with the course, with
+        the same information as the blocks returned by course_structure_subtree.
+    Raises:
+        CourseStructureNotAvailableError, BlockNotFoundError
+
+    """
+    _ensure_structure_blocks(course_key)
+    try:
+        ancestors = models.CourseStructureBlock.get_ancestors(course_key, usage_key)
+    except models.CourseStructureBlock.DoesNotExist:
+        raise BlockNotFoundError
+
+    return [AnnotatedBlockSerializer(block).data for block in ancestors]
+
+
 def course_grading_policy(course_key):
     """
     Retrieves the course grading policy.
@@ -9,3 +9,8 @@ class CourseNotFoundError(Exception):
 class CourseStructureNotAvailableError(Exception):
     """ The course structure still needs to be generated. """
     pass
+
+
+class BlockNotFoundError(Exception):
+    """ The block is not in the course structure. """
+    pass
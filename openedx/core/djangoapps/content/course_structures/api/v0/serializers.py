@@ -24,6 +24,14 @@ class BlockSerializer(serializers.Serializer):
     children = serializers.CharField()
 
 
+class AnnotatedBlockSerializer(BlockSerializer):
+    """ Serializer for course structure block along with its position in the course tree. """
+    depth = serializers.IntegerField()
+    ancestors = serializers.CharField()
+    graded_problem_count = serializers.IntegerField()
+    video_count = serializers.IntegerField()
+
+
 class CourseStructureSerializer(serializers.Serializer):
     """ Serializer for course structure. """
     root = serializers.CharField(source='root')
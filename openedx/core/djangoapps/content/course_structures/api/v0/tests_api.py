@@ -1,7 +1,8 @@
 """
 Course Structure api.py tests
 """
-from .api import course_structure
+from .api import course_structure, course_structure_ancestors, course_structure_subtree
+from .errors import BlockNotFoundError
 from openedx.core.djangoapps.content.course_structures.signals import listen_for_course_publish
 from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -147,3 +148,47 @@ class CourseStructureApiTests(ModuleStoreTestCase):
         }
 
         self.assertDictEqual(structure, expected)
+
+    def test_course_structure_subtree(self):
+        """
+        Verify that course_structure_subtree returns the blocks of the subtree only, along with their position.
+        """
+        with self.assertNumQueries(3):
+            subtree = course_structure_subtree(self.course.id, self.sequential.location)
+
+        expected_blocks = self._expected_blocks(get_parent=True)
+        self.assertEqual(subtree['root'], unicode(self.sequential.location))
+        self.assertEqual(
+            set(subtree['blocks']),
+            {unicode(self.sequential.location), unicode(self.vertical.location)} | set(
+                unicode(child.location) for child in self.store.get_item(self.vertical.location).get_children()
+            )
+        )
+        sequential = subtree['blocks'][unicode(self.sequential.location)]
+        self.assertEqual(sequential['depth'], 2)
+        self.assertEqual(sequential['ancestors'], [unicode(self.course.location), unicode(self.chapter.location)])
+        self.assertEqual(sequential['video_count'], 1)
+        for key, block in subtree['blocks'].iteritems():
+            for field, value in expected_blocks[key].iteritems():
+                self.assertEqual(block[field], value)
+
+    def test_course_structure_ancestors(self):
+        """
+        Verify that course_structure_ancestors returns the ancestors of a block, starting with the course.
+        """
+        ancestors = course_structure_ancestors(self.course.id, self.vertical.location)
+        self.assertEqual(
+            [ancestor['id'] for ancestor in ancestors],
+            [unicode(self.course.location), unicode(self.chapter.location), unicode(self.sequential.location)]
+        )
+        self.assertEqual(ancestors[0]['video_count'], 1)
+
+    def test_unknown_block(self):
+        """
+        Verify that requesting a block which isn't in the course structure raises BlockNotFoundError.
+        """
+        unknown = self.course.id.make_usage_key('vertical', 'unknown')
+        with self.assertRaises(BlockNotFoundError):
+            course_structure_subtree(self.course.id, unknown)
+        with self.assertRaises(BlockNotFoundError):
+            course_structure_ancestors(self.course.id, unknown)
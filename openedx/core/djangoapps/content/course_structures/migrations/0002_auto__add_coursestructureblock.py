@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from south.db import db
+from south.v2 import SchemaMigration
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'CourseStructureBlock'
+        db.create_table('course_structures_coursestructureblock', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('xmodule_django.models.CourseKeyField')(max_length=255, db_index=True)),
+            ('usage_key', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('preorder_index', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('subtree_end', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('depth', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('ancestors_json', self.gf('django.db.models.fields.TextField')()),
+            ('graded_problem_count', self.gf('django.db.models.fields.PositiveIntegerField')(default=0)),
+            ('video_count', self.gf('django.db.models.fields.PositiveIntegerField')(default=0)),
+            ('block_json', self.gf('django.db.models.fields.TextField')()),
+        ))
+        db.send_create_signal('course_structures', ['CourseStructureBlock'])
+
+        # Adding unique constraint on 'CourseStructureBlock', fields ['course_id', 'usage_key']
+        db.create_unique('course_structures_coursestructureblock', ['course_id', 'usage_key'])
+
+        # Adding unique constraint on 'CourseStructureBlock', fields ['course_id', 'preorder_index']
+        db.create_unique('course_structures_coursestructureblock', ['course_id', 'preorder_index'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'CourseStructureBlock', fields ['course_id', 'preorder_index']
+        db.delete_unique('course_structures_coursestructureblock', ['course_id', 'preorder_index'])
+
+        # Removing unique constraint on 'CourseStructureBlock', fields ['course_id', 'usage_key']
+        db.delete_unique('course_structures_coursestructureblock', ['course_id', 'usage_key'])
+
+        # Deleting model 'CourseStructureBlock'
+        db.delete_table('course_structures_coursestructureblock')
+
+
+    models = {
+        'course_structures.coursestructure': {
+            'Meta': {'object_name': 'CourseStructure'},
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'unique': 'True', 'max_length': '255', 'db_index': 'True'}),
+            'created': ('model_utils.fields.AutoCreatedField', [], {'default': 'datetime.datetime.now'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('model_utils.fields.AutoLastModifiedField', [], {'default': 'datetime.datetime.now'}),
+            'structure_json': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'})
+        },
+        'course_structures.coursestructureblock': {
+            'Meta': {'unique_together': "(('course_id', 'usage_key'), ('course_id', 'preorder_index'))", 'object_name': 'CourseStructureBlock'},
+            'ancestors_json': ('django.db.models.fields.TextField', [], {}),
+            'block_json': ('django.db.models.fields.TextField', [], {}),
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'depth': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'graded_problem_count': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'preorder_index': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'subtree_end': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'usage_key': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'video_count': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'})
+        }
+    }
+
+    complete_apps = ['course_structures']
@@ -2,6 +2,7 @@ import json
 import logging
 
 from collections import OrderedDict
+from django.db import models, transaction
 from model_utils.models import TimeStampedModel
 
 from util.models import CompressedTextField
@@ -10,6 +11,10 @@ from xmodule_django.models import CourseKeyField
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+# Number of CourseStructureBlocks inserted per query, so that the insert of a
+# large course doesn't exceed the maximum packet size of the database.
+BULK_CREATE_BATCH_SIZE = 500
+
 
 class CourseStructure(TimeStampedModel):
     course_id = CourseKeyField(max_length=255, db_index=True, unique=True, verbose_name='Course ID')
@@ -32,11 +37,29 @@ class CourseStructure(TimeStampedModel):
         """
         Return the blocks in the order with which they're seen in the courseware. Parents are ordered before children.
         """
-        if self.structure:
+        # The whole structure is already loaded along with this row, so traversing it
+        # is cheaper than reading the denormalized CourseStructureBlocks.
+        structure = self.structure
+        if structure:
             ordered_blocks = OrderedDict()
-            self._traverse_tree(self.structure['root'], self.structure['blocks'], ordered_blocks)
+            self._traverse_tree(structure['root'], structure['blocks'], ordered_blocks)
             return ordered_blocks
 
+    @classmethod
+    def get_ordered_blocks(cls, course_key):
+        """
+        Return the blocks of the course structure of course_key as ordered_blocks does,
+        without loading and deserializing the whole structure when its blocks are denormalized.
+
+        Raises CourseStructure.DoesNotExist if the course has no structure.
+        """
+        blocks = CourseStructureBlock.get_ordered_blocks(course_key)
+        if blocks:
+            return blocks
+
+        # Structures saved before blocks were denormalized
+        return cls.objects.get(course_id=course_key).ordered_blocks
+
     def _traverse_tree(self, block, unordered_structure, ordered_blocks, parent=None):
         """
         Traverses the tree and fills in the ordered_blocks OrderedDict with the blocks in
@@ -52,3 +75,159 @@ class CourseStructure(TimeStampedModel):
 
         for child_node in cur_block['children']:
             self._traverse_tree(child_node, unordered_structure, ordered_blocks, parent=block)
+
+    def save(self, *args, **kwargs):
+        super(CourseStructure, self).save(*args, **kwargs)
+        CourseStructureBlock.update_for_structure(self.course_id, self.structure)
+
+
+class CourseStructureBlock(models.Model):
+    """
+    A block of a course structure, denormalized so that the subtree or the ancestors of
+    a block can be read without loading and traversing the whole structure.
+
+    Blocks are numbered in the order with which they're seen in the courseware, so the
+    subtree of a block is the range of blocks from its preorder_index to its subtree_end.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True, verbose_name='Course ID')
+    usage_key = models.CharField(max_length=255)
+
+    preorder_index = models.PositiveIntegerField()
+    # preorder_index of the last block of this block's subtree
+    subtree_end = models.PositiveIntegerField()
+    depth = models.PositiveIntegerField()
+    # usage keys of the block's ancestors, from the root down to its parent
+    ancestors_json = models.TextField()
+
+    # number of blocks of this subtree which are graded problems, and which are videos
+    graded_problem_count = models.PositiveIntegerField(default=0)
+    video_count = models.PositiveIntegerField(default=0)
+
+    # the block as stored in the course structure, along with its parent
+    block_json = models.TextField()
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('course_id', 'usage_key'), ('course_id', 'preorder_index'))
+
+    @property
+    def block(self):
+        """
+        The block as stored in the course structure, with the usage key of its parent, if any, as 'parent'.
+        """
+        return json.loads(self.block_json)
+
+    @property
+    def ancestors(self):
+        """
+        The usage keys of the block's ancestors, from the root down to its parent.
+        """
+        return json.loads(self.ancestors_json)
+
+    def annotated_block(self):
+        """
+        Return the block along with its position in the course tree and its subtree's counts.
+        """
+        block = self.block
+        block.update({
+            'preorder_index': self.preorder_index,
+            'depth': self.depth,
+            'ancestors': self.ancestors,
+            'graded_problem_count': self.graded_problem_count,
+            'video_count': self.video_count,
+        })
+        return block
+
+    @classmethod
+    def get_ordered_blocks(cls, course_key):
+        """
+        Return the blocks of the course as an OrderedDict of usage key to block, in courseware order.
+        """
+        rows = cls.objects.filter(course_id=course_key).order_by('preorder_index')
+        rows = rows.values_list('usage_key', 'block_json')
+        return OrderedDict((usage_key, json.loads(block_json)) for usage_key, block_json in rows)
+
+    @classmethod
+    def get_subtree(cls, course_key, usage_key):
+        """
+        Return the blocks of the subtree rooted at usage_key as an OrderedDict of usage key
+        to annotated block, in courseware order.
+
+        Raises CourseStructureBlock.DoesNotExist if the course structure has no such block.
+        """
+        root = cls.objects.get(course_id=course_key, usage_key=unicode(usage_key))
+        blocks = cls.objects.filter(
+            course_id=course_key,
+            preorder_index__gte=root.preorder_index,
+            preorder_index__lte=root.subtree_end,
+        ).order_by('preorder_index')
+        return OrderedDict((block.usage_key, block.annotated_block()) for block in blocks)
+
+    @classmethod
+    def get_ancestors(cls, course_key, usage_key):
+        """
+        Return the annotated blocks of the ancestors of usage_key, from the root down to its parent.
+
+        Raises CourseStructureBlock.DoesNotExist if the course structure has no such block.
+        """
+        block = cls.objects.get(course_id=course_key, usage_key=unicode(usage_key))
+        ancestors = cls.objects.filter(course_id=course_key, usage_key__in=block.ancestors).order_by('preorder_index')
+        return [ancestor.annotated_block() for ancestor in ancestors]
+
+    @classmethod
+    @transaction.commit_on_success
+    def update_for_structure(cls, course_key, structure):
+        """
+        Replace the denormalized blocks of the course with those of the structure dictionary.
+
+        The blocks are replaced in a single transaction, so that readers never see a
+        partial structure.
+        """
+        cls.objects.filter(course_id=course_key).delete()
+        if structure:
+            cls.objects.bulk_create(cls._denormalize(course_key, structure), batch_size=BULK_CREATE_BATCH_SIZE)
+
+    @classmethod
+    def _denormalize(cls, course_key, structure):
+        """
+        Return the unsaved CourseStructureBlocks of the structure dictionary, in courseware order.
+
+        A block reachable through several parents is only listed under the first of them.
+        """
+        blocks = structure['blocks']
+        rows = []
+        seen = set()
+
+        def visit(usage_key, ancestors):
+            """
+            Append the rows of the subtree rooted at usage_key, and return its graded problem and video counts.
+            """
+            seen.add(usage_key)
+            block = dict(blocks[usage_key])
+            if ancestors:
+                block['parent'] = ancestors[-1]
+            row = cls(
+                course_id=course_key,
+                usage_key=usage_key,
+                preorder_index=len(rows),
+                depth=len(ancestors),
+                ancestors_json=json.dumps(ancestors),
+                block_json=json.dumps(block),
+            )
+            rows.append(row)
+
+            graded_problem_count = int(block.get('block_type') == 'problem' and bool(block.get('graded')))
+            video_count = int(block.get('block_type') == 'video')
+            for child in block.get('children', []):
+                if child in blocks and child not in seen:
+                    child_graded_problem_count, child_video_count = visit(child, ancestors + [usage_key])
+                    graded_problem_count += child_graded_problem_count
+                    video_count += child_video_count
+
+            row.subtree_end = len(rows) - 1
+            row.graded_problem_count = graded_problem_count
+            row.video_count = video_count
+            return graded_problem_count, video_count
+
+        if structure.get('root') in blocks:
+            visit(structure['root'], [])
+        return rows
@@ -0,0 +1,110 @@
+"""
+Coalescing pipeline for the data derived from a published course.
+
+Without the pipeline, each app that derives data from a course (course structures,
+the courseware search index, credit requirements...) listens to course_published
+and queues its own task, which loads the course again. A burst of publishes queues
+a task per app per publish.
+
+When FEATURES['ENABLE_COURSE_PUBLISH_PIPELINE'] is set, those apps register a
+builder with `register_publish_builder` instead. The publishes of a course within
+COURSE_PUBLISH_PIPELINE_DELAY seconds are coalesced into a single task, which loads
+the published course once and hands it to every registered builder.
+"""
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from pytz import UTC
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+# Used when COURSE_PUBLISH_PIPELINE_DELAY is not configured.
+DEFAULT_PIPELINE_DELAY = 30
+
+# How long past the delay a pending marker survives, so that a run which was
+# lost by the broker doesn't block the course's pipeline forever.
+PENDING_MARKER_GRACE = 5 * 60
+
+_BUILDERS = []
+
+
+def publish_pipeline_enabled():
+    """
+    Returns whether course publishes should go through the coalescing pipeline.
+    """
+    return settings.FEATURES.get('ENABLE_COURSE_PUBLISH_PIPELINE', False)
+
+
+def publish_pipeline_delay():
+    """
+    Returns the number of seconds a pipeline run waits for further publishes of the course.
+    """
+    return int(getattr(settings, 'COURSE_PUBLISH_PIPELINE_DELAY', DEFAULT_PIPELINE_DELAY))
+
+
+def register_publish_builder(builder):
+    """
+    Register `builder` to be run on each published course; usable as a decorator.
+
+    The builder is called as `builder(course_key, course, published_at)`, where `course`
+    is the published course loaded to full depth and `published_at` is the time of the
+    first of the coalesced publishes. It runs inside a bulk operation on the course.
+    """
+    if builder not in _BUILDERS:
+        _BUILDERS.append(builder)
+    return builder
+
+
+def _pending_key(course_key):
+    """
+    Returns the cache key marking a pending pipeline run for `course_key`.
+    """
+    return u'course_publish_pipeline.pending.{}'.format(course_key)
+
+
+def schedule_pipeline(course_key):
+    """
+    Queue a pipeline run for `course_key` unless one is already waiting.
+
+    Returns whether a run was queued.
+    """
+    # Imported here to avoid a circular import, since the task module imports this one.
+    from .tasks import run_course_publish_pipeline
+
+    published_at = datetime.now(UTC).isoformat()
+    delay = publish_pipeline_delay()
+    if not cache.add(_pending_key(course_key), published_at, delay + PENDING_MARKER_GRACE):
+        return False
+
+    run_course_publish_pipeline.apply_async([unicode(course_key), published_at], countdown=delay)
+    return True
+
+
+def run_pipeline(course_key, published_at):
+    """
+    Load the published course once and run every registered builder on it.
+
+    A failing builder is logged and doesn't prevent the others from running.
+    """
+    # Clear the marker before loading, so that a publish made while the builders run
+    # queues a new run rather than being folded into this one.
+    cache.delete(_pending_key(course_key))
+
+    store = modulestore()
+    with store.bulk_operations(course_key):
+        with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            course = store.get_course(course_key, depth=None)
+            if course is None:
+                log.warning(u'Course %s was published but could not be loaded', course_key)
+                return
+
+            for builder in _BUILDERS:
+                try:
+                    builder(course_key, course, published_at)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'Publish builder %s failed for course %s', builder.__name__, course_key)
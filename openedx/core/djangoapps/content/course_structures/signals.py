@@ -2,12 +2,27 @@ from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
+from .publish import publish_pipeline_enabled, schedule_pipeline
+
 
 @receiver(SignalHandler.course_published)
 def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     # Import tasks here to avoid a circular import.
     from .tasks import update_course_structure
 
+    # The course structure is rebuilt by the publish pipeline when it is enabled.
+    if publish_pipeline_enabled():
+        return
+
     # Note: The countdown=0 kwarg is set to to ensure the method below does not attempt to access the course
     # before the signal emitter has finished all operations. This is also necessary to ensure all tests pass.
     update_course_structure.apply_async([unicode(course_key)], countdown=0)
+
+
+@receiver(SignalHandler.course_published)
+def schedule_publish_pipeline(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Queue a run of the publish pipeline for the published course, coalescing it with any pending run.
+    """
+    if publish_pipeline_enabled():
+        schedule_pipeline(course_key)
@@ -5,6 +5,7 @@ from celery.task import task
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
+from .publish import register_publish_builder, run_pipeline
 
 log = logging.getLogger('edx.celery.task')
 
@@ -15,47 +16,70 @@ def _generate_course_structure(course_key):
     """
     with modulestore().bulk_operations(course_key):
         course = modulestore().get_course(course_key, depth=None)
-        blocks_stack = [course]
-        blocks_dict = {}
-        while blocks_stack:
-            curr_block = blocks_stack.pop()
-            children = curr_block.get_children() if curr_block.has_children else []
-            key = unicode(curr_block.scope_ids.usage_id)
-            block = {
-                "usage_key": key,
-                "block_type": curr_block.category,
-                "display_name": curr_block.display_name,
-                "children": [unicode(child.scope_ids.usage_id) for child in children]
-            }
-
-            # Retrieve these attributes separately so that we can fail gracefully
-            # if the block doesn't have the attribute.
-            attrs = (('graded', False), ('format', None))
-            for attr, default in attrs:
-                if hasattr(curr_block, attr):
-                    block[attr] = getattr(curr_block, attr, default)
-                else:
-                    log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
-                    block[attr] = default
-
-            blocks_dict[key] = block
-
-            # Add this blocks children to the stack so that we can traverse them as well.
-            blocks_stack.extend(children)
-        return {
-            "root": unicode(course.scope_ids.usage_id),
-            "blocks": blocks_dict
+        return _structure_from_course(course)
+
+
+def _structure_from_course(course):
+    """
+    Generates a course structure dictionary from the loaded `course`.
+    """
+    blocks_stack = [course]
+    blocks_dict = {}
+    while blocks_stack:
+        curr_block = blocks_stack.pop()
+        children = curr_block.get_children() if curr_block.has_children else []
+        key = unicode(curr_block.scope_ids.usage_id)
+        block = {
+            "usage_key": key,
+            "block_type": curr_block.category,
+            "display_name": curr_block.display_name,
+            "children": [unicode(child.scope_ids.usage_id) for child in children]
         }
 
+        # Retrieve these attributes separately so that we can fail gracefully
+        # if the block doesn't have the attribute.
+        attrs = (('graded', False), ('format', None))
+        for attr, default in attrs:
+            if hasattr(curr_block, attr):
+                block[attr] = getattr(curr_block, attr, default)
+            else:
+                log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
+                block[attr] = default
 
-@task(name=u'openedx.core.djangoapps.content.course_structures.tasks.update_course_structure')
-def update_course_structure(course_key):
+        blocks_dict[key] = block
+
+        # Add this blocks children to the stack so that we can traverse them as well.
+        blocks_stack.extend(children)
+    return {
+        "root": unicode(course.scope_ids.usage_id),
+        "blocks": blocks_dict
+    }
+
+
+def _save_course_structure(course_key, structure):
     """
-    Regenerates and updates the course structure (in the database) for the specified course.
+    Stores the course structure dictionary `structure` for the specified course.
     """
     # Import here to avoid circular import.
     from .models import CourseStructure
 
+    structure_json = json.dumps(structure)
+
+    cs, created = CourseStructure.objects.get_or_create(
+        course_id=course_key,
+        defaults={'structure_json': structure_json}
+    )
+
+    if not created:
+        cs.structure_json = structure_json
+        cs.save()
+
+
+@task(name=u'openedx.core.djangoapps.content.course_structures.tasks.update_course_structure')
+def update_course_structure(course_key):
+    """
+    Regenerates and updates the course structure (in the database) for the specified course.
+    """
     # Ideally we'd like to accept a CourseLocator; however, CourseLocator is not JSON-serializable (by default) so
     # Celery's delayed tasks fail to start. For this reason, callers should pass the course key as a Unicode string.
     if not isinstance(course_key, basestring):
@@ -69,13 +93,23 @@ def update_course_structure(course_key):
         log.exception('An error occurred while generating course structure: %s', ex.message)
         raise
 
-    structure_json = json.dumps(structure)
+    _save_course_structure(course_key, structure)
 
-    cs, created = CourseStructure.objects.get_or_create(
-        course_id=course_key,
-        defaults={'structure_json': structure_json}
-    )
 
-    if not created:
-        cs.structure_json = structure_json
-        cs.save()
+@register_publish_builder
+def build_course_structure(course_key, course, published_at):  # pylint: disable=unused-argument
+    """
+    Publish pipeline builder which updates the course structure of the published course.
+    """
+    _save_course_structure(course_key, _structure_from_course(course))
+
+
+@task(name=u'openedx.core.djangoapps.content.course_structures.tasks.run_course_publish_pipeline')
+def run_course_publish_pipeline(course_key, published_at):
+    """
+    Runs the registered publish builders on the specified course.
+
+    `course_key` is a unicode string and `published_at` the ISO 8601 time of the first
+    of the publishes coalesced into this run.
+    """
+    run_pipeline(CourseKey.from_string(course_key), published_at)
@@ -1,11 +1,23 @@
 import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+from mock import patch
+from pytz import UTC
 
 from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
-from openedx.core.djangoapps.content.course_structures.models import CourseStructure
+from openedx.core.djangoapps.content.course_structures import publish
+from openedx.core.djangoapps.content.course_structures.models import CourseStructure, CourseStructureBlock
+from openedx.core.djangoapps.content.course_structures.publish import (
+    register_publish_builder, run_pipeline, schedule_pipeline
+)
 from openedx.core.djangoapps.content.course_structures.signals import listen_for_course_publish
-from openedx.core.djangoapps.content.course_structures.tasks import _generate_course_structure, update_course_structure
+from openedx.core.djangoapps.content.course_structures.tasks import (
+    _generate_course_structure, build_course_structure, update_course_structure
+)
 
 
 class SignalDisconnectTestMixin(object):
@@ -126,6 +138,56 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
 
         self.assertEqual(retrieved_course_structure.ordered_blocks.keys(), in_order_blocks)
 
+        # the denormalized blocks are read in order without loading the structure
+        with self.assertNumQueries(1):
+            ordered_blocks = CourseStructure.get_ordered_blocks(self.course.id)
+        self.assertEqual(ordered_blocks.keys(), in_order_blocks)
+        self.assertEqual(ordered_blocks['d/e/f']['parent'], 'g/h/i')
+
+        # structures saved before blocks were denormalized are traversed
+        CourseStructureBlock.objects.filter(course_id=self.course.id).delete()
+        self.assertEqual(CourseStructure.get_ordered_blocks(self.course.id).keys(), in_order_blocks)
+
+    def test_denormalized_blocks(self):
+        """
+        Saving a CourseStructure denormalizes its blocks, so that subtrees and ancestors can be read directly.
+        """
+        structure = {
+            'root': 'a/b/c',
+            'blocks': {
+                'a/b/c': {'block_type': 'course', 'children': ['g/h/i', 'm/n/o']},
+                'g/h/i': {'block_type': 'sequential', 'graded': True, 'children': ['j/k/l', 'd/e/f']},
+                'j/k/l': {'block_type': 'problem', 'graded': True, 'children': []},
+                'd/e/f': {'block_type': 'video', 'children': []},
+                'm/n/o': {'block_type': 'problem', 'graded': False, 'children': []},
+            }
+        }
+        CourseStructure.objects.create(course_id=self.course.id, structure_json=json.dumps(structure))
+
+        subtree = CourseStructureBlock.get_subtree(self.course.id, 'g/h/i')
+        self.assertEqual(subtree.keys(), ['g/h/i', 'j/k/l', 'd/e/f'])
+        self.assertEqual(subtree['g/h/i']['parent'], 'a/b/c')
+        self.assertEqual(subtree['d/e/f']['depth'], 2)
+        self.assertEqual(subtree['d/e/f']['ancestors'], ['a/b/c', 'g/h/i'])
+
+        root = CourseStructureBlock.get_subtree(self.course.id, 'a/b/c')['a/b/c']
+        self.assertEqual(root['graded_problem_count'], 1)
+        self.assertEqual(root['video_count'], 1)
+
+        self.assertEqual(
+            [block['block_type'] for block in CourseStructureBlock.get_ancestors(self.course.id, 'd/e/f')],
+            ['course', 'sequential']
+        )
+        with self.assertRaises(CourseStructureBlock.DoesNotExist):
+            CourseStructureBlock.get_ancestors(self.course.id, 'x/y/z')
+
+        # saving a new structure replaces the blocks
+        del structure['blocks']['a/b/c']['children'][0]
+        cs = CourseStructure.objects.get(course_id=self.course.id)
+        cs.structure_json = json.dumps(structure)
+        cs.save()
+        self.assertEqual(CourseStructureBlock.get_subtree(self.course.id, 'a/b/c').keys(), ['a/b/c', 'm/n/o'])
+
     def test_block_with_missing_fields(self):
         """
         The generator should continue to operate on blocks/XModule that do not have graded or format fields.
@@ -163,3 +225,55 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         cs = CourseStructure.objects.get(course_id=course_id)
         self.assertEqual(cs.course_id, course_id)
         self.assertEqual(cs.structure, structure)
+
+
+@override_settings(COURSE_PUBLISH_PIPELINE_DELAY=10)
+class CoursePublishPipelineTests(ModuleStoreTestCase):
+    """
+    Tests for the coalescing course publish pipeline.
+    """
+    def setUp(self):
+        super(CoursePublishPipelineTests, self).setUp()
+        self.course = CourseFactory.create()
+        ItemFactory.create(parent=self.course, category='chapter', display_name='Test Section')
+        CourseStructure.objects.all().delete()
+        cache.clear()
+
+    @patch('openedx.core.djangoapps.content.course_structures.tasks.run_course_publish_pipeline.apply_async')
+    def test_publishes_are_coalesced(self, mock_apply_async):
+        self.assertTrue(schedule_pipeline(self.course.id))
+        self.assertFalse(schedule_pipeline(self.course.id))
+        self.assertEqual(mock_apply_async.call_count, 1)
+        args, kwargs = mock_apply_async.call_args
+        self.assertEqual(args[0][0], unicode(self.course.id))
+        self.assertEqual(kwargs, {'countdown': 10})
+
+    @patch('openedx.core.djangoapps.content.course_structures.tasks.run_course_publish_pipeline.apply_async')
+    def test_run_clears_pending_marker(self, mock_apply_async):
+        self.assertTrue(schedule_pipeline(self.course.id))
+        run_pipeline(self.course.id, datetime.now(UTC).isoformat())
+        self.assertTrue(schedule_pipeline(self.course.id))
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+    def test_builders_share_loaded_course(self):
+        loaded = []
+
+        def failing_builder(course_key, course, published_at):  # pylint: disable=unused-argument
+            raise Exception('builder failure')
+
+        def recording_builder(course_key, course, published_at):  # pylint: disable=unused-argument
+            loaded.append(course)
+
+        with patch.object(publish, '_BUILDERS', []):
+            register_publish_builder(failing_builder)
+            register_publish_builder(recording_builder)
+            register_publish_builder(recording_builder)
+            register_publish_builder(build_course_structure)
+            run_pipeline(self.course.id, datetime.now(UTC).isoformat())
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].id, self.course.id)
+        self.assertEqual(
+            CourseStructure.objects.get(course_id=self.course.id).structure,
+            _generate_course_structure(self.course.id)
+        )
@@ -14,6 +14,7 @@ from django.utils.translation import ugettext as _
 
 from courseware import courses
 from eventtracking import tracker
+from openedx.core.lib.cache_utils import request_cached
 from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
 
@@ -491,6 +492,8 @@ def set_course_cohort_settings(course_key, **kwargs):
     """
     fields = {'is_cohorted': bool, 'always_cohort_inline_discussions': bool, 'cohorted_discussions': list}
     course_cohort_settings = get_course_cohort_settings(course_key)
+    # The settings are changed in place, so stop sharing them with the rest of the request.
+    get_course_cohort_settings.invalidate(course_key)
     for field, field_type in fields.items():
         if field in kwargs:
             if not isinstance(kwargs[field], field_type):
@@ -500,9 +503,10 @@ def set_course_cohort_settings(course_key, **kwargs):
     return course_cohort_settings
 
 
+@request_cached()
 def get_course_cohort_settings(course_key):
     """
-    Return cohort settings for a course.
+    Return cohort settings for a course. They are cached for the rest of the request.
 
     Arguments:
         course_key: CourseKey
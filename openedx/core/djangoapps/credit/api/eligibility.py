@@ -5,6 +5,8 @@ whether a user has satisfied those requirements.
 
 import logging
 
+from django.utils import timezone
+
 from openedx.core.djangoapps.credit.exceptions import InvalidCreditRequirements, InvalidCreditCourse
 from openedx.core.djangoapps.credit.models import (
     CreditCourse,
@@ -155,6 +157,17 @@ def is_user_eligible_for_credit(username, course_key):
     return CreditEligibility.is_user_eligible_for_credit(course_key, username)
 
 
+def get_eligible_usernames(course_key):
+    """
+    Returns the set of usernames which are eligible for credit in the given course.
+
+    Args:
+        course_key (CourseKey): The identifier for course
+
+    """
+    return CreditEligibility.get_eligible_usernames(course_key)
+
+
 def get_eligibilities_for_user(username):
     """
     Retrieve all courses for which the user is eligible for credit.
@@ -269,6 +282,122 @@ def set_credit_requirement_status(username, course_key, req_namespace, req_name,
         CreditEligibility.update_eligibility(reqs, username, course_key)
 
 
+def bulk_set_credit_requirement_status(course_key, req_namespace, req_name, statuses):
+    """
+    Update the requirement statuses of many users at once.
+
+    This is the batch counterpart of `set_credit_requirement_status`: the statuses
+    are written with bulk queries, and the users who have now satisfied all the
+    requirements are marked as eligible for credit together.  Users who are
+    already eligible for credit are skipped.
+
+    Args:
+        course_key (CourseKey): Identifier for the course associated with the requirement.
+        req_namespace (str): Namespace of the requirement (e.g. "grade" or "reverification")
+        req_name (str): Name of the requirement (e.g. "grade" or the location of the ICRV XBlock)
+        statuses (dict): Maps usernames to (status, reason) tuples, where status is
+            either "satisfied" or "failed" and reason is a dict.
+
+    Example:
+        >>> bulk_set_credit_requirement_status(
+                CourseKey.from_string("course-v1-edX-DemoX-1T2015"),
+                "grade",
+                "grade",
+                {"staff": ("satisfied", {"final_grade": 0.95}), "ron": ("failed", {})}
+            )
+            ["staff"]
+
+    Returns:
+        list of the usernames which became eligible for credit
+
+    """
+    reqs = CreditRequirement.get_course_requirements(course_key)
+    req_to_update = next((
+        req for req in reqs
+        if req.namespace == req_namespace
+        and req.name == req_name
+    ), None)
+
+    if req_to_update is None:
+        log.error(
+            (
+                u'Could not update credit requirement in course "%s" '
+                u'with namespace "%s" and name "%s" '
+                u'because the requirement does not exist. '
+                u'%d users should have had their status updated.'
+            ),
+            unicode(course_key), req_namespace, req_name, len(statuses)
+        )
+        return []
+
+    eligible_usernames = get_eligible_usernames(course_key)
+    statuses = {
+        username: status_and_reason
+        for username, status_and_reason in statuses.iteritems()
+        if username not in eligible_usernames
+    }
+    CreditRequirementStatus.bulk_set_requirement_statuses(req_to_update, statuses)
+
+    satisfied_usernames = [username for username, (status, __) in statuses.iteritems() if status == "satisfied"]
+    return CreditEligibility.bulk_update_eligibility(reqs, course_key, usernames=satisfied_usernames)
+
+
+def get_min_grade_requirement_status(min_grade, percent, deadline):
+    """
+    Returns the status of the minimum grade requirement for a learner's grade.
+
+    Args:
+        min_grade (float): The minimum grade of the requirement
+        percent (float): The grade of the learner
+        deadline (datetime): Course end date or None
+
+    Returns:
+        A (status, reason) tuple, or None if the learner has neither
+        satisfied nor failed the requirement yet.
+
+    """
+    if percent >= min_grade:
+        return "satisfied", {'final_grade': percent}
+    elif deadline and deadline < timezone.now():
+        return "failed", {}
+    return None
+
+
+def update_credit_eligibility_for_course(course_key, grades, deadline):
+    """
+    Evaluate the credit requirements of all the learners of a course at once.
+
+    The minimum grade requirement statuses are computed from `grades`, and
+    written along with the eligibility of every learner who satisfied all the
+    requirements (including the statuses already recorded for the other
+    requirements, such as in-course reverification) with bulk queries.
+
+    Args:
+        course_key (CourseKey): Identifier for the course
+        grades (dict): Maps usernames to the grade percent of each learner
+        deadline (datetime): Course end date or None
+
+    Returns:
+        list of the usernames which became eligible for credit
+
+    """
+    if not is_credit_course(course_key):
+        return []
+
+    requirement = CreditRequirement.get_course_requirement(course_key, 'grade', 'grade')
+    min_grade = requirement.criteria.get('min_grade') if requirement else None
+    if min_grade is None:
+        return []
+
+    statuses = {}
+    for username, percent in grades.iteritems():
+        status = get_min_grade_requirement_status(min_grade, percent, deadline)
+        if status is not None:
+            statuses[username] = status
+
+    return bulk_set_credit_requirement_status(course_key, 'grade', 'grade', statuses)
+
+
 def get_credit_requirement_status(course_key, username, namespace=None, name=None):
     """ Retrieve the user's status for each credit requirement in the course.
 
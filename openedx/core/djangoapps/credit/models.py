@@ -8,6 +8,7 @@ successful completion of a course on EdX
 
 import datetime
 from collections import defaultdict
+import json
 import logging
 
 import pytz
@@ -27,6 +28,17 @@ from django.utils.translation import ugettext_lazy
 
 log = logging.getLogger(__name__)
 
+# Number of users read, written or inserted by each query of the bulk status updates.
+BULK_QUERY_BATCH_SIZE = 500
+
+
+def _batches(items):
+    """
+    Yields successive slices of the list `items` of BULK_QUERY_BATCH_SIZE elements.
+    """
+    for start in xrange(0, len(items), BULK_QUERY_BATCH_SIZE):
+        yield items[start:start + BULK_QUERY_BATCH_SIZE]
+
 
 class CreditProvider(TimeStampedModel):
     """
@@ -393,6 +405,101 @@ class CreditRequirementStatus(TimeStampedModel):
             requirement_status.reason = reason if reason else {}
             requirement_status.save()
 
+    @classmethod
+    @transaction.commit_on_success
+    def bulk_set_requirement_statuses(cls, requirement, statuses):
+        """
+        Set the statuses of many users for a requirement at once.
+
+        New statuses are inserted with bulk_create, and existing statuses
+        are updated with one query per distinct status and reason, rather
+        than a get_or_create and save per user.  The history of the statuses
+        is recorded with a bulk_create as well.
+
+        If a status is inserted concurrently, for instance by a grade change
+        of the user, the new statuses are instead added or updated one by one.
+
+        Args:
+            requirement(CreditRequirement): 'CreditRequirement' object
+            statuses(dict): Maps usernames to (status, reason) tuples
+
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        existing = {}
+        for batch in _batches(list(statuses)):
+            existing.update(
+                (requirement_status.username, requirement_status)
+                for requirement_status in cls.objects.filter(requirement=requirement, username__in=batch)
+            )
+        created = []
+        changed = []
+        for username, (status, reason) in statuses.iteritems():
+            reason = reason if reason else {}
+            requirement_status = existing.get(username)
+            if requirement_status is None:
+                created.append(cls(
+                    username=username,
+                    requirement=requirement,
+                    status=status,
+                    reason=reason,
+                    created=now,
+                    modified=now,
+                ))
+            elif requirement_status.status != status or requirement_status.reason != reason:
+                requirement_status.status = status
+                requirement_status.reason = reason
+                requirement_status.modified = now
+                changed.append(requirement_status)
+
+        if created:
+            savepoint = transaction.savepoint()
+            try:
+                cls.objects.bulk_create(created, batch_size=BULK_QUERY_BATCH_SIZE)
+                transaction.savepoint_commit(savepoint)
+            except IntegrityError:
+                transaction.savepoint_rollback(savepoint)
+                # Saving the statuses one by one records their history.
+                for requirement_status in created:
+                    cls.add_or_update_requirement_status(
+                        requirement_status.username, requirement, requirement_status.status, requirement_status.reason
+                    )
+                created = []
+
+        # Statuses sharing a status and reason are updated together.
+        ids_by_value = defaultdict(list)
+        for requirement_status in changed:
+            value = (requirement_status.status, json.dumps(requirement_status.reason, sort_keys=True))
+            ids_by_value[value].append(requirement_status.id)
+        for (status, reason), ids in ids_by_value.iteritems():
+            for batch in _batches(ids):
+                cls.objects.filter(id__in=batch).update(status=status, reason=json.loads(reason), modified=now)
+
+        # bulk_create doesn't return the ids of the rows it inserts, so
+        # the new statuses are read back to record their history.
+        if created:
+            created_usernames = [requirement_status.username for requirement_status in created]
+            created = []
+            for batch in _batches(created_usernames):
+                created.extend(cls.objects.filter(requirement=requirement, username__in=batch))
+        cls._bulk_record_history(created, '+', now)
+        cls._bulk_record_history(changed, '~', now)
+
+    @classmethod
+    def _bulk_record_history(cls, requirement_statuses, history_type, history_date):
+        """
+        Record the history of statuses which were written without saving them.
+        """
+        history_model = cls.history.model
+        fields = [field.attname for field in cls._meta.fields]
+        history_model.objects.bulk_create([
+            history_model(
+                history_type=history_type,
+                history_date=history_date,
+                **{field: getattr(requirement_status, field) for field in fields}
+            )
+            for requirement_status in requirement_statuses
+        ], batch_size=BULK_QUERY_BATCH_SIZE)
+
 
 class CreditEligibility(TimeStampedModel):
     """
@@ -454,6 +561,90 @@ class CreditEligibility(TimeStampedModel):
             except IntegrityError:
                 pass
 
+    @classmethod
+    @transaction.commit_on_success
+    def bulk_update_eligibility(cls, requirements, course_key, usernames=None):
+        """
+        Update the credit eligibility of many users in a course at once.
+
+        The statuses of all the users are read with one query per batch of
+        users, or one query when every user is updated, and the users
+        who satisfied every requirement and are not already eligible are
+        marked eligible with a bulk_create.  If one of them is marked eligible
+        concurrently, for instance by a grade change of the user, they are
+        marked eligible one by one instead.
+
+        Arguments:
+            requirements (Queryset): Queryset of `CreditRequirement`s to check.
+            course_key (CourseKey): Identifier of the course.
+
+        Keyword Arguments:
+            usernames (iterable): The users to update; by default every user
+                with a status for one of the requirements.
+
+        Returns:
+            list of the usernames which became eligible
+
+        """
+        requirement_ids = set(req.id for req in requirements)
+        if not requirement_ids:
+            return []
+
+        statuses = CreditRequirementStatus.objects.filter(requirement__in=requirement_ids, status="satisfied")
+        satisfied = defaultdict(set)
+        if usernames is None:
+            for username, requirement_id in statuses.values_list('username', 'requirement'):
+                satisfied[username].add(requirement_id)
+            usernames = list(satisfied)
+        else:
+            usernames = list(usernames)
+            for batch in _batches(usernames):
+                for username, requirement_id in statuses.filter(username__in=batch).values_list(
+                        'username', 'requirement'
+                ):
+                    satisfied[username].add(requirement_id)
+
+        credit_course = CreditCourse.objects.get(course_key=course_key)
+        eligible = [username for username in usernames if satisfied[username] >= requirement_ids]
+        already_eligible = set()
+        for batch in _batches(eligible):
+            already_eligible.update(
+                cls.objects.filter(course=credit_course, username__in=batch).values_list('username', flat=True)
+            )
+        newly_eligible = sorted(set(eligible) - already_eligible)
+        if not newly_eligible:
+            return newly_eligible
+
+        savepoint = transaction.savepoint()
+        try:
+            cls.objects.bulk_create(
+                [cls(username=username, course=credit_course) for username in newly_eligible],
+                batch_size=BULK_QUERY_BATCH_SIZE
+            )
+            transaction.savepoint_commit(savepoint)
+        except IntegrityError:
+            transaction.savepoint_rollback(savepoint)
+            created = []
+            for username in newly_eligible:
+                try:
+                    cls.objects.create(username=username, course=credit_course)
+                    created.append(username)
+                except IntegrityError:
+                    pass
+            newly_eligible = created
+        return newly_eligible
+
+    @classmethod
+    def get_eligible_usernames(cls, course_key):
+        """
+        Returns the set of usernames which are eligible for credit in a course.
+
+        Args:
+            course_key(CourseKey): The course identifier
+
+        """
+        return set(cls.objects.filter(course__course_key=course_key).values_list('username', flat=True))
+
     @classmethod
     def get_user_eligibilities(cls, username):
         """
@@ -5,10 +5,12 @@ This file contains receivers of course publication signals.
 import logging
 
 from django.dispatch import receiver
-from django.utils import timezone
 from opaque_keys.edx.keys import CourseKey
 
 from xmodule.modulestore.django import SignalHandler
+from openedx.core.djangoapps.content.course_structures.publish import (
+    publish_pipeline_enabled, register_publish_builder
+)
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
 
 
@@ -25,11 +27,39 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     # are not yet able to be loaded
     from openedx.core.djangoapps.credit import api, tasks
 
+    # The requirements are updated by the publish pipeline when it is enabled.
+    if publish_pipeline_enabled():
+        return
+
     if api.is_credit_course(course_key):
         tasks.update_credit_course_requirements.delay(unicode(course_key))
         log.info(u'Added task to update credit requirements for course "%s" to the task queue', course_key)
 
 
+@register_publish_builder
+def update_requirements_of_published_course(course_key, course, published_at):  # pylint: disable=unused-argument
+    """Update the credit course requirements of a published course.
+
+    Registered as a publish pipeline builder. The requirements are read within
+    the pipeline's bulk operation, so they come from the course already loaded
+    for the other builders.
+
+    Args:
+        course_key(CourseKey): The key for the course
+        course(CourseDescriptor): The published course
+        published_at(string): When the course was published, in ISO format
+
+    """
+    # Import here, because signal is registered at startup, but items in tasks
+    # are not yet able to be loaded
+    from openedx.core.djangoapps.credit import api, tasks
+
+    if api.is_credit_course(course_key):
+        requirements = tasks.get_course_credit_requirements(course_key)
+        api.set_credit_requirements(course_key, requirements)
+        log.info(u'Updated credit requirements for course "%s"', course_key)
+
+
 @receiver(GRADES_UPDATED)
 def listen_for_grade_calculation(sender, username, grade_summary, course_key, deadline, **kwargs):  # pylint: disable=unused-argument
     """Receive 'MIN_GRADE_REQUIREMENT_STATUS' signal and update minimum grade
@@ -58,12 +88,9 @@ def listen_for_grade_calculation(sender, username, grade_summary, course_key, de
             criteria = requirements[0].get('criteria')
             if criteria:
                 min_grade = criteria.get('min_grade')
-                if grade_summary['percent'] >= min_grade:
-                    reason_dict = {'final_grade': grade_summary['percent']}
-                    api.set_credit_requirement_status(
-                        username, course_id, 'grade', 'grade', status="satisfied", reason=reason_dict
-                    )
-                elif deadline and deadline < timezone.now():
+                status = api.get_min_grade_requirement_status(min_grade, grade_summary['percent'], deadline)
+                if status is not None:
+                    status, reason = status
                     api.set_credit_requirement_status(
-                        username, course_id, 'grade', 'grade', status="failed", reason={}
+                        username, course_id, 'grade', 'grade', status=status, reason=reason
                     )
@@ -44,7 +44,7 @@ def update_credit_course_requirements(course_id):   # pylint: disable=invalid-na
         course_key = CourseKey.from_string(course_id)
         is_credit_course = CreditCourse.is_credit_course(course_key)
         if is_credit_course:
-            requirements = _get_course_credit_requirements(course_key)
+            requirements = get_course_credit_requirements(course_key)
             set_credit_requirements(course_key, requirements)
     except (InvalidKeyError, ItemNotFoundError, InvalidCreditRequirements) as exc:
         LOGGER.error('Error on adding the requirements for course %s - %s', course_id, unicode(exc))
@@ -53,7 +53,7 @@ def update_credit_course_requirements(course_id):   # pylint: disable=invalid-na
         LOGGER.info('Requirements added for course %s', course_id)
 
 
-def _get_course_credit_requirements(course_key):
+def get_course_credit_requirements(course_key):
     """
     Returns the list of credit requirements for the given course.
 
@@ -7,7 +7,8 @@ import pytz
 
 from django.test import TestCase
 from django.test.utils import override_settings
-from django.db import connection, transaction
+from django.db import connection, transaction, IntegrityError
+from mock import patch
 
 from opaque_keys.edx.keys import CourseKey
 
@@ -395,6 +396,169 @@ class CreditRequirementApiTests(CreditApiTestBase):
         self.assertEqual(len(req_status), 1)
         self.assertEqual(req_status[0]["status"], None)
 
+    def test_bulk_set_credit_requirement_status(self):
+        self.add_credit_course()
+        requirements = [
+            {
+                "namespace": "grade",
+                "name": "grade",
+                "display_name": "Grade",
+                "criteria": {
+                    "min_grade": 0.8
+                },
+            },
+            {
+                "namespace": "reverification",
+                "name": "i4x://edX/DemoX/edx-reverification-block/assessment_uuid",
+                "display_name": "Assessment 1",
+                "criteria": {},
+            }
+        ]
+        api.set_credit_requirements(self.course_key, requirements)
+
+        # Only "ron" has satisfied the other requirement, and "staff" is already eligible.
+        api.set_credit_requirement_status("ron", self.course_key, "reverification", requirements[1]["name"])
+        api.set_credit_requirement_status("staff", self.course_key, "reverification", requirements[1]["name"])
+        api.set_credit_requirement_status("staff", self.course_key, "grade", "grade")
+        api.set_credit_requirement_status("bob", self.course_key, "grade", "grade", status="failed")
+
+        statuses = {
+            "bob": ("satisfied", {"final_grade": 0.9}),
+            "ron": ("satisfied", {"final_grade": 0.85}),
+            "ginny": ("failed", {}),
+            "staff": ("failed", {}),
+        }
+        self.assertEqual(
+            api.bulk_set_credit_requirement_status(self.course_key, "grade", "grade", statuses),
+            ["ron"]
+        )
+
+        expected_statuses = [("bob", "satisfied"), ("ron", "satisfied"), ("ginny", "failed"), ("staff", "satisfied")]
+        for username, status in expected_statuses:
+            req_status = api.get_credit_requirement_status(self.course_key, username, namespace="grade", name="grade")
+            self.assertEqual(req_status[0]["status"], status)
+        self.assertEqual(
+            CreditRequirementStatus.objects.get(username="bob", requirement__namespace="grade").reason,
+            {"final_grade": 0.9}
+        )
+        self.assertFalse(api.is_user_eligible_for_credit("bob", self.course_key))
+        self.assertTrue(api.is_user_eligible_for_credit("ron", self.course_key))
+
+        # The history of statuses written in bulk is recorded
+        self.assertEqual(
+            [entry.status for entry in CreditRequirementStatus.history.filter(username="bob")],
+            ["satisfied", "failed"]
+        )
+
+    def test_bulk_set_credit_requirement_status_concurrent_write(self):
+        # A status or eligibility written concurrently makes the bulk inserts fail,
+        # and the rows are then written one by one.
+        self.add_credit_course()
+        requirements = [
+            {
+                "namespace": "grade",
+                "name": "grade",
+                "display_name": "Grade",
+                "criteria": {
+                    "min_grade": 0.8
+                },
+            },
+        ]
+        api.set_credit_requirements(self.course_key, requirements)
+
+        statuses = {
+            "bob": ("satisfied", {"final_grade": 0.9}),
+            "ginny": ("failed", {}),
+        }
+        with patch.object(CreditRequirementStatus.objects, 'bulk_create', side_effect=IntegrityError):
+            with patch.object(CreditEligibility.objects, 'bulk_create', side_effect=IntegrityError):
+                self.assertEqual(
+                    api.bulk_set_credit_requirement_status(self.course_key, "grade", "grade", statuses),
+                    ["bob"]
+                )
+
+        for username, status in [("bob", "satisfied"), ("ginny", "failed")]:
+            req_status = api.get_credit_requirement_status(self.course_key, username, namespace="grade", name="grade")
+            self.assertEqual(req_status[0]["status"], status)
+        self.assertTrue(api.is_user_eligible_for_credit("bob", self.course_key))
+        self.assertEqual(
+            [entry.status for entry in CreditRequirementStatus.history.filter(username="bob")],
+            ["satisfied"]
+        )
+
+    def test_bulk_set_credit_requirement_status_req_not_configured(self):
+        self.add_credit_course()
+        self.assertEqual(
+            api.bulk_set_credit_requirement_status(self.course_key, "grade", "grade", {"bob": ("satisfied", {})}),
+            []
+        )
+        self.assertFalse(CreditRequirementStatus.objects.exists())
+
+    @ddt.data(
+        (0.8, None, ("satisfied", {"final_grade": 0.8})),
+        (0.5, None, None),
+        (0.5, datetime.datetime(3000, 1, 1, tzinfo=pytz.UTC), None),
+        (0.5, datetime.datetime(2000, 1, 1, tzinfo=pytz.UTC), ("failed", {})),
+    )
+    @ddt.unpack
+    def test_get_min_grade_requirement_status(self, percent, deadline, expected):
+        self.assertEqual(api.get_min_grade_requirement_status(0.8, percent, deadline), expected)
+
+    def test_update_credit_eligibility_for_course(self):
+        self.add_credit_course()
+        api.set_credit_requirements(self.course_key, [
+            {
+                "namespace": "grade",
+                "name": "grade",
+                "display_name": "Grade",
+                "criteria": {
+                    "min_grade": 0.8
+                },
+            },
+        ])
+        grades = {"bob": 0.9, "ron": 0.5, "ginny": 0.8}
+        deadline = datetime.datetime(2000, 1, 1, tzinfo=pytz.UTC)
+
+        # The statuses and eligibilities are written in bulk, in batches of learners
+        self.assertTrue(api.is_credit_course(self.course_key))
+        with self.assertNumQueries(11):
+            newly_eligible = api.update_credit_eligibility_for_course(self.course_key, grades, deadline)
+
+        self.assertEqual(sorted(newly_eligible), ["bob", "ginny"])
+        self.assertTrue(api.is_user_eligible_for_credit("bob", self.course_key))
+        self.assertFalse(api.is_user_eligible_for_credit("ron", self.course_key))
+        req_status = api.get_credit_requirement_status(self.course_key, "ron", namespace="grade", name="grade")
+        self.assertEqual(req_status[0]["status"], "failed")
+
+    @patch('openedx.core.djangoapps.credit.models.BULK_QUERY_BATCH_SIZE', 1)
+    def test_update_credit_eligibility_for_course_batches(self):
+        self.add_credit_course()
+        api.set_credit_requirements(self.course_key, [
+            {
+                "namespace": "grade",
+                "name": "grade",
+                "display_name": "Grade",
+                "criteria": {
+                    "min_grade": 0.8
+                },
+            },
+        ])
+        api.set_credit_requirement_status("ron", self.course_key, "grade", "grade", status="failed")
+        grades = {"bob": 0.9, "ron": 0.85, "ginny": 0.8, "neville": 0.5}
+        deadline = datetime.datetime(2000, 1, 1, tzinfo=pytz.UTC)
+
+        newly_eligible = api.update_credit_eligibility_for_course(self.course_key, grades, deadline)
+
+        self.assertEqual(sorted(newly_eligible), ["bob", "ginny", "ron"])
+        req_status = api.get_credit_requirement_status(self.course_key, "ron", namespace="grade", name="grade")
+        self.assertEqual(req_status[0]["status"], "satisfied")
+        req_status = api.get_credit_requirement_status(self.course_key, "neville", namespace="grade", name="grade")
+        self.assertEqual(req_status[0]["status"], "failed")
+
+    def test_update_credit_eligibility_for_non_credit_course(self):
+        self.assertEqual(api.update_credit_eligibility_for_course(self.course_key, {"bob": 0.9}, None), [])
+        self.assertFalse(CreditRequirementStatus.objects.exists())
+
 
 @ddt.ddt
 class CreditProviderIntegrationApiTests(CreditApiTestBase):
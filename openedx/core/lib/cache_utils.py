@@ -3,8 +3,15 @@ Utilities related to caching.
 """
 
 import functools
+import hashlib
+import time
+
+from django.core.cache import cache
 from xblock.core import XBlock
 
+import dogstats_wrapper as dog_stats_api
+from request_cache.middleware import RequestCache
+
 
 def memoize_in_request_cache(request_cache_attr_name=None):
     """
@@ -39,6 +46,184 @@ def memoize_in_request_cache(request_cache_attr_name=None):
     return _decorator
 
 
+def request_cached(key_func=None, timeout=0):
+    """
+    Memoize a function's results for the duration of the request being served.
+
+    Results are keyed by the function's module and name, and by `key_func(*args, **kwargs)`
+    if given, else by the `hashvalue` of each argument. Outside of a request, the function is
+    always called, so management commands, tasks and tests never see stale results.
+
+    If `timeout` is positive, results are also kept in the django cache for that many seconds
+    and shared between requests and processes; they must then be picklable. `timeout` may be
+    a function returning the number of seconds, so that it can be read from the settings on
+    each call.
+
+    Hits and misses are counted per function by the `request_cached.hit` and
+    `request_cached.miss` metrics.
+
+    The decorated function has an `invalidate(*args, **kwargs)` attribute, which drops the
+    result cached for those arguments; call it whenever the underlying data changes.
+
+    Arguments:
+        key_func - A function of the decorated function's arguments returning the unicode
+         key of its result.
+        timeout - The number of seconds results are kept in the django cache, if positive,
+         or a function returning it.
+    """
+    def _decorator(func):
+        """Outer function decorator."""
+        prefix = u'{}.{}'.format(func.__module__, func.__name__)
+        tags = [u'function:{}'.format(prefix)]
+
+        def _cache_key(*args, **kwargs):
+            """
+            Returns the key of the result of calling `func` with these arguments.
+            """
+            if key_func is not None:
+                key = key_func(*args, **kwargs)
+            else:
+                key = u'&'.join(
+                    [hashvalue(arg) for arg in args] +
+                    [u'{}={}'.format(name, hashvalue(value)) for name, value in sorted(kwargs.items())]
+                )
+            return u'request_cached.{}.{}'.format(prefix, key)
+
+        def _shared_cache_key(cache_key):
+            """
+            Returns a key for the django cache, which can't hold arbitrary characters.
+            """
+            return 'request_cached.' + hashlib.md5(cache_key.encode('utf-8')).hexdigest()
+
+        def _timeout():
+            """
+            Returns the number of seconds results are kept in the django cache.
+            """
+            return timeout() if callable(timeout) else timeout
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            """
+            Wraps a function to memoize its results.
+            """
+            request_cache = RequestCache.get_request_cache()
+            # Threads other than the one which imported the middleware start without a request.
+            if getattr(request_cache, 'request', None) is None:
+                return func(*args, **kwargs)
+
+            data = request_cache.data
+            cache_key = _cache_key(*args, **kwargs)
+            if cache_key in data:
+                dog_stats_api.increment('request_cached.hit', tags=tags)
+                return data[cache_key]
+
+            shared_timeout = _timeout()
+            if shared_timeout > 0:
+                cached = cache.get(_shared_cache_key(cache_key))
+                if cached is not None:
+                    dog_stats_api.increment('request_cached.hit', tags=tags)
+                    # Cached as a 1-tuple so that None results can be cached too.
+                    data[cache_key] = cached[0]
+                    return cached[0]
+
+            dog_stats_api.increment('request_cached.miss', tags=tags)
+            result = func(*args, **kwargs)
+            data[cache_key] = result
+            if shared_timeout > 0:
+                cache.set(_shared_cache_key(cache_key), (result,), shared_timeout)
+            return result
+
+        def invalidate(*args, **kwargs):
+            """
+            Drops the result cached for these arguments.
+            """
+            cache_key = _cache_key(*args, **kwargs)
+            getattr(RequestCache.get_request_cache(), 'data', {}).pop(cache_key, None)
+            if callable(timeout) or timeout > 0:
+                cache.delete(_shared_cache_key(cache_key))
+
+        _wrapper.invalidate = invalidate
+        return _wrapper
+    return _decorator
+
+
+# Cached in place of results known not to exist, so that they aren't looked up
+# again. A string, so that it compares equal once unpickled.
+NEGATIVE_RESULT = 'cache_utils.negative_result'
+
+PREFETCHED_REQUEST_CACHE_KEY = 'cache_utils.prefetched'
+
+
+def is_negative_result(value):
+    """
+    Returns whether `value` is the NEGATIVE_RESULT marker.
+    """
+    return isinstance(value, basestring) and value == NEGATIVE_RESULT
+
+
+def _prefetched():
+    """
+    Returns the dict of the values prefetched from the django cache while serving
+    the current request, or None outside of a request.
+    """
+    request_cache = RequestCache.get_request_cache()
+    if getattr(request_cache, 'request', None) is None:
+        return None
+    return request_cache.data.setdefault(PREFETCHED_REQUEST_CACHE_KEY, {})
+
+
+def prefetch_cached(keys):
+    """
+    Fetch `keys` from the django cache in a single round trip, so that the
+    `get_cached` calls for them during the rest of the request don't go to the
+    cache. Keys which were already fetched are skipped; nothing is fetched
+    outside of a request.
+    """
+    prefetched = _prefetched()
+    if prefetched is None:
+        return
+    keys = [key for key in keys if key not in prefetched]
+    if keys:
+        values = cache.get_many(keys)
+        for key in keys:
+            prefetched[key] = values.get(key)
+
+
+def get_cached(key, default=None):
+    """
+    Returns the value of `key` in the django cache, or `default`. Keys prefetched
+    during the current request are served without a round trip.
+    """
+    prefetched = _prefetched()
+    if prefetched is not None and key in prefetched:
+        value = prefetched[key]
+    else:
+        value = cache.get(key)
+    return default if value is None else value
+
+
+def set_cached(key, value, timeout=None):
+    """
+    Sets `key` in the django cache, and in the values prefetched during the
+    current request. A timeout of None uses the cache's default timeout.
+    """
+    cache.set(key, value, timeout)
+    prefetched = _prefetched()
+    if prefetched is not None and key in prefetched:
+        prefetched[key] = value
+
+
+def delete_cached(key):
+    """
+    Removes `key` from the django cache, and from the values prefetched during
+    the current request.
+    """
+    cache.delete(key)
+    prefetched = _prefetched()
+    if prefetched is not None:
+        prefetched.pop(key, None)
+
+
 def hashvalue(arg):
     """
     If arg is an xblock, use its location. otherwise just turn it into a string
@@ -47,3 +232,50 @@ def hashvalue(arg):
         return unicode(arg.location)
     else:
         return unicode(arg)
+
+
+class ProcessCache(object):
+    """
+    A cache held in the memory of the current process, whose entries expire
+    after a per-entry timeout.
+
+    Entries are neither shared between processes nor invalidated by changes
+    made elsewhere, so a process may serve a value up to `timeout` seconds
+    stale; keep timeouts short. Cached values are shared by every thread of
+    the process and must be treated as read-only.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key, default=None):
+        """
+        Returns the unexpired value cached for `key`, or `default`.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value, timeout):
+        """
+        Caches `value` for `key` during `timeout` seconds. Nothing is cached
+        if `timeout` isn't positive.
+        """
+        if timeout > 0:
+            self._entries[key] = (time.time() + timeout, value)
+
+    def delete(self, key):
+        """
+        Removes the entry for `key`, if any.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self._entries.clear()
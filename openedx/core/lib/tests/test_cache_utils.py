@@ -2,10 +2,14 @@
 Tests for cache_utils.py
 """
 import ddt
-from mock import MagicMock
+from django.core.cache import cache
+from mock import MagicMock, patch
 from unittest import TestCase
 
-from openedx.core.lib.cache_utils import memoize_in_request_cache
+from openedx.core.lib.cache_utils import (
+    memoize_in_request_cache, request_cached, prefetch_cached, get_cached, set_cached, delete_cached
+)
+from request_cache.middleware import RequestCache
 
 
 @ddt.ddt
@@ -62,3 +66,143 @@ class TestMemoizeInRequestCache(TestCase):
                 func_to_memoize(*arg_list2)
 
             self.assertEquals(self.func_to_count.call_count, 2)
+
+
+class TestRequestCached(TestCase):
+    """
+    Test the request_cached decorator.
+    """
+    def setUp(self):
+        super(TestRequestCached, self).setUp()
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.addCleanup(cache.clear)
+        self.func_to_count = MagicMock(side_effect=lambda *args, **kwargs: len(args) + len(kwargs))
+
+    def cached_func(self, **decorator_kwargs):
+        """
+        Returns a function calling func_to_count, decorated with request_cached.
+        """
+        @request_cached(**decorator_kwargs)
+        def func_to_cache(*args, **kwargs):
+            """
+            A test function whose results are to be cached.
+            """
+            return self.func_to_count(*args, **kwargs)
+        return func_to_cache
+
+    def test_cached_per_arguments(self):
+        cached = self.cached_func()
+        for _ in range(3):
+            self.assertEquals(cached('foo'), 1)
+            self.assertEquals(cached('foo', bar='baz'), 2)
+            self.assertEquals(cached('bar'), 1)
+        self.assertEquals(self.func_to_count.call_count, 3)
+
+    def test_key_func(self):
+        cached = self.cached_func(key_func=lambda first, second=None: unicode(first))
+        cached('foo', 'bar')
+        cached('foo', second='baz')
+        self.func_to_count.assert_called_once_with('foo', 'bar')
+
+    def test_not_cached_outside_request(self):
+        cached = self.cached_func()
+        RequestCache.clear_request_cache()
+        cached('foo')
+        cached('foo')
+        self.assertEquals(self.func_to_count.call_count, 2)
+
+    def test_not_cached_between_requests(self):
+        cached = self.cached_func()
+        cached('foo')
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        cached('foo')
+        self.assertEquals(self.func_to_count.call_count, 2)
+
+    def test_cached_between_requests_with_timeout(self):
+        self.func_to_count.side_effect = None
+        self.func_to_count.return_value = None
+        cached = self.cached_func(timeout=60)
+        self.assertIsNone(cached('foo'))
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        self.assertIsNone(cached('foo'))
+        self.func_to_count.assert_called_once_with('foo')
+
+    def test_timeout_read_on_each_call(self):
+        timeout = MagicMock(return_value=0)
+        cached = self.cached_func(timeout=timeout)
+        cached('foo')
+        timeout.return_value = 60
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        cached('foo')
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        cached('foo')
+        self.assertEquals(self.func_to_count.call_count, 2)
+
+    def test_invalidate(self):
+        cached = self.cached_func(timeout=60)
+        cached('foo')
+        cached('bar')
+        cached.invalidate('foo')
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        cached('foo')
+        cached('bar')
+        self.assertEquals(self.func_to_count.call_count, 3)
+
+    @patch('openedx.core.lib.cache_utils.dog_stats_api.increment')
+    def test_hits_and_misses_counted(self, mock_increment):
+        cached = self.cached_func()
+        cached('foo')
+        cached('foo')
+        self.assertEquals(
+            [call_args[0][0] for call_args in mock_increment.call_args_list],
+            ['request_cached.miss', 'request_cached.hit']
+        )
+
+
+class TestPrefetchCached(TestCase):
+    """
+    Test fetching the django cache keys of a request in one round trip.
+    """
+    def setUp(self):
+        super(TestPrefetchCached, self).setUp()
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = MagicMock()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.addCleanup(cache.clear)
+        cache.set('foo', 'foo value')
+
+    def test_prefetched_keys_served_from_request(self):
+        with patch('openedx.core.lib.cache_utils.cache.get_many', wraps=cache.get_many) as mock_get_many:
+            prefetch_cached(['foo', 'bar'])
+            prefetch_cached(['foo'])
+        mock_get_many.assert_called_once_with(['foo', 'bar'])
+
+        with patch('openedx.core.lib.cache_utils.cache.get') as mock_get:
+            self.assertEquals(get_cached('foo'), 'foo value')
+            self.assertEquals(get_cached('bar', 'default'), 'default')
+        self.assertFalse(mock_get.called)
+
+    def test_set_and_delete_update_prefetched_keys(self):
+        prefetch_cached(['foo', 'bar'])
+        set_cached('bar', 'bar value')
+        delete_cached('foo')
+        self.assertEquals(get_cached('bar'), 'bar value')
+        self.assertIsNone(get_cached('foo'))
+
+        RequestCache.clear_request_cache()
+
+        self.assertEquals(get_cached('bar'), 'bar value')
+        self.assertIsNone(get_cached('foo'))
+
+    def test_not_prefetched_outside_request(self):
+        RequestCache.clear_request_cache()
+        prefetch_cached(['foo'])
+        cache.set('foo', 'new value')
+        self.assertEquals(get_cached('foo'), 'new value')
@@ -3,6 +3,7 @@ Functions that can are used to modify XBlock fragments for use in the LMS and St
 """
 
 import datetime
+import hashlib
 import json
 import logging
 import static_replace
@@ -184,6 +185,44 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(
+        course_id, jump_to_id_base_url, block, view, frag, context, data_dir=None, static_asset_path=''
+):  # pylint: disable=unused-argument
+    """
+    Combines replace_static_urls, replace_course_urls and replace_jump_to_id_urls
+    into a single pass over the fragment content (see static_replace.replace_urls).
+    """
+    return wrap_fragment(frag, static_replace.replace_urls(
+        frag.content,
+        course_id,
+        data_directory=data_dir,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    ))
+
+
+def fragment_cache_key(block, view, user_groups):
+    """
+    Returns the key under which the output of `view` of `block` is cached for the
+    learners in `user_groups`, or None if the block has no version to key it by.
+
+    Entries are keyed by the block's usage id and the time it was last edited, which
+    changes with each version of the block, by the view, and by `user_groups`, a dict
+    mapping the id of each user partition restricting access to the block to the
+    learner's group in it.
+    """
+    edited_on = getattr(block, 'edited_on', None)
+    if edited_on is None:
+        return None
+
+    return u'xblock_utils.fragment_cache.{}'.format(hashlib.md5(u'|'.join([
+        unicode(block.scope_ids.usage_id),
+        unicode(edited_on),
+        view,
+        u','.join(u'{}:{}'.format(partition_id, group_id) for partition_id, group_id in sorted(user_groups.items())),
+    ]).encode('utf-8')).hexdigest())
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.